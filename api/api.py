@@ -1,96 +1,159 @@
-import pandas as pd
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-import os
-
-app = FastAPI()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-CSV_FILE = "data/emotion_analysis_results.csv"
-ALERT_FILE = "data/alert_flag.txt"
-ANOMALY_CSV = "data/anomaly_detection_results.csv"  # ✅ Updated
-
-@app.get("/get_emotion_distribution")
-def get_emotion_distribution():
-    try:
-        df = pd.read_csv(CSV_FILE)
-        if "emotion" not in df.columns:
-            return {"error": "Missing 'emotion' column in CSV"}
-        
-        emotion_counts = df["emotion"].value_counts().to_dict()
-        return emotion_counts
-    except Exception as e:
-        return {"error": str(e)}
-
-@app.get("/get_top_locations")
-def get_top_locations():
-    try:
-        df = pd.read_csv(CSV_FILE)
-        if "location" not in df.columns:
-            return {"error": "Missing 'location' column in CSV"}
-        
-        location_counts = df["location"].value_counts().head(10).to_dict()
-        return location_counts
-    except Exception as e:
-        return {"error": str(e)}
-
-@app.get("/get_recent_posts")
-def get_recent_posts():
-    """Fetch the last 10 recent sentiment posts"""
-    try:
-        df = pd.read_csv(CSV_FILE)
-        if "text" not in df.columns or "emotion" not in df.columns:
-            return {"error": "Missing required columns in CSV"}
-        
-        df = df[['text', 'emotion', 'timestamp', 'location']].dropna().tail(10)
-
-        posts = df.to_dict(orient="records")
-        return {"posts": posts}
-    except Exception as e:
-        return {"error": str(e)}
-
-@app.get("/get_sentiment_alert")
-def get_sentiment_alert():
-    """Returns an alert message if sentiment anomalies are detected"""
-    if os.path.exists(ALERT_FILE):
-        with open(ALERT_FILE, "r", encoding="utf-8") as f:
-            message = f.read().strip()
-            return {"alert": True, "message": message}
-    return {"alert": False, "message": ""}
-
-@app.get("/get_anomalous_posts")
-def get_anomalous_posts():
-    """Returns all anomalous posts with score (no limit)"""
-    try:
-        df = pd.read_csv("data/anomaly_detection_results.csv")
-        
-        if "text" not in df.columns or "emotion" not in df.columns:
-            return {"error": "Missing 'text' or 'emotion' columns in anomaly CSV"}
-
-        # Detect score column
-        if "score" in df.columns:
-            pass
-        elif "sentiment_score" in df.columns:
-            df.rename(columns={"sentiment_score": "score"}, inplace=True)
-        elif "anomaly_score" in df.columns:
-            df.rename(columns={"anomaly_score": "score"}, inplace=True)
-        else:
-            return {"error": "No valid score column"}
-
-        df = df[['text', 'emotion', 'score']].dropna().sort_values(by="score", ascending=False)
-
-        return {"posts": df.to_dict(orient="records")}
-    except Exception as e:
-        return {"error": str(e)}
-
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8005)
+from typing import Optional
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import anyio
+from fastapi import APIRouter, FastAPI, Query, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+import os
+import sys
+
+API_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Storage modules are shared with the pipeline in scripts/, routers live next to this file
+sys.path.insert(0, os.path.join(API_DIR, "..", "scripts"))
+sys.path.insert(0, API_DIR)
+from read_cache import read_cache
+from event_store import FILTER_COLUMNS
+from paging import RankedIndex, decode_cursor, parse_fields, parse_list
+import geo_api
+import insights_api
+import sentiment_data_api
+import trends_api
+import stream_api
+
+# Every endpoint is served by this one app; the old per-app ports now all map to API_PORT
+API_HOST = os.environ.get("API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("API_PORT", "8005"))
+API_WORKERS = int(os.environ.get("API_WORKERS", "1"))
+
+ALERT_FILE = "data/alert_flag.txt"
+ANOMALIES = "anomalies"
+ANOMALY_COLUMNS = ["id", "text", "emotion", "timestamp", "location", "source", "anomaly", "score", "sentiment_score",
+                   "anomaly_score"]
+ANOMALY_FIELDS = ["id", "text", "emotion", "score", "timestamp", "location", "source"]
+ANOMALY_DEFAULT_FIELDS = ["text", "emotion", "score"]
+ANOMALY_PAGE_SIZE = 100
+ANOMALY_MAX_PAGE_SIZE = 1000
+
+router = APIRouter()
+
+# Post endpoints read the event store over [since, until), the last API_WINDOW_HOURS by default
+@router.get("/get_emotion_distribution")
+async def get_emotion_distribution(request: Request, since: Optional[float] = None, until: Optional[float] = None):
+    try:
+        view = await request.app.state.cache.posts_async(since, until)
+        return Response(view.json("emotion_distribution"), media_type="application/json")
+    except Exception as e:
+        return {"error": str(e)}
+
+@router.get("/get_top_locations")
+async def get_top_locations(request: Request, since: Optional[float] = None, until: Optional[float] = None):
+    try:
+        view = await request.app.state.cache.posts_async(since, until)
+        return Response(view.json("top_locations"), media_type="application/json")
+    except Exception as e:
+        return {"error": str(e)}
+
+@router.get("/get_recent_posts")
+async def get_recent_posts(request: Request, since: Optional[float] = None, until: Optional[float] = None):
+    """Fetch the last 10 recent sentiment posts"""
+    try:
+        view = await request.app.state.cache.posts_async(since, until)
+        return Response(view.json("recent_posts"), media_type="application/json")
+    except Exception as e:
+        return {"error": str(e)}
+
+@router.get("/get_sentiment_alert")
+async def get_sentiment_alert(request: Request):
+    """Returns an alert message if sentiment anomalies are detected"""
+    message = await request.app.state.cache.text_file_async("alert", ALERT_FILE)
+    if message is not None:
+        return {"alert": True, "message": message}
+    return {"alert": False, "message": ""}
+
+@router.get("/get_anomalous_posts")
+async def get_anomalous_posts(request: Request, since: Optional[float] = None, until: Optional[float] = None,
+                              source: Optional[str] = None, location: Optional[str] = None,
+                              emotion: Optional[str] = None, fields: Optional[str] = None,
+                              group_by: Optional[str] = None, cursor: Optional[str] = None,
+                              limit: int = Query(ANOMALY_PAGE_SIZE, ge=1, le=ANOMALY_MAX_PAGE_SIZE)):
+    """Returns anomalous posts, highest score first, `limit` per page
+
+    Takes the same filters, `fields`, `cursor` and `group_by` parameters as /get_geo_data.
+    """
+    try:
+        index = await request.app.state.cache.artifact_async(ANOMALIES, anomaly_index, columns=ANOMALY_COLUMNS,
+                                                             encode=False)
+        filters = {"source": parse_list(source), "location": parse_list(location), "emotion": parse_list(emotion)}
+        if group_by:
+            group_by = parse_fields(group_by, FILTER_COLUMNS, FILTER_COLUMNS)
+            body = await anyio.to_thread.run_sync(index.counts, group_by, limit, filters, since, until)
+        else:
+            fields = parse_fields(fields, ANOMALY_FIELDS, ANOMALY_DEFAULT_FIELDS)
+            body = index.page("posts", fields, limit, decode_cursor(cursor), filters, since, until)
+        return Response(body, media_type="application/json")
+    except Exception as e:
+        return {"error": str(e)}
+
+def anomaly_index(df):
+    if "text" not in df.columns or "emotion" not in df.columns:
+        raise KeyError("Missing 'text' or 'emotion' columns in anomaly CSV")
+
+    # Detect score column (anomaly_score is the z-score of the spike a post belongs to)
+    if "score" in df.columns:
+        pass
+    elif "anomaly_score" in df.columns:
+        df = df.rename(columns={"anomaly_score": "score"})
+    elif "sentiment_score" in df.columns:
+        df = df.rename(columns={"sentiment_score": "score"})
+    else:
+        raise KeyError("No valid score column")
+
+    if "anomaly" in df.columns:
+        df = df[df["anomaly"] == "anomalous"]
+    if "id" not in df.columns:
+        df = df.assign(id=df.index.astype(str))
+    df = df.dropna(subset=["text", "emotion", "score"])
+    return RankedIndex(df, "score", FILTER_COLUMNS)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Creates the data cache shared by every router, fills it and starts the push hub."""
+    app.state.cache = read_cache()
+    preload = [(ANOMALIES, anomaly_index, ANOMALY_COLUMNS, False),
+               (trends_api.TRENDS, trends_api.trend_records, None, False)]
+    await anyio.to_thread.run_sync(app.state.cache.warm, preload)
+
+    # Build the state new clients receive before the first one can connect
+    app.state.hub = stream_api.UpdateHub(app.state.cache, ALERT_FILE)
+    await app.state.hub.check()
+    watcher = asyncio.create_task(app.state.hub.run())
+    yield
+    watcher.cancel()
+    with suppress(asyncio.CancelledError):
+        await watcher
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+app.include_router(router)
+app.include_router(geo_api.router)
+app.include_router(insights_api.router)
+app.include_router(sentiment_data_api.router)
+app.include_router(trends_api.router)
+app.include_router(stream_api.router)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    # Each worker process keeps its own cache; more workers trade memory for throughput
+    uvicorn.run("api:app", host=API_HOST, port=API_PORT, workers=API_WORKERS, app_dir=API_DIR)
@@ -1,32 +1,46 @@
-import pandas as pd
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-app = FastAPI()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-CSV_FILE = "data/emotion_analysis_results.csv"  # Ensure correct path
-
-@app.get("/get_geo_data")
-def get_geo_data():
-    try:
-        df = pd.read_csv(CSV_FILE)
-
-        if "location" not in df.columns or "emotion" not in df.columns:
-            return {"error": "CSV file missing required columns"}
-
-        latest_data = df[["location", "emotion","source"]].dropna().to_dict(orient="records")
-        return {"data": latest_data}
-    except Exception as e:
-        return {"error": str(e)}
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8002)
+import time
+from typing import Optional
+from fastapi import APIRouter, Query, Request, Response
+from event_store import FILTER_COLUMNS, WINDOW_HOURS, count_rollups, page_events
+from paging import counts_body, decode_cursor, page_body, parse_fields, parse_list
+
+router = APIRouter()
+
+GEO_FIELDS = ["id", "timestamp", "location", "emotion", "source", "sentiment"]
+GEO_DEFAULT_FIELDS = ["location", "emotion", "source"]
+GEO_PAGE_SIZE = 1000
+GEO_MAX_PAGE_SIZE = 5000
+
+@router.get("/get_geo_data")
+async def get_geo_data(request: Request, since: Optional[float] = None, until: Optional[float] = None,
+                       source: Optional[str] = None, location: Optional[str] = None, emotion: Optional[str] = None,
+                       fields: Optional[str] = None, group_by: Optional[str] = None, cursor: Optional[str] = None,
+                       limit: int = Query(GEO_PAGE_SIZE, ge=1, le=GEO_MAX_PAGE_SIZE)):
+    """Posts in [since, until) (the last API_WINDOW_HOURS by default), newest first.
+
+    `source`, `location` and `emotion` take comma-separated values, `fields`
+    picks the returned columns and `cursor` is the `next_cursor` of the
+    previous page. With `group_by` (e.g. `location` or `location,emotion`)
+    the response holds post counts per group instead, largest first.
+    """
+    try:
+        filters = {"sources": parse_list(source), "locations": parse_list(location), "emotions": parse_list(emotion)}
+        window = {"since": since if since is not None else time.time() - WINDOW_HOURS * 3600, "until": until}
+        # Only the default request is cached; any other page is one indexed query
+        default = since is None and until is None and not any(filters.values()) and cursor is None
+
+        if group_by:
+            group_by = parse_fields(group_by, FILTER_COLUMNS, FILTER_COLUMNS)
+            load = lambda: counts_body(count_rollups(group_by, limit=limit, **window, **filters))
+            key = ("geo_counts", tuple(group_by), limit) if default else None
+        else:
+            fields = parse_fields(fields, GEO_FIELDS, GEO_DEFAULT_FIELDS)
+            after = decode_cursor(cursor)
+            load = lambda: page_body("data", page_events(fields, after=after, limit=limit + 1, **window, **filters),
+                                     fields, limit, ["timestamp", "id"])
+            key = ("geo_data", tuple(fields), limit) if default else None
+
+        body = await request.app.state.cache.events_async(key, load)
+        return Response(body, media_type="application/json")
+    except Exception as e:
+        return {"error": str(e)}
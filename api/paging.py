@@ -0,0 +1,134 @@
+import json
+import base64
+from collections import OrderedDict
+import numpy as np
+from read_cache import encode_json, records
+
+_NO_ROWS = np.array([], dtype=np.intp)
+
+# Default first pages kept encoded per index, least recently used dropped first
+PAGE_MEMO_SIZE = 16
+
+
+def encode_cursor(*key):
+    """Opaque cursor for the sort key of the last row of a page."""
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))))
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def parse_list(value):
+    """Comma-separated query parameter as a list, or None when it is not given."""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()] or None
+
+
+def parse_fields(value, allowed, default):
+    """Requested `fields` (or `group_by`) columns, checked against the ones an endpoint can return."""
+    fields = parse_list(value) or list(default)
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed)}")
+    return fields
+
+
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def page_body(key, df, fields, limit, cursor_columns):
+    """Encoded {key: rows, "next_cursor": ...} for a page fetched with one extra row to detect the end."""
+    more = len(df) > limit
+    df = df.head(limit)
+    next_cursor = encode_cursor(*(_plain(df[c].iloc[-1]) for c in cursor_columns)) if more else None
+    return encode_json({key: records(df[fields]), "next_cursor": next_cursor})
+
+
+def counts_body(df):
+    """Encoded {"data": [{<group columns>, "count"}, ...]} of an aggregation."""
+    return encode_json({"data": records(df)})
+
+
+class RankedIndex:
+    """The rows of one snapshot sorted by (score desc, id), indexed for paging and filtering.
+
+    Built once per snapshot version. A cursor is the (score, id) of the last
+    row served and is found again by binary search, while source, location
+    and emotion filters intersect precomputed row positions, so a page costs
+    about the same at any depth.
+    """
+
+    def __init__(self, df, score, filter_columns):
+        df = df.sort_values([score, "id"], ascending=[False, True], kind="mergesort").reset_index(drop=True)
+        self.df = df
+        self.score = score
+        self._neg_scores = -df[score].to_numpy(dtype=float)
+        self._ids = df["id"].astype(str).to_numpy(dtype=str)
+        self._timestamps = df["timestamp"].to_numpy(dtype=float) if "timestamp" in df.columns else None
+        self._positions = {
+            column: {value: np.asarray(rows) for value, rows in df.groupby(column, sort=False).indices.items()}
+            for column in filter_columns if column in df.columns
+        }
+        self._encoded = OrderedDict()
+
+    def _start(self, cursor):
+        """Position of the first row after `cursor`."""
+        if cursor is None:
+            return 0
+        score, row_id = cursor
+        lo = np.searchsorted(self._neg_scores, -score, side="left")
+        hi = np.searchsorted(self._neg_scores, -score, side="right")
+        return lo + np.searchsorted(self._ids[lo:hi], str(row_id), side="right")
+
+    def rows(self, cursor=None, filters=None, since=None, until=None):
+        """Positions, in rank order, of the rows after `cursor` that match every filter."""
+        start = self._start(cursor)
+        rows = None
+        for column, values in (filters or {}).items():
+            if not values:
+                continue
+            positions = self._positions.get(column, {})
+            matches = np.sort(np.concatenate([positions.get(value, _NO_ROWS) for value in values]))
+            rows = matches if rows is None else np.intersect1d(rows, matches, assume_unique=True)
+        rows = np.arange(start, len(self.df)) if rows is None else rows[np.searchsorted(rows, start):]
+        if self._timestamps is not None and (since is not None or until is not None):
+            stamps = self._timestamps[rows]
+            keep = np.ones(len(rows), dtype=bool)
+            if since is not None:
+                keep &= stamps >= since
+            if until is not None:
+                keep &= stamps < until
+            rows = rows[keep]
+        return rows
+
+    def page(self, key, fields, limit, cursor=None, filters=None, since=None, until=None):
+        """Encoded page of `fields`; the default first page is serialized once per snapshot."""
+        default = cursor is None and not any((filters or {}).values()) and since is None and until is None
+        memo = (tuple(fields), limit) if default else None
+        if memo in self._encoded:
+            self._encoded.move_to_end(memo)
+            return self._encoded[memo]
+        rows = self.rows(cursor, filters, since, until)[:limit + 1]
+        fields = [field for field in fields if field in self.df.columns]
+        body = page_body(key, self.df.iloc[rows], fields, limit, [self.score, "id"])
+        if memo is not None:
+            self._encoded[memo] = body
+            if len(self._encoded) > PAGE_MEMO_SIZE:
+                self._encoded.popitem(last=False)
+        return body
+
+    def counts(self, group_by, limit=None, filters=None, since=None, until=None):
+        """Encoded row counts per combination of the `group_by` columns, largest first."""
+        df = self.df.iloc[self.rows(None, filters, since, until)]
+        counts = df.groupby(group_by, observed=True).size().sort_values(ascending=False, kind="mergesort")
+        if limit:
+            counts = counts.head(limit)
+        return counts_body(counts.rename("count").reset_index())
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import asyncio
+import anyio
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from event_store import query_events
+
+# How often the hub checks the snapshot manifest for new versions
+STREAM_POLL_SECONDS = float(os.environ.get("STREAM_POLL_SECONDS", "1"))
+STREAM_HEARTBEAT_SECONDS = 15
+
+# Events buffered per client; a client that falls this far behind is disconnected and resyncs on reconnect
+CLIENT_QUEUE_SIZE = 64
+
+# Newest posts included in one `posts` event
+DELTA_POST_LIMIT = 50
+DELTA_POST_COLUMNS = ["id", "text", "emotion", "sentiment", "timestamp", "location", "source", "ingested_at"]
+
+router = APIRouter()
+
+
+def sse(event, payload):
+    """One Server-Sent Events message, encoded once and shared by every client."""
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False, allow_nan=False)}\n\n".encode("utf-8")
+
+
+class UpdateHub:
+    """Fans out pipeline updates to every connected stream client.
+
+    A single watcher task polls the snapshot manifest and, when a version
+    changes, computes the delta once: new posts and refreshed insight counts
+    for `events`, the alert state for `alert`, and a `snapshot` notice for
+    any other artifact. Each encoded message is then put on every client's
+    queue, so the per-client cost is one queue put.
+    """
+
+    def __init__(self, cache, alert_path):
+        self.cache = cache
+        self.alert_path = alert_path
+        self.clients = set()
+        self.versions = None
+        self.watermark = None
+        # Latest insights/alert messages, replayed to clients when they connect
+        self.current = {}
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.clients.discard(queue)
+
+    def broadcast(self, message):
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too slow to keep up: drop its backlog and end its stream
+                self.clients.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def run(self):
+        while True:
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"⚠️ Stream update failed: {e}")
+            await asyncio.sleep(STREAM_POLL_SECONDS)
+
+    async def check(self):
+        artifacts = self.cache.snapshots.manifest()["artifacts"]
+        versions = {name: entry["version"] for name, entry in artifacts.items()}
+        if self.versions is None:
+            # First run: remember where we are and prepare the state new clients receive
+            self.versions = versions
+            self.watermark = time.time()
+            await self.refresh_insights(send=False)
+            await self.refresh_alert(send=False)
+            return
+
+        changed = [name for name, version in versions.items() if self.versions.get(name) != version]
+        self.versions = versions
+        for name in changed:
+            if name == "events":
+                await self.send_new_posts()
+                await self.refresh_insights()
+            elif name == "alert":
+                await self.refresh_alert()
+            else:
+                self.broadcast(sse("snapshot", {"artifact": name, "version": versions[name]}))
+
+    async def send_new_posts(self):
+        df = await anyio.to_thread.run_sync(
+            lambda: query_events(columns=DELTA_POST_COLUMNS, ingested_after=self.watermark)
+        )
+        if df.empty:
+            return
+        self.watermark = float(df["ingested_at"].max())
+        posts = df.drop(columns=["ingested_at"]).tail(DELTA_POST_LIMIT)
+        records = posts.astype(object).where(posts.notna(), None).to_dict(orient="records")
+        self.broadcast(sse("posts", {"count": len(df), "posts": records}))
+
+    async def refresh_insights(self, send=True):
+        view = await self.cache.posts_async()
+        message = sse("insights", {
+            "insights": view.payloads["sentiment_insights"]["insights"],
+            "emotion_distribution": view.payloads["emotion_distribution"],
+            "top_locations": view.payloads["top_locations"],
+        })
+        self.current["insights"] = message
+        if send:
+            self.broadcast(message)
+
+    async def refresh_alert(self, send=True):
+        alert = await self.cache.text_file_async("alert", self.alert_path)
+        message = sse("alert", {"alert": alert is not None, "message": alert or ""})
+        self.current["alert"] = message
+        if send:
+            self.broadcast(message)
+
+
+@router.get("/stream")
+async def stream(request: Request):
+    """Server-Sent Events: `posts`, `insights`, `alert` and `snapshot` messages as the pipeline publishes."""
+    hub = request.app.state.hub
+    queue = hub.subscribe()
+
+    async def events():
+        try:
+            yield b"retry: 5000\n\n"
+            for message in list(hub.current.values()):
+                yield message
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            hub.unsubscribe(queue)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -1,27 +1,60 @@
-import pandas as pd
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-app = FastAPI()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-CSV_FILE = "data/sentiment_trends.csv"
-
-@app.get("/get_sentiment_trends")
-def get_sentiment_trends():
-    try:
-        df = pd.read_csv(CSV_FILE)
-        return {"data": df.to_dict(orient="records")}
-    except Exception as e:
-        return {"error": str(e)}
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8003)
+from typing import Optional
+from fastapi import APIRouter, Request, Response
+from paging import parse_list
+from read_cache import encode_json
+
+router = APIRouter()
+
+TRENDS = "trends"
+
+@router.get("/get_sentiment_trends")
+async def get_sentiment_trends(request: Request, source: Optional[str] = None, location: Optional[str] = None,
+                               segment_type: Optional[str] = None):
+    """Forecast of the overall sentiment, or of the given segments
+
+    `source` and `location` take comma-separated values; `segment_type`
+    (`source` or `location`) returns every forecast segment of that column.
+    Segment rows carry `segment_type` and `segment`; `segments` lists what exists.
+    """
+    try:
+        view = await request.app.state.cache.artifact_async(TRENDS, trend_records, encode=False)
+        segments = [("source", value) for value in parse_list(source) or []] + \
+                   [("location", value) for value in parse_list(location) or []]
+        if segments:
+            body = view.json(segments)
+        elif segment_type:
+            body = view.json([key for key in view.segments if key[0] == segment_type])
+        else:
+            body = view.overall
+        return Response(body, media_type="application/json")
+    except Exception as e:
+        return {"error": str(e)}
+
+class TrendsView:
+    """Forecast rows per segment, with the overall forecast serialized once."""
+
+    def __init__(self, df):
+        # Forecasts written before segments existed hold only the overall series
+        if "segment_type" not in df.columns:
+            df = df.assign(segment_type="all", segment="all")
+        # Parquet keeps `ds` as a datetime; serve the same date strings the CSV had
+        if "ds" in df.columns:
+            df["ds"] = df["ds"].astype(str)
+        self.rows = {key: group.to_dict(orient="records")
+                     for key, group in df.groupby(["segment_type", "segment"], sort=True)}
+        self.segments = [key for key in self.rows if key != ("all", "all")]
+        overall = [{k: v for k, v in row.items() if k not in ("segment_type", "segment")}
+                   for row in self.rows.get(("all", "all"), [])]
+        self.overall = encode_json({"data": overall, "segments": self._listing()})
+
+    def _listing(self):
+        listing = {}
+        for segment_type, segment in self.segments:
+            listing.setdefault(segment_type, []).append(segment)
+        return listing
+
+    def json(self, segments):
+        return encode_json({"data": [row for key in segments for row in self.rows.get(key, [])]})
+
+def trend_records(df):
+    return TrendsView(df)
@@ -1,136 +1,203 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-# Load anomaly detection results
-@st.cache_data
-def load_data():
-    return pd.read_csv("data/anomaly_detection_results.csv")
-
-# Streamlit UI Config
-st.set_page_config(
-    page_title="Sentiment Dashboard",
-    layout="wide",
-    page_icon="📊"
-)
-
-# Custom CSS
-st.markdown("""
-    <style>
-    /* Global Background */
-    .stApp {
-        background-color: #0e1117;
-        color: #ffffff;
-        font-family: 'Segoe UI', sans-serif;
-    }
-
-    /* Header Styling */
-    h1, h2, h3, h4, h5 {
-        color: #f1f1f1;
-    }
-
-    /* Sidebar */
-    .stSidebar {
-        background-color: #1c1e24;
-    }
-
-    /* Card-like section style */
-    .card {
-        background-color: #1e1e2f;
-        padding: 25px;
-        border-radius: 12px;
-        box-shadow: 0 4px 8px rgba(255, 255, 255, 0.08);
-        margin-bottom: 25px;
-    }
-
-    /* Button */
-    .stButton>button {
-        background-color: #ff6f61;
-        color: white;
-        padding: 0.5rem 1.5rem;
-        border-radius: 8px;
-        font-weight: bold;
-        transition: background 0.3s;
-    }
-
-    .stButton>button:hover {
-        background-color: #e25b4d;
-    }
-
-    /* Filter widgets */
-    .stSelectbox, .stDateInput {
-        background-color: #222;
-        color: white;
-    }
-
-    /* Plot background */
-    .css-1y0tads, .css-1r6slb0 {
-        background-color: #1e1e2f !important;
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-# Page Title
-st.title("📊 Real-Time Sentiment Analysis Dashboard")
-st.markdown("Explore real-time trends, anomalies, and insights derived from live Reddit data.")
-
-# Load data
-df = load_data()
-
-# Date formatting
-df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-
-# Sidebar Filters
-st.sidebar.title("🔧 Filter Settings")
-min_date, max_date = df['timestamp'].min(), df['timestamp'].max()
-selected_range = st.sidebar.date_input("Select Date Range", [min_date, max_date])
-
-# Filter data
-filtered_df = df[(df['timestamp'] >= pd.to_datetime(selected_range[0])) &
-                 (df['timestamp'] <= pd.to_datetime(selected_range[1]))]
-
-# Card: Sentiment Score Distribution
-with st.container():
-    st.markdown("### 📌 Sentiment Score Distribution")
-    fig = px.histogram(filtered_df, x="sentiment_score", nbins=50,
-                       title="Distribution of Sentiment Scores",
-                       color_discrete_sequence=["#1f77b4"])
-    fig.update_layout(template="plotly_dark", paper_bgcolor="#0e1117")
-    st.plotly_chart(fig, use_container_width=True)
-
-# Card: Sentiment Over Time
-with st.container():
-    st.markdown("### 📈 Sentiment Score Over Time")
-    fig = px.line(filtered_df, x="timestamp", y="sentiment_score",
-                  title="Sentiment Trend",
-                  color_discrete_sequence=["#2ca02c"])
-    fig.update_layout(template="plotly_dark", paper_bgcolor="#0e1117")
-    st.plotly_chart(fig, use_container_width=True)
-
-# Card: Sarcasm Detection
-with st.container():
-    st.markdown("### 🎭 Sarcasm Label Distribution")
-    fig = px.histogram(filtered_df, x="sarcasm_label",
-                       title="Sarcasm Distribution",
-                       color_discrete_sequence=["#ff7f0e"])
-    fig.update_layout(template="plotly_dark", paper_bgcolor="#0e1117")
-    st.plotly_chart(fig, use_container_width=True)
-
-# Card: Anomaly Detection
-with st.container():
-    st.markdown("### 🚨 Detected Anomalies in Sentiment")
-    fig = px.scatter(filtered_df, x="timestamp", y="sentiment_score",
-                     color="anomaly", title="Anomalous Points",
-                     color_discrete_sequence=["#d62728", "#17becf"])
-    fig.update_layout(template="plotly_dark", paper_bgcolor="#0e1117")
-    st.plotly_chart(fig, use_container_width=True)
-
-# Card: Data View
-with st.expander("🔍 View Sample Data"):
-    st.dataframe(filtered_df.head(10), use_container_width=True)
-
-# Footer
-st.markdown("---")
-st.markdown("🚀 **Auto-updated every few minutes!**" )
-st.markdown("⚡Powered by Transformers + Prophet + Reddit API.")
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+from storage import read_artifact, snapshot_reader
+from event_store import count_rollups, event_bounds, events_exist, query_events, rollup_series
+from anomaly_detection import emotion_to_score
+from downsampling import lttb
+
+# Cached queries are keyed on the snapshot versions and also expire after this many seconds
+DASHBOARD_CACHE_SECONDS = int(os.environ.get("DASHBOARD_CACHE_SECONDS", "60"))
+
+# Days shown when the dashboard opens
+DEFAULT_RANGE_DAYS = 7
+
+# Every loader takes the snapshot `version` it reads, so a new pipeline cycle misses the cache
+def snapshot_versions():
+    snapshots = snapshot_reader()
+    return snapshots.version("events"), snapshots.version("anomalies")
+
+@st.cache_data(ttl=DASHBOARD_CACHE_SECONDS)
+def load_bounds(version):
+    return event_bounds()
+
+@st.cache_data(ttl=DASHBOARD_CACHE_SECONDS)
+def load_score_counts(since, until, version):
+    """Posts per sentiment score in the range, summed from the rollups."""
+    counts = count_rollups(["emotion"], since=since, until=until)
+    counts["sentiment_score"] = counts["emotion"].map(emotion_to_score)
+    return counts
+
+@st.cache_data(ttl=DASHBOARD_CACHE_SECONDS)
+def load_score_series(since, until, version):
+    """Mean sentiment score per rollup bucket, downsampled to MAX_CHART_POINTS with LTTB."""
+    counts, _ = rollup_series(["emotion"], since, until)
+    counts["weighted"] = counts["emotion"].map(emotion_to_score) * counts["count"]
+    series = counts.groupby("bucket")[["weighted", "count"]].sum().reset_index()
+    series["sentiment_score"] = series["weighted"] / series["count"]
+    series["timestamp"] = pd.to_datetime(series["bucket"], unit="s")
+    return lttb(series[["timestamp", "sentiment_score"]], "timestamp", "sentiment_score")
+
+@st.cache_data(ttl=DASHBOARD_CACHE_SECONDS)
+def load_sarcasm_counts(since, until, version):
+    return count_rollups(["sarcasm_label"], since=since, until=until)
+
+@st.cache_data(ttl=DASHBOARD_CACHE_SECONDS)
+def load_anomalies(since, until, version):
+    """Every anomalous post in the range, read with Parquet filters and not downsampled."""
+    filters = [("timestamp", ">=", since), ("timestamp", "<", until), ("anomaly", "==", "anomalous")]
+    try:
+        df = read_artifact("anomalies", columns=["timestamp", "sentiment_score", "anomaly"], filters=filters,
+                           as_category=False)
+    except FileNotFoundError:
+        return pd.DataFrame(columns=["timestamp", "sentiment_score", "anomaly"])
+    df = df.sort_values("timestamp")
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+    return df
+
+@st.cache_data(ttl=DASHBOARD_CACHE_SECONDS)
+def load_sample(since, until, version):
+    return query_events(since=since, until=until, latest=10)
+
+# Streamlit UI Config
+st.set_page_config(
+    page_title="Sentiment Dashboard",
+    layout="wide",
+    page_icon="📊"
+)
+
+# Custom CSS
+st.markdown("""
+    <style>
+    /* Global Background */
+    .stApp {
+        background-color: #0e1117;
+        color: #ffffff;
+        font-family: 'Segoe UI', sans-serif;
+    }
+
+    /* Header Styling */
+    h1, h2, h3, h4, h5 {
+        color: #f1f1f1;
+    }
+
+    /* Sidebar */
+    .stSidebar {
+        background-color: #1c1e24;
+    }
+
+    /* Card-like section style */
+    .card {
+        background-color: #1e1e2f;
+        padding: 25px;
+        border-radius: 12px;
+        box-shadow: 0 4px 8px rgba(255, 255, 255, 0.08);
+        margin-bottom: 25px;
+    }
+
+    /* Button */
+    .stButton>button {
+        background-color: #ff6f61;
+        color: white;
+        padding: 0.5rem 1.5rem;
+        border-radius: 8px;
+        font-weight: bold;
+        transition: background 0.3s;
+    }
+
+    .stButton>button:hover {
+        background-color: #e25b4d;
+    }
+
+    /* Filter widgets */
+    .stSelectbox, .stDateInput {
+        background-color: #222;
+        color: white;
+    }
+
+    /* Plot background */
+    .css-1y0tads, .css-1r6slb0 {
+        background-color: #1e1e2f !important;
+    }
+    </style>
+""", unsafe_allow_html=True)
+
+# Page Title
+st.title("📊 Real-Time Sentiment Analysis Dashboard")
+st.markdown("Explore real-time trends, anomalies, and insights derived from live Reddit data.")
+
+if not events_exist():
+    st.info("No posts stored yet. Run the pipeline to fill the event store.")
+    st.stop()
+
+events_version, anomalies_version = snapshot_versions()
+oldest, newest = load_bounds(events_version)
+if oldest is None:
+    st.info("No posts stored yet. Run the pipeline to fill the event store.")
+    st.stop()
+
+# Sidebar Filters
+st.sidebar.title("🔧 Filter Settings")
+min_date = pd.to_datetime(oldest, unit='s').date()
+max_date = pd.to_datetime(newest, unit='s').date()
+default_start = max(min_date, max_date - pd.Timedelta(days=DEFAULT_RANGE_DAYS))
+selected_range = st.sidebar.date_input("Select Date Range", [default_start, max_date],
+                                       min_value=min_date, max_value=max_date)
+
+# Only the selected days are queried; the end date is included
+start_date, end_date = selected_range if len(selected_range) == 2 else (selected_range[0], selected_range[0])
+since = pd.Timestamp(start_date).timestamp()
+until = (pd.Timestamp(end_date) + pd.Timedelta(days=1)).timestamp()
+
+# Card: Sentiment Score Distribution
+with st.container():
+    st.markdown("### 📌 Sentiment Score Distribution")
+    fig = px.histogram(load_score_counts(since, until, events_version), x="sentiment_score", y="count", nbins=50,
+                       title="Distribution of Sentiment Scores",
+                       color_discrete_sequence=["#1f77b4"])
+    fig.update_layout(template="plotly_dark", paper_bgcolor="#0e1117")
+    st.plotly_chart(fig, use_container_width=True)
+
+# Card: Sentiment Over Time
+with st.container():
+    st.markdown("### 📈 Sentiment Score Over Time")
+    fig = px.line(load_score_series(since, until, events_version), x="timestamp", y="sentiment_score",
+                  title="Sentiment Trend",
+                  color_discrete_sequence=["#2ca02c"])
+    fig.update_layout(template="plotly_dark", paper_bgcolor="#0e1117")
+    st.plotly_chart(fig, use_container_width=True)
+
+# Card: Sarcasm Detection
+with st.container():
+    st.markdown("### 🎭 Sarcasm Label Distribution")
+    fig = px.histogram(load_sarcasm_counts(since, until, events_version), x="sarcasm_label", y="count",
+                       title="Sarcasm Distribution",
+                       color_discrete_sequence=["#ff7f0e"])
+    fig.update_layout(template="plotly_dark", paper_bgcolor="#0e1117")
+    st.plotly_chart(fig, use_container_width=True)
+
+# Card: Anomaly Detection
+with st.container():
+    st.markdown("### 🚨 Detected Anomalies in Sentiment")
+    # Anomalous posts over the (downsampled) mean score of all posts
+    points = pd.concat([load_score_series(since, until, events_version).assign(anomaly="normal"),
+                        load_anomalies(since, until, anomalies_version)], ignore_index=True)
+    fig = px.scatter(points, x="timestamp", y="sentiment_score",
+                     color="anomaly", title="Anomalous Points",
+                     color_discrete_sequence=["#d62728", "#17becf"])
+    fig.update_layout(template="plotly_dark", paper_bgcolor="#0e1117")
+    st.plotly_chart(fig, use_container_width=True)
+
+# Card: Data View
+with st.expander("🔍 View Sample Data"):
+    st.dataframe(load_sample(since, until, events_version), use_container_width=True)
+
+# Footer
+st.markdown("---")
+st.markdown("🚀 **Auto-updated every few minutes!**" )
+st.markdown("⚡Powered by Transformers + Prophet + Reddit API.")
 st.markdown( "  Built with ❤️ using Streamlit and Plotly.") 
\ No newline at end of file
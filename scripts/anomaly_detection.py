@@ -1,109 +1,316 @@
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import IsolationForest
-from sklearn.preprocessing import MinMaxScaler
-import os
-import json
-import time
-
-ALERT_PATH = "data/alert_flag.txt"
-CSV_INPUT = "data/emotion_analysis_results.csv"
-CSV_OUTPUT = "data/anomaly_detection_results.csv"
-JSON_OUTPUT = "data/anomaly_posts.json"
-
-# Load Data
-def load_data(file_path=CSV_INPUT):
-    df = pd.read_csv(file_path)
-    if "emotion" not in df.columns:
-        raise KeyError("❌ Missing 'emotion' column!")
-    print(f"✅ Loaded data: {df.shape}")
-    return df
-
-# Convert emotion to score
-def emotion_to_score(emotion):
-    emotion_map = {
-        "joy": 1.0, "love": 0.8, "happy": 1.0,
-        "surprise": 0.5, "neutral": 0.0,
-        "sadness": -0.6, "anger": -1.0,
-        "fear": -0.8, "disgust": -1.0
-    }
-    return emotion_map.get(str(emotion).lower(), 0.0)
-
-# Detect anomalies
-def detect_anomalies(df, contamination=0.05):
-    df["sentiment_score"] = df["emotion"].apply(emotion_to_score)
-
-    if df["sentiment_score"].var() == 0:
-        print("⚠️ No variance in sentiment scores. Skipping IsolationForest.")
-        df["anomaly"] = "normal"
-        df["anomaly_score"] = 0.0
-        return df
-
-    model = IsolationForest(contamination=contamination, random_state=42)
-    df["anomaly_raw"] = model.fit_predict(df[["sentiment_score"]])
-    df["anomaly_score_raw"] = model.decision_function(df[["sentiment_score"]])
-
-    scaler = MinMaxScaler()
-    df["anomaly_score"] = 1 - scaler.fit_transform(df[["anomaly_score_raw"]])
-    df["anomaly"] = df["anomaly_raw"].apply(lambda x: "anomalous" if x == -1 else "normal")
-
-    return df
-
-# Save results
-def save_results(df, path=CSV_OUTPUT):
-    df.to_csv(path, index=False)
-    print(f"💾 Saved results to {path}")
-
-# Save anomalies
-def save_anomalous_posts(df, path=JSON_OUTPUT):
-    df[df["anomaly"] == "anomalous"][["text", "emotion", "anomaly_score"]].to_json(
-        path, orient="records", force_ascii=False
-    )
-    print(f"📤 Anomalous posts saved to {path}")
-
-# Trigger alert
-def trigger_alert(df, alert_path=ALERT_PATH, force=False):
-    serious_threshold = -0.6
-    anomalies = df[df["anomaly"] == "anomalous"]
-    serious = anomalies[anomalies["sentiment_score"] <= serious_threshold]
-
-    print(f"🔍 Total anomalies: {len(anomalies)}")
-    print(f"🚨 Serious anomalies: {len(serious)}")
-
-    if force or not anomalies.empty:
-        alert_text = "🚨 Alert: "
-        if force:
-            alert_text += "Strong negative sentiment anomaly detected.\n"
-        elif not serious.empty:
-            alert_text += "Sudden spike in public *anger, fear, or disgust* detected.\n"
-        else:
-            alert_text += "Unusual sentiment activity detected.\n"
-
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        alert_text += f"Time: {timestamp}"
-
-        with open(alert_path, "w", encoding="utf-8") as f:
-            f.write(alert_text)
-        print("⚠️ ALERT TRIGGERED & FILE WRITTEN ✅")
-    else:
-        if os.path.exists(alert_path):
-            os.remove(alert_path)
-            print("ℹ️ No alert file to remove.")
-
-# Run all
-if __name__ == "__main__":
-    print("🔍 Loading data...")
-    df = load_data()
-
-    print("🧠 Running anomaly detection...")
-    df = detect_anomalies(df)
-
-    print("📢 Evaluating sentiment alert...")
-    # 👇 Change force=True to test alert popup even without real anomaly
-    trigger_alert(df, force=True)
-
-    print("📁 Writing results...")
-    save_results(df)
-    save_anomalous_posts(df)
-
-    print("✅ DONE")
+import pandas as pd
+import numpy as np
+import os
+import json
+import time
+from publish import publish_file, retract_file
+from storage import read_artifact, write_artifact
+from event_store import events_exist, query_events
+
+ALERT_PATH = "data/alert_flag.txt"
+ARTIFACT_INPUT = "emotions"
+ARTIFACT_OUTPUT = "anomalies"
+JSON_OUTPUT = "data/anomaly_posts.json"
+
+# Rolling statistics of the rate detector, kept between pipeline cycles
+DETECTOR_STATE = "data/store/anomaly_detector.json"
+
+# Emotion shares are measured per time bucket of this many minutes
+BUCKET_MINUTES = int(os.environ.get("ANOMALY_BUCKET_MINUTES", "60"))
+
+# EWMA weight of the newest bucket; 0.1 remembers roughly the last 10-20 buckets
+EWMA_ALPHA = float(os.environ.get("ANOMALY_EWMA_ALPHA", "0.1"))
+
+# A share this many standard deviations above its EWMA is a spike
+Z_THRESHOLD = float(os.environ.get("ANOMALY_Z_THRESHOLD", "4"))
+
+# Buckets with fewer posts in a segment are too noisy to score or learn from
+MIN_BUCKET_POSTS = 30
+
+# Buckets a segment needs before its statistics are trusted
+WARMUP_BUCKETS = 6
+
+# Floor for the standard deviation, so a flat history does not turn noise into spikes
+MIN_STD = 0.01
+
+# Buckets stay open this long for posts that arrive late, then are scored and folded into the EWMA
+LATE_BUCKETS = 1
+
+# Spikes are remembered (and their posts published) for this long
+SPIKE_HISTORY_HOURS = 24
+
+# Segments every post is counted in: the whole stream, its source and its location
+SEGMENT_COLUMNS = ["source", "location"]
+
+POST_COLUMNS = ["id", "text", "emotion", "timestamp", "location", "source", "vader_compound"]
+
+# Load Data
+def load_data(artifact=ARTIFACT_INPUT):
+    df = read_artifact(artifact, as_category=False)
+    if "emotion" not in df.columns:
+        raise KeyError("❌ Missing 'emotion' column!")
+    print(f"✅ Loaded data: {df.shape}")
+    return df
+
+# Convert emotion to score
+def emotion_to_score(emotion):
+    emotion_map = {
+        "joy": 1.0, "love": 0.8, "happy": 1.0,
+        "surprise": 0.5, "neutral": 0.0,
+        "sadness": -0.6, "anger": -1.0,
+        "fear": -0.8, "disgust": -1.0
+    }
+    return emotion_map.get(str(emotion).lower(), 0.0)
+
+
+class RateDetector:
+    """Online detector of spikes in the share of each emotion, per source and per location.
+
+    Posts are counted into time buckets of `bucket_minutes` for every segment
+    ("all", "source=<name>", "location=<name>"). When a bucket closes, each
+    emotion's share of the segment's posts is compared with its EWMA mean and
+    variance, and a share more than `z_threshold` standard deviations above
+    the mean is a spike; then the bucket is folded into the statistics. The
+    open buckets are scored as well (provisionally), so a spike shows up
+    while it is happening. An update costs O(new posts); only counts and
+    statistics are kept, never the posts themselves.
+    """
+
+    def __init__(self, bucket_minutes=BUCKET_MINUTES, alpha=EWMA_ALPHA, z_threshold=Z_THRESHOLD, state=None):
+        self.bucket_seconds = bucket_minutes * 60
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        state = state or {}
+        # ingested_at of the newest post seen, so the next cycle reads only what was stored since
+        self.watermark = state.get("watermark")
+        # Buckets before this index are closed; their late posts are dropped
+        self.closed_until = state.get("closed_until")
+        # bucket -> segment -> emotion -> posts, for the buckets still open
+        self.open = {int(bucket): counts for bucket, counts in state.get("open", {}).items()}
+        # segment -> emotion -> [mean share, variance, buckets seen]
+        self.stats = state.get("stats", {})
+        self.spikes = state.get("spikes", [])
+
+    def to_dict(self):
+        return {"watermark": self.watermark, "closed_until": self.closed_until, "open": self.open,
+                "stats": self.stats, "spikes": self.spikes}
+
+    def _counts(self, df):
+        """Posts per (bucket, segment, emotion) in one grouped pass."""
+        buckets = (df["timestamp"] // self.bucket_seconds).astype("int64")
+        parts = [pd.DataFrame({"bucket": buckets, "segment": "all", "emotion": df["emotion"]})]
+        for column in SEGMENT_COLUMNS:
+            if column in df.columns:
+                known = df[column].notna()
+                parts.append(pd.DataFrame({"bucket": buckets[known], "segment": column + "=" + df.loc[known, column].astype(str),
+                                           "emotion": df.loc[known, "emotion"]}))
+        return pd.concat(parts, ignore_index=True).groupby(["bucket", "segment", "emotion"]).size()
+
+    def _score(self, bucket, segment, counts, final):
+        """Spikes of one segment in one bucket; with `final`, the bucket also updates the statistics."""
+        total = sum(counts.values())
+        if total < MIN_BUCKET_POSTS:
+            return []
+        stats = self.stats.setdefault(segment, {})
+        spikes = []
+        for emotion in set(stats) | set(counts):
+            share = counts.get(emotion, 0) / total
+            mean, var, seen = stats.get(emotion, [share, 0.0, 0])
+            # Spread across buckets plus the sampling noise of a share measured on `total` posts
+            std = max(np.sqrt(var + mean * (1 - mean) / total), MIN_STD)
+            z = (share - mean) / std
+            if seen >= WARMUP_BUCKETS and z >= self.z_threshold:
+                spikes.append({
+                    "segment": segment, "emotion": emotion, "bucket_start": bucket * self.bucket_seconds,
+                    "bucket_end": (bucket + 1) * self.bucket_seconds, "share": round(share, 4),
+                    "expected": round(mean, 4), "z": round(float(z), 2), "posts": counts.get(emotion, 0),
+                    "total": total, "final": final,
+                })
+            if final:
+                delta = share - mean
+                stats[emotion] = [mean + self.alpha * delta, (1 - self.alpha) * (var + self.alpha * delta ** 2),
+                                  seen + 1]
+        return spikes
+
+    def update(self, df):
+        """Counts new posts (needs `timestamp` and `emotion`) and returns the spikes they reveal."""
+        df = df.dropna(subset=["timestamp", "emotion"])
+        if "ingested_at" in df.columns and not df.empty:
+            self.watermark = max(self.watermark or 0, float(df["ingested_at"].max()))
+        if self.closed_until is not None:
+            late = df["timestamp"] < self.closed_until * self.bucket_seconds
+            if late.any():
+                print(f"⏭️ Rate detector: skipped {late.sum()} posts for buckets already closed")
+                df = df[~late]
+
+        if not df.empty:
+            for (bucket, segment, emotion), posts in self._counts(df).items():
+                emotions = self.open.setdefault(int(bucket), {}).setdefault(segment, {})
+                emotions[emotion] = emotions.get(emotion, 0) + int(posts)
+        if not self.open:
+            return []
+
+        spikes = []
+        newest = max(self.open)
+        for bucket in sorted(self.open):
+            final = bucket <= newest - LATE_BUCKETS
+            for segment, counts in self.open[bucket].items():
+                spikes += self._score(bucket, segment, counts, final)
+            if final:
+                del self.open[bucket]
+                self.closed_until = bucket + 1
+
+        self._remember(spikes, newest)
+        return spikes
+
+    def _remember(self, spikes, newest):
+        """Recent final spikes plus this update's verdicts; open buckets are rescored every update."""
+        horizon = (newest + 1) * self.bucket_seconds - SPIKE_HISTORY_HOURS * 3600
+        self.spikes = [spike for spike in self.spikes if spike["final"] and spike["bucket_start"] >= horizon] + spikes
+
+
+def load_detector(path=DETECTOR_STATE):
+    """The rate detector with the statistics saved by the last cycle, or a fresh one."""
+    if not os.path.exists(path):
+        return RateDetector()
+    with open(path, encoding="utf-8") as f:
+        return RateDetector(state=json.load(f))
+
+def save_detector(detector, path=DETECTOR_STATE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(detector.to_dict(), f)
+    os.replace(tmp_path, path)
+
+# Posts stored in the event store since the detector last ran
+def load_new_posts(detector):
+    df = query_events(columns=POST_COLUMNS + ["ingested_at"], ingested_after=detector.watermark)
+    print(f"✅ Loaded {len(df)} new posts")
+    return df
+
+# Detect anomalies
+def detect_anomalies(df, detector):
+    spikes = detector.update(df)
+    for spike in spikes:
+        state = "spike" if spike["final"] else "rising"
+        print(f"📈 {state}: {spike['emotion']} in {spike['segment']} at {spike['share']:.0%} of "
+              f"{spike['total']} posts (usually {spike['expected']:.0%}, z={spike['z']})")
+    return spikes
+
+# Posts behind the spikes
+def spike_posts(spikes, df=None):
+    """Posts in each spike's segment, emotion and bucket; read from the event store unless `df` is given."""
+    frames = []
+    for spike in spikes:
+        column, _, value = spike["segment"].partition("=")
+        if df is None:
+            filters = {"sources": [value]} if column == "source" else {"locations": [value]} if column == "location" else {}
+            posts = query_events(since=spike["bucket_start"], until=spike["bucket_end"], emotions=[spike["emotion"]],
+                                 columns=POST_COLUMNS, **filters)
+        else:
+            posts = df[(df["timestamp"] >= spike["bucket_start"]) & (df["timestamp"] < spike["bucket_end"])
+                       & (df["emotion"] == spike["emotion"])]
+            if column in SEGMENT_COLUMNS:
+                posts = posts[posts[column] == value] if column in posts.columns else posts.iloc[:0]
+        frames.append(posts)
+    if not frames:
+        return pd.DataFrame(columns=POST_COLUMNS)
+    return pd.concat(frames, ignore_index=True).drop_duplicates("id")
+
+# Flag posts that are part of a spike
+def flag_posts(df, spikes):
+    """Marks posts inside a spike as anomalous, scored by the spike's z-score (the strongest if several)."""
+    df["sentiment_score"] = df["emotion"].apply(emotion_to_score)
+    df["anomaly_score"] = 0.0
+    for spike in spikes:
+        column, _, value = spike["segment"].partition("=")
+        inside = (df["timestamp"] >= spike["bucket_start"]) & (df["timestamp"] < spike["bucket_end"]) \
+            & (df["emotion"] == spike["emotion"])
+        if column in SEGMENT_COLUMNS:
+            inside &= (df[column] == value) if column in df.columns else False
+        df.loc[inside, "anomaly_score"] = df.loc[inside, "anomaly_score"].clip(lower=spike["z"])
+    df["anomaly"] = np.where(df["anomaly_score"] > 0, "anomalous", "normal")
+    return df
+
+def anomaly_results(df, spikes, history=None):
+    """This cycle's posts flagged against the spikes, plus the posts behind recent spikes that are not among them."""
+    behind = spike_posts(spikes, history)
+    if "id" in df.columns:
+        behind = behind[~behind["id"].isin(df["id"])]
+    if not behind.empty:
+        df = pd.concat([df, behind], ignore_index=True)
+    return flag_posts(df, spikes)
+
+# Save results
+def save_results(df, artifact=ARTIFACT_OUTPUT):
+    write_artifact(df, artifact)
+    print(f"💾 Saved results to '{artifact}'")
+
+# Save anomalies
+def save_anomalous_posts(df, path=JSON_OUTPUT):
+    records = df[df["anomaly"] == "anomalous"][["text", "emotion", "anomaly_score"]].to_json(
+        orient="records", force_ascii=False
+    )
+    publish_file("anomaly_posts", path, records)
+    print(f"📤 Anomalous posts saved to {path}")
+
+# Trigger alert
+def trigger_alert(spikes, alert_path=ALERT_PATH, force=False):
+    serious_threshold = -0.6
+    serious = [spike for spike in spikes if emotion_to_score(spike["emotion"]) <= serious_threshold]
+
+    print(f"🔍 Emotion-rate spikes: {len(spikes)}")
+    print(f"🚨 Serious spikes: {len(serious)}")
+
+    if force or spikes:
+        alert_text = "🚨 Alert: "
+        if force and not spikes:
+            alert_text += "Strong negative sentiment anomaly detected.\n"
+        elif serious:
+            alert_text += "Sudden spike in public *anger, fear, or disgust* detected.\n"
+        else:
+            alert_text += "Unusual sentiment activity detected.\n"
+
+        # Name the strongest spikes, e.g. "anger in source=canada: 41% of posts (usually 12%)"
+        for spike in sorted(serious or spikes, key=lambda s: s["z"], reverse=True)[:3]:
+            alert_text += f"{spike['emotion']} in {spike['segment']}: {spike['share']:.0%} of posts (usually {spike['expected']:.0%})\n"
+
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        alert_text += f"Time: {timestamp}"
+
+        publish_file("alert", alert_path, alert_text)
+        print("⚠️ ALERT TRIGGERED & FILE WRITTEN ✅")
+    else:
+        if os.path.exists(alert_path):
+            retract_file("alert", alert_path)
+            print("ℹ️ No alert file to remove.")
+
+# Run all
+if __name__ == "__main__":
+    print("🔍 Loading data...")
+    df = load_data()
+    if events_exist():
+        detector = load_detector()
+        new = load_new_posts(detector)
+        history = None
+    else:
+        # No event store yet: replay the whole artifact through a fresh detector, without saving its state
+        detector = RateDetector()
+        new = history = df
+
+    print("🧠 Running anomaly detection...")
+    spikes = detect_anomalies(new, detector)
+    if history is None:
+        save_detector(detector)
+
+    print("📢 Evaluating sentiment alert...")
+    # 👇 Change force=True to test alert popup even without real anomaly
+    trigger_alert(spikes)
+
+    print("📁 Writing results...")
+    df = anomaly_results(df, detector.spikes, history)
+    save_results(df)
+    save_anomalous_posts(df)
+
+    print("✅ DONE")
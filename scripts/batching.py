@@ -0,0 +1,65 @@
+from tqdm import tqdm
+
+# Padded tokens per batch (rows x longest row); 32 rows of 256 tokens
+MAX_BATCH_TOKENS = 8192
+MAX_BATCH_SIZE = 64
+
+
+def token_lengths(tokenizer, texts):
+    """Returns the truncated token length of every text."""
+    if not texts:
+        return []
+    return [len(ids) for ids in tokenizer(list(texts), truncation=True)["input_ids"]]
+
+
+def token_budget_batches(lengths, max_tokens=MAX_BATCH_TOKENS, max_batch_size=MAX_BATCH_SIZE):
+    """Groups item indices into batches whose padded size stays under `max_tokens`.
+
+    Items are sorted by length first, so a long post only pads the few
+    similarly long posts batched with it. A single item longer than the
+    budget still gets a batch of its own.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches, current, longest = [], [], 0
+    for i in order:
+        candidate_longest = max(longest, lengths[i])
+        if current and ((len(current) + 1) * candidate_longest > max_tokens or len(current) >= max_batch_size):
+            batches.append(current)
+            current, candidate_longest = [], lengths[i]
+        current.append(i)
+        longest = candidate_longest
+    if current:
+        batches.append(current)
+    return batches
+
+
+def predict_bisect(predict_batch, items, fallback="UNKNOWN"):
+    """Runs `predict_batch`, splitting a failing batch in half until the bad item is isolated.
+
+    Only the items that fail on their own get `fallback`. Returns the
+    predictions and the number of items that fell back.
+    """
+    try:
+        return list(predict_batch(items)), 0
+    except Exception as e:
+        if len(items) == 1:
+            print(f"❌ Prediction failed for one text: {e}")
+            return [fallback], 1
+    mid = len(items) // 2
+    left, left_failed = predict_bisect(predict_batch, items[:mid], fallback)
+    right, right_failed = predict_bisect(predict_batch, items[mid:], fallback)
+    return left + right, left_failed + right_failed
+
+
+def predict_dynamic(predict_batch, texts, lengths, max_tokens=MAX_BATCH_TOKENS, fallback="UNKNOWN"):
+    """Predicts `texts` in length-sorted, token-budgeted batches and returns results in input order."""
+    results = [None] * len(texts)
+    failed = 0
+    for batch in tqdm(token_budget_batches(lengths, max_tokens)):
+        predicted, batch_failed = predict_bisect(predict_batch, [texts[i] for i in batch], fallback)
+        failed += batch_failed
+        for i, label in zip(batch, predicted):
+            results[i] = label
+    if failed:
+        print(f"⚠️ {failed} texts could not be classified and were marked {fallback}")
+    return results
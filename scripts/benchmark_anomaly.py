@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+N_POSTS = int(os.environ.get("N_POSTS", "1000000"))
+DAYS = 30
+CYCLE_HOURS = 1
+
+EMOTIONS = ["joy", "neutral", "sadness", "anger", "fear", "surprise"]
+SHARES = [0.25, 0.3, 0.15, 0.12, 0.1, 0.08]
+SOURCES = ["canada", "unitedkingdom", "australia", "india", "germany"]
+LOCATIONS = ["Toronto", "London", "Sydney", "Delhi", "Berlin", "Unknown"]
+
+
+def synthetic_history(n, seed=42):
+    """`n` posts over DAYS days with an anger spike in r/canada two to four hours before the end."""
+    rng = np.random.default_rng(seed)
+    end = time.time()
+    df = pd.DataFrame({
+        "id": [f"p{i:07d}" for i in range(n)],
+        "timestamp": np.sort(end - rng.uniform(0, DAYS * 86400, n)),
+        "source": rng.choice(SOURCES, n),
+        "location": rng.choice(LOCATIONS, n),
+        "emotion": rng.choice(EMOTIONS, n, p=SHARES),
+        "vader_compound": rng.uniform(-1, 1, n),
+    })
+    spike = (df["source"] == "canada") & df["timestamp"].between(end - 4 * 3600, end - 2 * 3600)
+    df["injected"] = spike & (rng.uniform(size=n) < 0.5)
+    df.loc[df["injected"], "emotion"] = "anger"
+    return df, end
+
+
+def legacy_detect(df, contamination=0.05):
+    """The previous detector: an IsolationForest refit on every post each cycle."""
+    from sklearn.ensemble import IsolationForest
+    from sklearn.preprocessing import MinMaxScaler
+    from anomaly_detection import emotion_to_score
+
+    df["sentiment_score"] = df["emotion"].apply(emotion_to_score)
+    X = df[["sentiment_score", "vader_compound"]].fillna(0.0)
+    model = IsolationForest(contamination=contamination, random_state=42)
+    df["anomaly_raw"] = model.fit_predict(X)
+    df["anomaly_score_raw"] = model.decision_function(X)
+    df["anomaly_score"] = 1 - MinMaxScaler().fit_transform(df[["anomaly_score_raw"]])
+    df["anomaly"] = df["anomaly_raw"].apply(lambda x: "anomalous" if x == -1 else "normal")
+    return df
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, SCRIPTS_DIR)
+    from anomaly_detection import RateDetector, spike_posts
+
+    df, end = synthetic_history(N_POSTS)
+    injected = df["injected"].sum()
+    print(f"📂 {N_POSTS:,} posts over {DAYS} days, {injected} injected anger posts in r/canada")
+
+    start = time.perf_counter()
+    legacy = legacy_detect(df.copy())
+    legacy_s = time.perf_counter() - start
+    flagged = legacy["anomaly"] == "anomalous"
+    print(f"🌲 IsolationForest refit: {legacy_s:.2f}s per cycle | {flagged.sum():,} posts flagged | "
+          f"{(flagged & legacy['injected']).sum()} of the injected posts among them "
+          f"({(flagged & legacy['injected']).sum() / flagged.sum():.1%} precision)")
+
+    # Replay everything but the last cycle, then time one cycle of new posts
+    cutoff = end - CYCLE_HOURS * 3600
+    history, cycle = df[df["timestamp"] < cutoff], df[df["timestamp"] >= cutoff]
+    detector = RateDetector()
+    start = time.perf_counter()
+    detector.update(history)
+    replay_s = time.perf_counter() - start
+    start = time.perf_counter()
+    detector.update(cycle)
+    cycle_ms = (time.perf_counter() - start) * 1000
+
+    final = [spike for spike in detector.spikes if spike["final"]]
+    posts = spike_posts(final, df)
+    print(f"📈 Rate detector: replaying {len(history):,} posts took {replay_s:.2f}s once; "
+          f"a cycle of {len(cycle):,} new posts takes {cycle_ms:.1f} ms")
+    for spike in final:
+        print(f"   spike: {spike['emotion']} in {spike['segment']} at {spike['share']:.0%} "
+              f"(usually {spike['expected']:.0%}, z={spike['z']})")
+    hits = posts["id"].isin(df.loc[df["injected"], "id"]).sum()
+    print(f"🎯 {len(posts):,} posts behind the spikes, {hits} of them injected "
+          f"({hits / max(len(posts), 1):.1%} precision, {hits / injected:.1%} recall)")
+    print(f"⚡ Per cycle: {legacy_s * 1000 / cycle_ms:,.0f}x faster than the refit")
@@ -0,0 +1,149 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import threading
+import http.client
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "api")
+
+N_POSTS = int(os.environ.get("N_POSTS", "20000"))
+REQUESTS = int(os.environ.get("REQUESTS", "400"))
+CLIENTS = int(os.environ.get("CLIENTS", "8"))
+
+ENDPOINTS = ["/get_emotion_distribution", "/get_top_locations", "/get_recent_posts", "/get_geo_data",
+             "/get_sentiment_insights", "/get_sentiment_data"]
+
+
+# Synthetic classified posts from the last few days
+def synthetic_events(n, seed=42):
+    rng = random.Random(seed)
+    now = time.time()
+    return pd.DataFrame({
+        "id": [f"p{i:07d}" for i in range(n)],
+        "text": [f"post {i} about the news" for i in range(n)],
+        "sarcasm_label": [rng.choice(["sarcastic", "not_sarcastic"]) for _ in range(n)],
+        "vader_compound": [rng.uniform(-1, 1) for _ in range(n)],
+        "timestamp": [now - rng.uniform(0, 5 * 86400) for _ in range(n)],
+        "location": [rng.choice(["Toronto", "London", "Sydney", "Delhi", "Berlin", "Unknown"]) for _ in range(n)],
+        "source": [rng.choice(["canada", "unitedkingdom", "australia", "india", "germany"]) for _ in range(n)],
+        "emotion": [rng.choice(["joy", "anger", "sadness", "fear", "surprise", "neutral"]) for _ in range(n)],
+        "sentiment": [rng.choice(["POSITIVE", "NEGATIVE", "NEUTRAL"]) for _ in range(n)],
+    })
+
+
+def legacy_app(events_csv):
+    """The endpoints as they were before the cache: every request re-reads the whole CSV."""
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/get_emotion_distribution")
+    def get_emotion_distribution():
+        return pd.read_csv(events_csv)["emotion"].value_counts().to_dict()
+
+    @app.get("/get_top_locations")
+    def get_top_locations():
+        return pd.read_csv(events_csv)["location"].value_counts().head(10).to_dict()
+
+    @app.get("/get_recent_posts")
+    def get_recent_posts():
+        df = pd.read_csv(events_csv)[["text", "emotion", "timestamp", "location"]].dropna().tail(10)
+        return {"posts": df.to_dict(orient="records")}
+
+    @app.get("/get_geo_data")
+    def get_geo_data():
+        return {"data": pd.read_csv(events_csv)[["location", "emotion", "source"]].dropna().to_dict(orient="records")}
+
+    @app.get("/get_sentiment_insights")
+    def get_sentiment_insights():
+        df = pd.read_csv(events_csv)
+        counts = df["sentiment"].value_counts(normalize=True) * 100
+        return {"insights": {"positive": round(counts.get("POSITIVE", 0), 2), "total_posts": len(df)}}
+
+    @app.get("/get_sentiment_data")
+    def get_sentiment_data():
+        return {"data": pd.read_csv(events_csv).tail(20).to_dict(orient="records")}
+
+    return app
+
+
+def load_api():
+    spec = importlib.util.spec_from_file_location("bench_api", os.path.join(API_DIR, "api.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
+
+
+def serve(app, port):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                           timeout_keep_alive=300))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def load_test(targets, requests=REQUESTS, clients=CLIENTS):
+    """Sends `requests` GETs spread over `clients` keep-alive connections; returns (req/s, p50 ms, p99 ms)."""
+    def client(worker):
+        latencies, connections = [], {}
+        for i in range(worker, requests, clients):
+            port, path = targets[i % len(targets)]
+            conn = connections.setdefault(port, http.client.HTTPConnection("127.0.0.1", port))
+            start = time.perf_counter()
+            conn.request("GET", path)
+            conn.getresponse().read()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies = [lat for result in executor.map(client, range(clients)) for lat in result]
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, np.percentile(latencies, 50) * 1000, np.percentile(latencies, 99) * 1000
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    sys.path.insert(0, SCRIPTS_DIR)
+    from event_store import EventStore
+    from read_cache import read_cache
+
+    events = synthetic_events(N_POSTS)
+    EventStore().append(events)
+    os.makedirs("data", exist_ok=True)
+    events.to_csv("data/events.csv", index=False)
+    print(f"📂 Load testing on {N_POSTS:,} posts, {REQUESTS} requests from {CLIENTS} clients...")
+
+    servers = [serve(legacy_app("data/events.csv"), 9100), serve(load_api(), 9101)]
+    before = [(9100, path) for path in ENDPOINTS]
+    after = [(9101, path) for path in ENDPOINTS]
+
+    results = {}
+    results["before (CSV per request)"] = load_test(before)
+    read_cache().enabled = False
+    results["event store, no cache"] = load_test(after)
+    read_cache().enabled = True
+    read_cache().clear()
+    start = time.perf_counter()
+    load_test(after, requests=len(after), clients=1)
+    print(f"🔥 Cold cache: first pass over every endpoint took {(time.perf_counter() - start) * 1000:.0f} ms")
+    results["event store, cached"] = load_test(after)
+
+    for label, (rps, p50, p99) in results.items():
+        print(f"📊 {label}: {rps:,.0f} req/s | p50 {p50:.1f} ms | p99 {p99:.1f} ms")
+    baseline = results["before (CSV per request)"]
+    cached = results["event store, cached"]
+    print(f"⚡ Cache vs CSV: {cached[0] / baseline[0]:.1f}x throughput, p99 {baseline[2] / cached[2]:.1f}x lower")
+
+    for server in servers:
+        server.should_exit = True
@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import tempfile
+import subprocess
+import http.client
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "api")
+
+N_POSTS = int(os.environ.get("N_POSTS", "20000"))
+
+# The five-process layout the service replaced: one app per router on its own port
+SPLIT_APPS = {"api": 8005, "geo_api": 8002, "trends_api": 8003, "insights_api": 8004, "sentiment_data_api": 8001}
+PROBES = {"api": "/get_emotion_distribution", "geo_api": "/get_geo_data", "trends_api": "/get_sentiment_trends",
+          "insights_api": "/get_sentiment_insights", "sentiment_data_api": "/get_sentiment_data"}
+
+SPLIT_APP = """
+import sys, importlib, uvicorn
+sys.path[:0] = [{scripts!r}, {api!r}]
+import api
+from fastapi import FastAPI
+app = FastAPI(lifespan=api.lifespan)
+app.include_router(importlib.import_module(sys.argv[1]).router)
+uvicorn.run(app, host="127.0.0.1", port=int(sys.argv[2]), log_level="warning")
+"""
+
+
+def rss_mb(pid):
+    """Resident memory of a process and all its children (Linux /proc)."""
+    total = 0
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            total = next(int(line.split()[1]) for line in f if line.startswith("VmRSS")) / 1024
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(c) for c in f.read().split()]
+    except (FileNotFoundError, StopIteration):
+        return total
+    return total + sum(rss_mb(child) for child in children)
+
+
+def wait_until_serving(port, path, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", path)
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"❌ Nothing serving {path} on port {port}")
+
+
+def measure(label, commands, probes):
+    start = time.perf_counter()
+    processes = [subprocess.Popen(cmd, env=env) for cmd, env in commands]
+    try:
+        for port, path in probes:
+            wait_until_serving(port, path)
+        startup = time.perf_counter() - start
+        time.sleep(1)
+        memory = sum(rss_mb(p.pid) for p in processes)
+        print(f"📊 {label}: {len(processes)} process tree(s), ready in {startup:.2f}s, {memory:.0f} MB RSS")
+        return startup, memory
+    finally:
+        for p in processes:
+            p.terminate()
+        for p in processes:
+            p.wait()
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    sys.path.insert(0, SCRIPTS_DIR)
+    from benchmark_api import synthetic_events
+    import pandas as pd
+    from event_store import EventStore
+    from storage import write_artifact
+
+    events = synthetic_events(N_POSTS)
+    EventStore().append(events)
+    write_artifact(events.assign(anomaly="normal", anomaly_score=events["vader_compound"]), "anomalies")
+    write_artifact(pd.DataFrame({"ds": pd.date_range("2025-01-01", periods=97), "yhat": 0.0}), "trends")
+    print(f"📂 Comparing API layouts on {N_POSTS:,} posts...")
+
+    code = SPLIT_APP.format(scripts=SCRIPTS_DIR, api=API_DIR)
+    split = measure(
+        "five apps (before)",
+        [([sys.executable, "-c", code, name, str(port)], os.environ) for name, port in SPLIT_APPS.items()],
+        [(port, PROBES[name]) for name, port in SPLIT_APPS.items()],
+    )
+    results = {}
+    for workers in (1, 2):
+        env = dict(os.environ, API_PORT="8005", API_WORKERS=str(workers))
+        results[workers] = measure(
+            f"one app, {workers} worker(s)",
+            [([sys.executable, os.path.join(API_DIR, "api.py")], env)],
+            [(8005, path) for path in PROBES.values()],
+        )
+    startup, memory = results[1]
+    print(f"⚡ One app vs five: startup {split[0] / startup:.1f}x faster, {split[1] - memory:.0f} MB less memory")
@@ -0,0 +1,58 @@
+import time
+import random
+from batching import predict_dynamic, token_lengths
+from emotion_detection import emotion_model, predict_emotion_batch
+from sentiment_analysis import sentiment_model, predict_sentiment_batch
+from storage import artifact_exists, read_artifact
+
+
+# Benchmark texts: the latest processed posts, or synthetic posts with a Reddit-like length mix
+def load_texts(n=600, seed=42):
+    if artifact_exists("processed"):
+        df = read_artifact("processed", columns=["translated_text"], as_category=False)
+        texts = df["translated_text"].fillna("").astype(str).tolist()
+        if texts:
+            return texts[:n]
+
+    rng = random.Random(seed)
+    words = "the government announced new policy on housing prices while people protest in the city".split()
+    texts = []
+    for _ in range(n):
+        # Mostly title-only posts, with the occasional long selftext
+        length = rng.randint(300, 900) if rng.random() < 0.1 else rng.randint(5, 40)
+        texts.append(" ".join(rng.choice(words) for _ in range(length)))
+    return texts
+
+
+# The previous loop: fixed 32-row slices in file order
+def predict_fixed(predict_batch, texts, batch_size=32):
+    results = []
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        try:
+            results.extend(predict_batch(batch))
+        except Exception:
+            results.extend(["UNKNOWN"] * len(batch))
+    return results
+
+
+def benchmark(name, hf_pipeline, predict_batch, texts):
+    start = time.perf_counter()
+    fixed = predict_fixed(predict_batch, texts)
+    fixed_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dynamic = predict_dynamic(predict_batch, texts, token_lengths(hf_pipeline.tokenizer, texts))
+    dynamic_time = time.perf_counter() - start
+
+    agreement = sum(a == b for a, b in zip(fixed, dynamic)) / len(texts)
+    print(f"📊 {name}: fixed {len(texts) / fixed_time:.1f} texts/sec | "
+          f"dynamic {len(texts) / dynamic_time:.1f} texts/sec | "
+          f"speedup {fixed_time / dynamic_time:.2f}x | agreement {agreement:.1%}")
+
+
+if __name__ == "__main__":
+    texts = load_texts()
+    print(f"📂 Benchmarking on {len(texts)} texts...")
+    benchmark("emotion", emotion_model, predict_emotion_batch, texts)
+    benchmark("sentiment", sentiment_model, predict_sentiment_batch, texts)
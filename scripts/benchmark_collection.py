@@ -0,0 +1,33 @@
+import os
+import time
+from reddit_fetcher import TokenBucket, fetch_concurrently
+from reddit_replay import FIXTURE_PATH, ReplayReddit, synthetic_listings
+
+SUBREDDITS = ["canada", "india", "germany", "china", "japan", "usa"]
+
+
+# Replays the recorded fixture (or synthetic listings) with a simulated per-page latency
+def make_replay(latency):
+    if os.path.exists(FIXTURE_PATH):
+        return ReplayReddit(path=FIXTURE_PATH, latency=latency)
+    return ReplayReddit(listings=synthetic_listings(SUBREDDITS), latency=latency)
+
+
+def timed_fetch(max_workers, latency):
+    replay = make_replay(latency)
+    start = time.perf_counter()
+    first_arrival, total_posts = None, 0
+    for _, posts in fetch_concurrently(lambda: replay, SUBREDDITS, limit=100,
+                                       max_workers=max_workers, bucket=TokenBucket()):
+        first_arrival = first_arrival or time.perf_counter() - start
+        total_posts += len(posts)
+    return time.perf_counter() - start, first_arrival, total_posts
+
+
+if __name__ == "__main__":
+    latency = float(os.environ.get("REPLAY_LATENCY", "0.8"))
+    print(f"📂 Replaying {len(SUBREDDITS)} subreddits with {latency}s per listing page...")
+    for workers in (1, len(SUBREDDITS)):
+        elapsed, first, posts = timed_fetch(workers, latency)
+        print(f"📊 {workers} workers: {posts} posts in {elapsed:.2f}s | "
+              f"first subreddit ready after {first:.2f}s")
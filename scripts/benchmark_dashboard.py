@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Store sizes to compare, as comma-separated post counts
+SIZES = [int(n) for n in os.environ.get("SIZES", "100000,400000,1000000").split(",")]
+RANGE_DAYS = [1, 5]
+
+
+def timed(fn, runs=5):
+    """Median milliseconds of fn() over `runs` calls, and the result of the last call."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000, result
+
+
+def legacy_charts(since, until):
+    """The previous dashboard: every post of the range, plotted point by point."""
+    df = query_events(since=since, until=until, columns=["timestamp", "emotion", "sarcasm_label"])
+    df["sentiment_score"] = df["emotion"].map(emotion_to_score)
+    df["sarcasm_label"].value_counts()
+    return df
+
+
+def dashboard_charts(since, until):
+    """The dashboard's queries: rollup counts and a bucketed, LTTB-downsampled score series."""
+    counts, _ = rollup_series(["emotion"], since, until)
+    counts["weighted"] = counts["emotion"].map(emotion_to_score) * counts["count"]
+    series = counts.groupby("bucket")[["weighted", "count"]].sum().reset_index()
+    series["sentiment_score"] = series["weighted"] / series["count"]
+    count_rollups(["emotion"], since=since, until=until)
+    count_rollups(["sarcasm_label"], since=since, until=until)
+    return lttb(series, "bucket", "sentiment_score")
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    sys.path.insert(0, SCRIPTS_DIR)
+    from benchmark_api import synthetic_events
+    from anomaly_detection import emotion_to_score
+    from downsampling import lttb
+    from event_store import EventStore, count_rollups, query_events, rollup_series
+
+    store = EventStore()
+    stored = 0
+    for size in SIZES:
+        new = synthetic_events(size - stored, seed=size)
+        new["id"] = f"n{size}-" + new["id"]
+        store.append(new)
+        stored = size
+
+        print(f"📂 {stored:,} posts over 5 days")
+        now = time.time()
+        for days in RANGE_DAYS:
+            since = now - days * 86400
+            legacy_ms, legacy = timed(lambda: legacy_charts(since, now), runs=3)
+            new_ms, points = timed(lambda: dashboard_charts(since, now))
+            print(f"   last {days} day(s): all rows {legacy_ms:8.1f} ms, {len(legacy):,} points | "
+                  f"rollups + LTTB {new_ms:6.1f} ms, {len(points):,} points")
@@ -0,0 +1,110 @@
+import os
+import sys
+import time
+import logging
+import numpy as np
+import pandas as pd
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+HISTORY_DAYS = int(os.environ.get("HISTORY_DAYS", "90"))
+SIMULATED_DAYS = 3
+CYCLE_SECONDS = 120
+
+# Worker counts to time the per-segment fits with, as comma-separated numbers
+WORKERS = [int(n) for n in os.environ.get("WORKERS", f"1,2,{os.cpu_count() or 1}").split(",")]
+SEGMENT_POSTS = int(os.environ.get("SEGMENT_POSTS", "500000"))
+SOURCES = ["canada", "unitedkingdom", "australia", "india", "germany", "worldnews"]
+LOCATIONS = ["Toronto", "London", "Sydney", "Delhi", "Berlin", "Paris", "Tokyo", "Unknown", "Atlantis"]
+
+
+def synthetic_series(days, freq="D", seed=42):
+    """Mean sentiment per bucket with a weekly cycle, a slow drift and noise, ending with the current bucket."""
+    rng = np.random.default_rng(seed)
+    per_day = 1 if freq == "D" else 24
+    end = pd.Timestamp(time.time(), unit="s").floor(freq)
+    ds = pd.date_range(end=end, periods=days * per_day + 1, freq=freq)
+    t = np.arange(len(ds)) / per_day
+    y = 0.1 * np.sin(2 * np.pi * t / 7) + 0.001 * t + rng.normal(0, 0.05, len(ds))
+    return pd.DataFrame({"ds": ds, "y": y})
+
+
+def synthetic_posts(n, days, seed=42):
+    """`n` labelled posts over `days` days; the last location only has a handful of posts."""
+    rng = np.random.default_rng(seed)
+    p = np.full(len(LOCATIONS), 1.0)
+    p[-1] = 5e-4
+    return pd.DataFrame({
+        "timestamp": time.time() - rng.uniform(0, days * 86400, n),
+        "sentiment": rng.choice(["POSITIVE", "NEUTRAL", "NEGATIVE"], n, p=[0.4, 0.35, 0.25]),
+        "source": rng.choice(SOURCES, n),
+        "location": rng.choice(LOCATIONS, n, p=p / p.sum()),
+    })
+
+
+def legacy_forecast(df, periods=7):
+    """The previous forecaster: a fresh Prophet fit with daily seasonality on every cycle."""
+    from prophet import Prophet
+
+    model = Prophet(daily_seasonality=True)
+    model.fit(df)
+    return model.predict(model.make_future_dataframe(periods=periods, freq="D"))
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, SCRIPTS_DIR)
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    logging.getLogger("prophet").setLevel(logging.WARNING)
+    from sentiment_forecasting import ForecastEngine, build_segment_series, smoothing_forecast
+
+    series = synthetic_series(HISTORY_DAYS + SIMULATED_DAYS)
+    cycles_per_day = 86400 // CYCLE_SECONDS
+    cycles = SIMULATED_DAYS * cycles_per_day
+    print(f"📂 {HISTORY_DAYS} days of history, simulating {SIMULATED_DAYS} days of {CYCLE_SECONDS}s cycles "
+          f"({cycles:,} cycles)")
+
+    start = time.perf_counter()
+    for _ in range(5):
+        legacy_forecast(series.iloc[:HISTORY_DAYS + 1])
+    legacy_fit = (time.perf_counter() - start) / 5
+    print(f"🐢 Refit every cycle: {legacy_fit:.2f}s per fit -> {legacy_fit * cycles:,.0f}s of fitting "
+          f"over {SIMULATED_DAYS} days")
+
+    # Replay the simulated days: each day closes one more bucket of the series
+    engine = ForecastEngine(periods=7)
+    first_day = series["ds"].iloc[HISTORY_DAYS].timestamp()
+    log = []
+    start = time.perf_counter()
+    for cycle in range(cycles):
+        now = first_day + cycle * CYCLE_SECONDS
+        engine.forecast(series[series["ds"] <= pd.Timestamp(now, unit="s")], now=now)
+        log.append(engine.last_fit)
+    engine_total = time.perf_counter() - start
+
+    fits = [fit for fit in log if fit["method"] != "cached"]
+    cached = [fit["seconds"] for fit in log if fit["method"] == "cached"]
+    fit_times = ", ".join(f"{fit['method']} {fit['seconds']:.2f}s" for fit in fits)
+    print(f"⚡ Forecast engine: {engine_total:.1f}s in total, {len(fits)} fits ({fit_times}), "
+          f"cached cycles {np.median(cached) * 1000:.1f} ms")
+    print(f"   {legacy_fit * cycles / engine_total:,.0f}x less time spent forecasting")
+
+    hourly = synthetic_series(HISTORY_DAYS, freq="h")
+    start = time.perf_counter()
+    for _ in range(20):
+        smoothing_forecast(hourly, periods=48, freq="h")
+    print(f"⏱️ Exponential smoothing on {len(hourly):,} hourly points: "
+          f"{(time.perf_counter() - start) / 20 * 1000:.1f} ms per fit")
+
+    posts = synthetic_posts(SEGMENT_POSTS, HISTORY_DAYS)
+    start = time.perf_counter()
+    segments = build_segment_series(posts)
+    print(f"📊 {SEGMENT_POSTS:,} posts grouped into {segments.groupby(['segment_type', 'segment']).ngroups} series "
+          f"in one pass: {time.perf_counter() - start:.2f}s")
+    baseline = None
+    for workers in WORKERS:
+        engine = ForecastEngine(periods=7, workers=workers)
+        engine.forecast_segments(segments)
+        fit = engine.last_fit
+        baseline = baseline or fit["seconds"]
+        print(f"🧵 {workers} workers: {fit['seconds']:.2f}s wall time for {fit['method']}, "
+              f"{fit['skipped']} skipped ({baseline / fit['seconds']:.1f}x)")
@@ -0,0 +1,67 @@
+import re
+import time
+import random
+import spacy
+from data_collection import countries, extract_locations, us_states
+from storage import artifact_exists, read_artifact
+
+# The full pipeline, as the previous extractor loaded it
+full_nlp = spacy.load("en_core_web_trf")
+
+
+# The previous extractor: NER on every post, then one regex per state and per country
+def extract_location_legacy(text, flair):
+    if flair:
+        return flair
+
+    doc = full_nlp(text)
+    locations = [ent.text for ent in doc.ents if ent.label_ == "GPE"]
+    if locations:
+        return locations[0]
+
+    for state in us_states:
+        if re.search(rf"\b{state}\b", text, re.IGNORECASE):
+            return state
+
+    for country in countries:
+        if re.search(rf"\b{country}\b", text, re.IGNORECASE):
+            return country
+
+    return "Unknown"
+
+
+# Benchmark posts: the last collected posts, or synthetic titles with and without place names
+def load_posts(n=600, seed=42):
+    if artifact_exists("raw"):
+        texts = read_artifact("raw", columns=["text"], as_category=False)["text"].fillna("").astype(str).tolist()
+        if texts:
+            return texts[:n]
+
+    rng = random.Random(seed)
+    templates = [
+        "Protests continue in {} over rising rent",
+        "Why is nobody talking about the new transit plan?",
+        "{} announces budget changes for next year",
+        "My experience moving to {} as a student",
+        "What do you think about the election results?",
+    ]
+    places = ["Toronto", "Mumbai", "Berlin", "Texas", "Japan", "Ohio", "Shanghai", "Canadians"]
+    return [rng.choice(templates).format(rng.choice(places)) for _ in range(n)]
+
+
+if __name__ == "__main__":
+    texts = load_posts()
+    flairs = [None] * len(texts)
+    print(f"📂 Benchmarking location extraction on {len(texts)} posts...")
+
+    start = time.perf_counter()
+    legacy = [extract_location_legacy(t, f) for t, f in zip(texts, flairs)]
+    legacy_rate = len(texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    fast = extract_locations(texts, flairs)
+    fast_rate = len(texts) / (time.perf_counter() - start)
+
+    agreement = sum(a == b for a, b in zip(legacy, fast)) / len(texts)
+    print(f"📊 Before: {legacy_rate:.1f} posts/sec | After: {fast_rate:.1f} posts/sec | "
+          f"speedup {fast_rate / legacy_rate:.1f}x | same location {agreement:.1%}")
@@ -0,0 +1,58 @@
+import time
+import numpy as np
+from batching import predict_dynamic, token_lengths
+from benchmark_batching import load_texts
+from onnx_backend import OnnxClassifier
+from emotion_detection import emotion_model, emotion_revision
+from sentiment_analysis import sentiment_model, sentiment_revision
+
+
+def torch_predict(hf_pipeline):
+    def predict(texts):
+        return [r["label"] for r in hf_pipeline(texts, truncation=True, batch_size=len(texts))]
+    return predict
+
+
+# Runs `predict` over length-sorted batches and records the latency of every batch
+def timed_run(predict, texts, lengths):
+    latencies = []
+
+    def timed_predict(batch):
+        start = time.perf_counter()
+        result = predict(batch)
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    start = time.perf_counter()
+    labels = predict_dynamic(timed_predict, texts, lengths)
+    total = time.perf_counter() - start
+    return labels, total, np.array(latencies)
+
+
+def benchmark(name, hf_pipeline, revision, texts):
+    lengths = token_lengths(hf_pipeline.tokenizer, texts)
+    backends = {
+        "torch": torch_predict(hf_pipeline),
+        "onnx": OnnxClassifier(hf_pipeline, revision).predict,
+        "onnx-int8": OnnxClassifier(hf_pipeline, revision, quantize=True).predict,
+    }
+
+    reference = None
+    for backend, predict in backends.items():
+        # Warm-up batch so session and allocator setup is not timed
+        predict(texts[:8])
+        labels, total, latencies = timed_run(predict, texts, lengths)
+        if reference is None:
+            reference = labels
+        agreement = sum(a == b for a, b in zip(reference, labels)) / len(texts)
+        print(f"📊 {name} [{backend}]: {len(texts) / total:.1f} texts/sec | "
+              f"batch p50 {np.percentile(latencies, 50) * 1000:.1f}ms | "
+              f"p95 {np.percentile(latencies, 95) * 1000:.1f}ms | "
+              f"agreement with torch {agreement:.1%}")
+
+
+if __name__ == "__main__":
+    texts = load_texts()
+    print(f"📂 Benchmarking on {len(texts)} texts...")
+    benchmark("emotion", emotion_model, emotion_revision, texts)
+    benchmark("sentiment", sentiment_model, sentiment_revision, texts)
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "api")
+
+# Store sizes to compare, as comma-separated post counts
+SIZES = [int(n) for n in os.environ.get("SIZES", "50000,200000,800000").split(",")]
+RUNS = int(os.environ.get("RUNS", "20"))
+PAGE_SIZE = 1000
+
+
+def timed(fn, runs=RUNS):
+    """Median milliseconds of fn() over `runs` calls, and the result of the last call."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000, result
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    sys.path.insert(0, SCRIPTS_DIR)
+    sys.path.insert(0, API_DIR)
+    from benchmark_api import synthetic_events
+    from event_store import EventStore, count_events, page_events, query_window
+    from paging import counts_body, page_body
+
+    store = EventStore()
+    stored = 0
+    fields = ["location", "emotion", "source"]
+    for size in SIZES:
+        new = synthetic_events(size - stored, seed=size)
+        new["id"] = f"n{size}-" + new["id"]
+        store.append(new)
+        stored = size
+
+        full_ms, full = timed(lambda: page_body("data", query_window(columns=fields), fields, stored, []), runs=3)
+        first_ms, first = timed(lambda: page_body("data", page_events(fields, limit=PAGE_SIZE + 1, since=0),
+                                                  fields, PAGE_SIZE, ["timestamp", "id"]))
+        # A cursor halfway through the store, as if the client had paged through half of it
+        middle = page_events(["id"], limit=stored // 2, since=0).iloc[-1]
+        deep_ms, _ = timed(lambda: page_events(fields, after=(middle["timestamp"], middle["id"]),
+                                               limit=PAGE_SIZE + 1, since=0))
+        source_ms, _ = timed(lambda: page_events(fields, limit=PAGE_SIZE + 1, since=0, sources=["canada"]))
+        counts_ms, counts = timed(lambda: counts_body(count_events(["location"], since=0)), runs=5)
+
+        print(f"📂 {stored:,} posts")
+        print(f"   full dump (before): {full_ms:8.1f} ms | {len(full) / 1e6:6.1f} MB")
+        print(f"   first page:         {first_ms:8.1f} ms | {len(first) / 1e3:6.1f} KB")
+        print(f"   page at the middle: {deep_ms:8.1f} ms")
+        print(f"   page for one source:{source_ms:8.1f} ms")
+        print(f"   counts per location:{counts_ms:8.1f} ms | {len(counts) / 1e3:6.1f} KB")
@@ -0,0 +1,38 @@
+import os
+import time
+import random
+import pandas as pd
+from preprocessing import clean_text_column, detect_sarcasm, label_sarcasm, preprocess_text, score_vader
+
+N_POSTS = int(os.environ.get("N_POSTS", "1000000"))
+
+
+# Synthetic Reddit posts with URLs, mentions, hashtags, numbers, punctuation and emoji
+def synthetic_posts(n, seed=42):
+    rng = random.Random(seed)
+    words = ["the", "government", "announced", "housing", "prices", "protest", "city", "great", "terrible",
+             "love", "hate", "news", "today", "Toronto", "Berlin", "über", "東京", "!!!", "?", "😂", "2024",
+             "@someone", "#breaking", "https://example.com/a?b=1", "r/canada", "$500", "it's", "can't"]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(5, 60))) for _ in range(n)]
+
+
+def timed(label, fn, rows):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"📊 {label}: {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)")
+    return result, elapsed
+
+
+if __name__ == "__main__":
+    texts = pd.Series(synthetic_posts(N_POSTS)).astype(str)
+    print(f"📂 Benchmarking on {len(texts):,} synthetic posts...")
+
+    before, before_time = timed("cleaning, apply(preprocess_text)", lambda: texts.apply(preprocess_text), len(texts))
+    after, after_time = timed("cleaning, clean_text_column", lambda: clean_text_column(texts), len(texts))
+    print(f"⚡ Cleaning speedup {before_time / after_time:.2f}x | byte-identical: {before.tolist() == after.tolist()}")
+
+    labels, vader_before = timed("VADER, apply(detect_sarcasm)", lambda: after.apply(detect_sarcasm), len(texts))
+    scores, vader_after = timed("VADER, score_vader (all four scores)", lambda: score_vader(after), len(texts))
+    print(f"⚡ VADER speedup {vader_before / vader_after:.2f}x | "
+          f"same sarcasm labels: {labels.tolist() == label_sarcasm(scores['vader_compound']).tolist()}")
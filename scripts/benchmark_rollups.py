@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Store sizes to compare, as comma-separated post counts
+SIZES = [int(n) for n in os.environ.get("SIZES", "50000,200000,800000").split(",")]
+RUNS = int(os.environ.get("RUNS", "10"))
+BATCH = 500
+
+
+def timed(fn, runs=RUNS):
+    """Median milliseconds of fn() over `runs` calls, and the result of the last call."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return np.median(times) * 1000, result
+
+
+def legacy_view(since):
+    """The previous post view: every row of the window, counted in pandas."""
+    df = query_window(since, columns=POST_COLUMNS)
+    return {
+        "emotion_distribution": df["emotion"].value_counts().to_dict(),
+        "top_locations": df["location"].value_counts().head(10).to_dict(),
+        "sentiment_insights": (df["sentiment"].value_counts(normalize=True) * 100).round(2).to_dict(),
+    }
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    sys.path.insert(0, SCRIPTS_DIR)
+    from benchmark_api import synthetic_events
+    from event_store import EventStore, count_events, count_rollups, query_window
+    from read_cache import POST_COLUMNS, load_posts_view
+
+    store = EventStore()
+    stored = 0
+    for size in SIZES:
+        new = synthetic_events(size - stored, seed=size)
+        new["id"] = f"n{size}-" + new["id"]
+        store.append(new)
+        stored = size
+
+        since = time.time() - 7 * 86400
+        legacy_ms, _ = timed(lambda: legacy_view(since), runs=3)
+        view_ms, view = timed(lambda: load_posts_view(since))
+        raw_ms, raw = timed(lambda: count_events(["location"], since=since + 1234.5), runs=3)
+        rollup_ms, rolled = timed(lambda: count_rollups(["location"], since=since + 1234.5))
+        assert view.payloads["sentiment_insights"]["insights"]["total_posts"] == stored
+        assert raw["count"].sum() - rolled["count"].sum() < stored * 0.001
+
+        batch = synthetic_events(BATCH, seed=size + 1)
+        batch["id"] = f"b{size}-" + batch["id"]
+        append_ms, _ = timed(lambda: store.append(batch), runs=1)
+
+        print(f"📂 {stored:,} posts")
+        print(f"   post view from rows (before): {legacy_ms:8.1f} ms")
+        print(f"   post view from rollups:       {view_ms:8.1f} ms")
+        print(f"   location counts, raw rows:    {raw_ms:8.1f} ms")
+        print(f"   location counts, rollups:     {rollup_ms:8.1f} ms")
+        print(f"   append of {BATCH} posts:        {append_ms:8.1f} ms (rollups included)")
+        stored += BATCH
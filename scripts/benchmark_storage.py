@@ -0,0 +1,70 @@
+import os
+import time
+import random
+import tempfile
+import pandas as pd
+from storage import artifact_path, read_artifact, write_artifact
+
+N_POSTS = int(os.environ.get("N_POSTS", "1000000"))
+
+EMOTIONS = ["joy", "anger", "sadness", "fear", "surprise", "disgust", "neutral"]
+SOURCES = ["canada", "unitedkingdom", "australia", "india", "germany", "france"]
+LOCATIONS = ["Toronto", "London", "Sydney", "Delhi", "Berlin", "Paris", "Unknown"]
+
+
+# Synthetic emotion results spread over the last 30 days
+def synthetic_results(n, seed=42):
+    rng = random.Random(seed)
+    now = int(time.time())
+    return pd.DataFrame({
+        "id": [f"p{i:07d}" for i in range(n)],
+        "text": [" ".join(rng.choice(["news", "housing", "prices", "protest", "city"]) for _ in range(rng.randint(5, 40)))
+                 for _ in range(n)],
+        "sarcasm_label": [rng.random() < 0.1 for _ in range(n)],
+        "vader_compound": [rng.uniform(-1, 1) for _ in range(n)],
+        "timestamp": [now - rng.randint(0, 30 * 86400) for _ in range(n)],
+        "location": [rng.choice(LOCATIONS) for _ in range(n)],
+        "source": [rng.choice(SOURCES) for _ in range(n)],
+        "emotion": [rng.choice(EMOTIONS) for _ in range(n)],
+    })
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"📊 {label}: {elapsed:.3f}s")
+    return result, elapsed
+
+
+def size_on_disk(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+if __name__ == "__main__":
+    df = synthetic_results(N_POSTS)
+    print(f"📂 Benchmarking on {len(df):,} synthetic emotion results...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "emotion_analysis_results.csv")
+        parquet_dir = os.path.join(tmp, "parquet")
+        timed("write CSV", lambda: df.to_csv(csv_path, index=False))
+        timed("write Parquet", lambda: write_artifact(df, "emotions", parquet_dir=parquet_dir))
+        parquet_path = artifact_path("emotions", parquet_dir)
+        print(f"💾 CSV {size_on_disk(csv_path) / 1e6:.1f} MB | Parquet {size_on_disk(parquet_path) / 1e6:.1f} MB")
+
+        _, csv_time = timed("read CSV (all columns)", lambda: pd.read_csv(csv_path, dtype={"id": str}))
+        _, full_time = timed("read Parquet (all columns)", lambda: read_artifact("emotions", parquet_dir=parquet_dir))
+        _, column_time = timed("read Parquet (emotion only)", lambda: read_artifact("emotions", columns=["emotion"], parquet_dir=parquet_dir))
+        since = int(time.time()) - 86400
+        recent, recent_time = timed(
+            "read Parquet (location, emotion, source of the last day)",
+            lambda: read_artifact("emotions", columns=["location", "emotion", "source"],
+                                  filters=[("timestamp", ">=", since)], parquet_dir=parquet_dir),
+        )
+        print(f"⚡ Load speedup vs CSV: full {csv_time / full_time:.1f}x | "
+              f"one column {csv_time / column_time:.1f}x | last day ({len(recent):,} rows) {csv_time / recent_time:.1f}x")
+        print(f"🧠 Memory: CSV frame {df.memory_usage(deep=True).sum() / 1e6:.1f} MB | "
+              f"Parquet frame {read_artifact('emotions', parquet_dir=parquet_dir).memory_usage(deep=True).sum() / 1e6:.1f} MB")
@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import numpy as np
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CLIENTS = int(os.environ.get("CLIENTS", "2000"))
+PORT = 9200
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS")) / 1024
+
+
+async def open_stream():
+    """Connects one SSE client and waits for the initial `insights` message."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    writer.write(b"GET /stream HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n")
+    await writer.drain()
+    await reader.readuntil(b"event: insights")
+    return reader, writer
+
+
+async def wait_for_posts(reader):
+    await reader.readuntil(b"event: posts")
+    return time.perf_counter()
+
+
+async def main():
+    from benchmark_api import load_api, serve, synthetic_events
+    from event_store import EventStore
+
+    EventStore().append(synthetic_events(5000))
+    server = serve(load_api(), PORT)
+
+    start = time.perf_counter()
+    before = rss_mb()
+    streams = await asyncio.gather(*(open_stream() for _ in range(CLIENTS)))
+    print(f"🔌 {CLIENTS} clients connected in {time.perf_counter() - start:.2f}s, "
+          f"{(rss_mb() - before) * 1024 / CLIENTS:.1f} KB per client")
+
+    # A pipeline cycle appending new posts is what the hub pushes out
+    fresh = synthetic_events(200, seed=7)
+    fresh["id"] = "new" + fresh["id"]
+    waiting = [asyncio.ensure_future(wait_for_posts(reader)) for reader, _ in streams]
+    published = time.perf_counter()
+    await asyncio.to_thread(lambda: EventStore().append(fresh))
+    received = np.array(await asyncio.gather(*waiting)) - published
+
+    print(f"📊 Delta delivered to {len(received)} clients: p50 {np.percentile(received, 50) * 1000:.0f} ms | "
+          f"p99 {np.percentile(received, 99) * 1000:.0f} ms | last {received.max() * 1000:.0f} ms "
+          f"(includes up to STREAM_POLL_SECONDS of manifest polling)")
+
+    for _, writer in streams:
+        writer.close()
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    sys.path.insert(0, SCRIPTS_DIR)
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+import time
+from batching import token_lengths
+from benchmark_batching import load_texts
+from worker_pool import predict_parallel, usable_cores
+from emotion_detection import emotion_model, predict_emotion_batch
+from sentiment_analysis import sentiment_model, predict_sentiment_batch
+
+
+def worker_counts():
+    cores = len(usable_cores())
+    counts, n = [], 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores]
+
+
+def benchmark(name, hf_pipeline, predict_batch, texts):
+    lengths = token_lengths(hf_pipeline.tokenizer, texts)
+    baseline, reference = None, None
+    for workers in worker_counts():
+        start = time.perf_counter()
+        labels = predict_parallel(predict_batch, texts, lengths, workers=workers)
+        rate = len(texts) / (time.perf_counter() - start)
+        baseline = baseline or rate
+        reference = reference or labels
+        print(f"📊 {name} [{workers} workers]: {rate:.1f} texts/sec | "
+              f"speedup {rate / baseline:.2f}x | efficiency {rate / baseline / workers:.0%} | "
+              f"same labels as 1 worker: {labels == reference}")
+
+
+if __name__ == "__main__":
+    texts = load_texts(n=2000)
+    print(f"📂 Benchmarking on {len(texts)} texts...")
+    benchmark("emotion", emotion_model, predict_emotion_batch, texts)
+    benchmark("sentiment", sentiment_model, predict_sentiment_batch, texts)
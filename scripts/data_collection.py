@@ -1,90 +1,109 @@
-import praw
-import pandas as pd
-import os
-import re
-import spacy
-
-# Load spaCy NLP model
-nlp = spacy.load("en_core_web_trf")
-
-# Define regions for location extraction
-us_states = [
-    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware", "Florida",
-    "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana", "Maine",
-    "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska",
-    "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio",
-    "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas",
-    "Utah", "Vermont", "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"
-]
-
-countries = [
-    "USA", "Canada", "UK", "Germany", "France", "Australia", "India", "China", 
-    "Russia", "Brazil", "Japan", "Mexico", "Spain", "Italy", "South Korea"
-]
-
-# Function to extract location
-def extract_location(text, flair):
-    if flair:
-        return flair
-
-    doc = nlp(text)
-    locations = [ent.text for ent in doc.ents if ent.label_ == "GPE"]
-    if locations:
-        return locations[0]
-
-    for state in us_states:
-        if re.search(rf"\b{state}\b", text, re.IGNORECASE):
-            return state
-
-    for country in countries:
-        if re.search(rf"\b{country}\b", text, re.IGNORECASE):
-            return country
-
-    return "Unknown"
-
-# Authenticate Reddit API
-reddit = praw.Reddit(
-    client_id="your reddit id",
-    client_secret="your reddit secret key",
-    user_agent="SentimentAnalyzer:v1.0 (by u/Beneficial_Trust_507)"
-)
-
-# Subreddits
-country_subreddits = [
-     "canada", "india", "germany", "china", "japan","usa"]
-
-# Fetch posts from subreddit
-def fetch_reddit_posts(subreddit_name, limit=100):
-    try:
-        subreddit = reddit.subreddit(subreddit_name)
-        posts = []
-        for post in subreddit.new(limit=limit):
-            combined_text = (post.title or "") + " " + (post.selftext or "")
-            location = extract_location(combined_text, post.link_flair_text)
-            posts.append([combined_text.strip(), post.created_utc, location, subreddit_name])
-        return pd.DataFrame(posts, columns=['text', 'timestamp', 'location', 'source'])
-    except Exception as e:
-        print(f"❌ Error in r/{subreddit_name}: {e}")
-        return pd.DataFrame(columns=['text', 'timestamp', 'location', 'source'])
-
-# Loop through all
-def fetch_all_country_news(subreddits, limit=40):
-    all_posts = []
-    for subreddit in subreddits:
-        print(f"🌍 Fetching from r/{subreddit}")
-        df = fetch_reddit_posts(subreddit, limit)
-        if not df.empty:
-            all_posts.append(df)
-
-    # ✅ Fix for pandas FutureWarning
-    valid_posts = [df for df in all_posts if df is not None and not df.empty]
-    return pd.concat(valid_posts, ignore_index=True) if valid_posts else pd.DataFrame(columns=['text', 'timestamp', 'location', 'source'])
-
-# Main Execution
-if __name__ == "__main__":
-    df = fetch_all_country_news(country_subreddits, limit=100)
-    os.makedirs("data", exist_ok=True)
-    df.to_csv("data/geo_sentiment.csv", index=False, encoding="utf-8")
-    print(f"✅ Saved {len(df)} posts to data/geo_sentiment.csv")
-    print(df.head())
-
+import praw
+import pandas as pd
+import spacy
+from gazetteer import ALIASES, CITIES, Gazetteer
+from storage import write_artifact
+from reddit_fetcher import FETCH_WORKERS, TokenBucket, fetch_concurrently, fetch_listing
+
+# Load spaCy NLP model; locations only need the transformer and the entity recognizer
+nlp = spacy.load("en_core_web_trf", disable=["tagger", "parser", "attribute_ruler", "lemmatizer"])
+
+# Define regions for location extraction
+us_states = [
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware", "Florida",
+    "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana", "Maine",
+    "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska",
+    "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio",
+    "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas",
+    "Utah", "Vermont", "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"
+]
+
+countries = [
+    "USA", "Canada", "UK", "Germany", "France", "Australia", "India", "China", 
+    "Russia", "Brazil", "Japan", "Mexico", "Spain", "Italy", "South Korea"
+]
+
+# One compiled trie over states, countries, major cities and demonyms
+gazetteer = Gazetteer(us_states + countries + CITIES, ALIASES)
+
+# Function to extract location
+def extract_location(text, flair):
+    return extract_locations([text], [flair])[0]
+
+# Batch location extraction: flair, then the gazetteer, then NER only for what is left
+def extract_locations(texts, flairs, batch_size=32):
+    locations = [flair or gazetteer.find(text) for text, flair in zip(texts, flairs)]
+
+    unresolved = [i for i, location in enumerate(locations) if not location]
+    docs = nlp.pipe((texts[i] for i in unresolved), batch_size=batch_size)
+    for i, doc in zip(unresolved, docs):
+        gpe = [ent.text for ent in doc.ents if ent.label_ == "GPE"]
+        locations[i] = gpe[0] if gpe else "Unknown"
+
+    return locations
+
+# Authenticate Reddit API
+REDDIT_CREDENTIALS = dict(
+    client_id="your reddit id",
+    client_secret="your reddit secret key",
+    user_agent="SentimentAnalyzer:v1.0 (by u/Beneficial_Trust_507)"
+)
+
+def make_reddit():
+    return praw.Reddit(**REDDIT_CREDENTIALS)
+
+reddit = make_reddit()
+
+# Subreddits
+country_subreddits = [
+     "canada", "india", "germany", "china", "japan","usa"]
+
+POST_COLUMNS = ['id', 'text', 'timestamp', 'location', 'source']
+
+# Build a subreddit's DataFrame; posts already in `known_locations` reuse their stored location
+def posts_to_frame(subreddit_name, raw_posts, known_locations=None):
+    known_locations = known_locations or {}
+    posts, pending = [], []
+    for post in raw_posts:
+        combined_text = post.title + " " + post.selftext
+        posts.append([post.id, combined_text.strip(), post.created_utc, known_locations.get(post.id), subreddit_name])
+        if post.id not in known_locations:
+            pending.append((len(posts) - 1, combined_text, post.flair))
+
+    # Resolve the new posts' locations in one batch
+    locations = extract_locations([text for _, text, _ in pending], [flair for _, _, flair in pending])
+    for (row, _, _), location in zip(pending, locations):
+        posts[row][3] = location
+    return pd.DataFrame(posts, columns=POST_COLUMNS)
+
+# Fetch posts from subreddit
+def fetch_reddit_posts(subreddit_name, limit=100, known_locations=None):
+    """Fetches the newest posts; posts already in `known_locations` reuse their stored location."""
+    try:
+        raw_posts = fetch_listing(reddit, subreddit_name, limit, TokenBucket())
+        return posts_to_frame(subreddit_name, raw_posts, known_locations)
+    except Exception as e:
+        print(f"❌ Error in r/{subreddit_name}: {e}")
+        return pd.DataFrame(columns=POST_COLUMNS)
+
+# Stream subreddits as their listings arrive; locations are resolved here while other fetches are in flight
+def iter_country_news(subreddits, limit=40, known_locations=None, client_factory=make_reddit, max_workers=FETCH_WORKERS):
+    for subreddit, raw_posts in fetch_concurrently(client_factory, subreddits, limit, max_workers):
+        print(f"🌍 Fetched {len(raw_posts)} posts from r/{subreddit}")
+        yield subreddit, posts_to_frame(subreddit, raw_posts, known_locations)
+
+# Loop through all
+def fetch_all_country_news(subreddits, limit=40, known_locations=None, client_factory=make_reddit):
+    frames = dict(iter_country_news(subreddits, limit, known_locations, client_factory))
+
+    # ✅ Keep the subreddit order stable regardless of arrival order
+    valid_posts = [frames[s] for s in subreddits if s in frames and not frames[s].empty]
+    return pd.concat(valid_posts, ignore_index=True) if valid_posts else pd.DataFrame(columns=POST_COLUMNS)
+
+# Main Execution
+if __name__ == "__main__":
+    df = fetch_all_country_news(country_subreddits, limit=100)
+    write_artifact(df, "raw")
+    print(f"✅ Saved {len(df)} posts to 'raw'")
+    print(df.head())
+
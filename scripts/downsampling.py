@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+# Points a chart is drawn with at most; more than a screen's width of points adds nothing visible
+MAX_CHART_POINTS = 1000
+
+
+def lttb(df, x, y, points=MAX_CHART_POINTS):
+    """Largest-Triangle-Three-Buckets downsampling of `df` sorted by `x` to at most `points` rows.
+
+    Keeps the first and last row and, from each bucket in between, the row
+    forming the largest triangle with the row kept before it and the mean of
+    the next bucket, so peaks and dips survive where a plain mean would
+    flatten them.
+    """
+    if points >= len(df) or points < 3:
+        return df
+    xs = pd.to_numeric(df[x]).to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+
+    # Buckets of the rows between the first and the last one
+    edges = np.linspace(1, len(df) - 1, points - 1).astype(int)
+    keep = np.empty(points, dtype=int)
+    keep[0], keep[-1] = 0, len(df) - 1
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        following = slice(end, edges[i + 2] if i + 2 < len(edges) else len(df))
+        avg_x, avg_y = xs[following].mean(), ys[following].mean()
+        a = keep[i]
+        areas = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        keep[i + 1] = start + int(np.argmax(areas))
+    return df.iloc[keep]
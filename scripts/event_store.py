@@ -0,0 +1,398 @@
+import os
+import time
+import sqlite3
+import pandas as pd
+from publish import bump_version
+
+EVENT_DB = "data/store/events.sqlite"
+
+# Posts older than this are dropped by compact(); 0 keeps everything
+RETENTION_DAYS = int(os.environ.get("RETENTION_DAYS", "90"))
+
+# Window served by the APIs when a request gives no `since`
+WINDOW_HOURS = int(os.environ.get("API_WINDOW_HOURS", "168"))
+
+# VACUUM only once deletes have freed at least this share of the pages
+VACUUM_FREE_RATIO = 0.2
+# VACUUM rewrites the whole file and blocks readers, so it runs at most this often
+VACUUM_INTERVAL_HOURS = float(os.environ.get("VACUUM_INTERVAL_HOURS", "24"))
+
+# Column -> SQLite type of every classified post kept in the store
+EVENT_COLUMNS = {
+    "id": "TEXT PRIMARY KEY",
+    "text": "TEXT",
+    "translated_text": "TEXT",
+    "sarcasm_label": "TEXT",
+    "vader_compound": "REAL",
+    "vader_pos": "REAL",
+    "vader_neg": "REAL",
+    "vader_neu": "REAL",
+    "timestamp": "REAL NOT NULL",
+    "location": "TEXT",
+    "source": "TEXT",
+    "emotion": "TEXT",
+    "sentiment": "TEXT",
+    "ingested_at": "REAL NOT NULL",
+}
+
+# Index name -> columns. Pages are ordered by (timestamp, id), so every filter index ends with both
+EVENT_INDEXES = {
+    "idx_posts_time": ("timestamp", "id"),
+    "idx_posts_source_time": ("source", "timestamp", "id"),
+    "idx_posts_location_time": ("location", "timestamp", "id"),
+    "idx_posts_emotion_time": ("emotion", "timestamp", "id"),
+    "idx_posts_ingested": ("ingested_at",),
+}
+
+# Earlier indexes superseded by EVENT_INDEXES
+_OLD_INDEXES = ["idx_posts_timestamp", "idx_posts_source", "idx_posts_location"]
+
+# Columns that can be filtered on or grouped by
+FILTER_COLUMNS = ["source", "location", "emotion"]
+
+# Rollup table -> bucket size in seconds, finest first. Each counts posts per bucket x ROLLUP_COLUMNS
+ROLLUPS = {"rollup_minute": 60, "rollup_hour": 3600, "rollup_day": 86400}
+ROLLUP_COLUMNS = ["sentiment", "emotion", "source", "location", "sarcasm_label"]
+
+# Days of buckets compact() keeps per rollup table; 0 keeps everything
+ROLLUP_RETENTION_DAYS = {
+    "rollup_minute": int(os.environ.get("ROLLUP_MINUTE_DAYS", "2")),
+    "rollup_hour": int(os.environ.get("ROLLUP_HOUR_DAYS", "90")),
+    "rollup_day": 0,
+}
+
+
+def _connect(path, read_only=False):
+    if read_only:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def _rollup_sql(table, size, where):
+    """INSERT adding the post counts per bucket of `size` seconds of the posts matching `where` to `table`.
+
+    Missing values are counted under '' because NULLs never conflict in a primary key.
+    """
+    keys = ", ".join(f"COALESCE({column}, '')" for column in ROLLUP_COLUMNS)
+    columns = ", ".join(ROLLUP_COLUMNS)
+    return (f"INSERT INTO {table} (bucket, {columns}, posts) "
+            f"SELECT CAST(timestamp / {size} AS INTEGER) * {size}, {keys}, COUNT(*) FROM posts {where} "
+            f"GROUP BY 1, {', '.join(str(i) for i in range(2, len(ROLLUP_COLUMNS) + 2))} "
+            f"ON CONFLICT (bucket, {columns}) DO UPDATE SET posts = posts + excluded.posts")
+
+
+class EventStore:
+    """Append-only SQLite history of classified posts, indexed for time-window queries.
+
+    Rows are inserted once per post ID and never rewritten. Every append also
+    adds its posts to the per-minute, hour and day rollup tables in the same
+    transaction, so counts over any time range are read from a few buckets
+    instead of the raw rows. The database runs in WAL mode, so the APIs can
+    read while the pipeline appends, and compact() applies the retention policy.
+    """
+
+    def __init__(self, path=EVENT_DB):
+        self.path = path
+        self._conn = None
+        self._last_vacuum = 0.0
+
+    @property
+    def conn(self):
+        """Opens the database on first use, relative to the working directory at that time."""
+        if self._conn is None:
+            self._conn = _connect(self.path)
+            self._create_schema()
+        return self._conn
+
+    def _create_schema(self):
+        columns = ",\n".join(f"{name} {sql_type}" for name, sql_type in EVENT_COLUMNS.items())
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS posts (\n{columns}\n)")
+        for name in _OLD_INDEXES:
+            self._conn.execute(f"DROP INDEX IF EXISTS {name}")
+        for name, columns in EVENT_INDEXES.items():
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON posts ({', '.join(columns)})")
+
+        existing = {row[0] for row in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        keys = ", ".join(f"{column} TEXT NOT NULL" for column in ROLLUP_COLUMNS)
+        for table, size in ROLLUPS.items():
+            stored = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+            if table in existing and stored != ["bucket"] + ROLLUP_COLUMNS + ["posts"]:
+                # Rollups over a different set of columns are rebuilt from the posts still stored
+                self._conn.execute(f"DROP TABLE {table}")
+                existing.discard(table)
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (bucket INTEGER NOT NULL, {keys}, "
+                               f"posts INTEGER NOT NULL, PRIMARY KEY (bucket, {', '.join(ROLLUP_COLUMNS)})) "
+                               "WITHOUT ROWID")
+            # Stores created before these rollups existed are counted once from their posts
+            if table not in existing:
+                self._conn.execute(_rollup_sql(table, size, "WHERE true"))
+        self._conn.commit()
+
+    def append(self, df):
+        """Inserts the posts of `df` that are not stored yet and returns how many were added."""
+        if df.empty or "id" not in df.columns:
+            return 0
+        df = df.dropna(subset=["id", "timestamp"]).drop_duplicates("id")
+        columns = [c for c in EVENT_COLUMNS if c in df.columns]
+        rows = df[columns].astype(object).where(df[columns].notna(), None)
+        ingested_at = time.time()
+        rows["ingested_at"] = ingested_at
+        columns.append("ingested_at")
+
+        before = self.conn.total_changes
+        self.conn.executemany(
+            f"INSERT OR IGNORE INTO posts ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            rows[columns].itertuples(index=False, name=None),
+        )
+        added = self.conn.total_changes - before
+        if added:
+            # Only the rows inserted just now carry this ingestion time, so duplicates are not counted twice
+            for table, size in ROLLUPS.items():
+                self.conn.execute(_rollup_sql(table, size, "WHERE ingested_at = ?"), (ingested_at,))
+        self.conn.commit()
+        if added:
+            # Lets readers that cache window queries by version know the history changed
+            bump_version("events")
+        print(f"🗃️ Event store: {added} new of {len(df)} posts")
+        return added
+
+    def compact(self, retention_days=RETENTION_DAYS):
+        """Deletes posts older than the retention window and reclaims the space once enough is free."""
+        removed = 0
+        if retention_days > 0:
+            cutoff = time.time() - retention_days * 86400
+            removed = self.conn.execute("DELETE FROM posts WHERE timestamp < ?", (cutoff,)).rowcount
+            self.conn.commit()
+            if removed:
+                bump_version("events")
+
+        # Rollups outlive the raw posts; only their finer tables are trimmed
+        trimmed = 0
+        for table, days in ROLLUP_RETENTION_DAYS.items():
+            if days > 0:
+                trimmed += self.conn.execute(f"DELETE FROM {table} WHERE bucket < ?",
+                                             (time.time() - days * 86400,)).rowcount
+        self.conn.commit()
+
+        # Freed pages are reused by later inserts; the file is only rewritten
+        # once enough of it is free and the last rewrite is long enough ago
+        if (removed or trimmed) and time.time() - self._last_vacuum >= VACUUM_INTERVAL_HOURS * 3600:
+            pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if pages and free / pages >= VACUUM_FREE_RATIO:
+                self.conn.execute("VACUUM")
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._last_vacuum = time.time()
+                print(f"🧹 Event store: vacuumed {free} free pages")
+        if removed:
+            print(f"🧹 Event store: dropped {removed} posts older than {retention_days} days")
+        return removed
+
+
+def _where(since=None, until=None, sources=None, locations=None, emotions=None, ingested_after=None,
+           time_column="timestamp"):
+    """SQL WHERE clause (empty if there are no conditions) and its parameters."""
+    where, params = [], []
+    if ingested_after is not None:
+        where.append("ingested_at > ?")
+        params.append(ingested_after)
+    if since is not None:
+        where.append(f"{time_column} >= ?")
+        params.append(since)
+    if until is not None:
+        where.append(f"{time_column} < ?")
+        params.append(until)
+    for column, values in (("source", sources), ("location", locations), ("emotion", emotions)):
+        if values:
+            values = list(values)
+            where.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def _read_sql(sql, params, columns, path):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns)
+    conn = _connect(path, read_only=True)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def _check_columns(columns):
+    unknown = [c for c in columns if c not in EVENT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown event columns: {', '.join(unknown)}")
+
+
+def query_events(since=None, until=None, sources=None, locations=None, columns=None, latest=None,
+                 ingested_after=None, emotions=None, path=EVENT_DB):
+    """Reads posts with `since` <= timestamp < `until`, optionally limited to some sources, locations and emotions.
+
+    `latest` keeps only the newest N matching posts, and `ingested_after`
+    only posts stored after that time. Rows come back in timestamp order. The database is opened read-only, so this is safe to
+    call from the API processes while the pipeline is writing.
+    """
+    columns = [c for c in (columns or [c for c in EVENT_COLUMNS if c != "ingested_at"]) if c in EVENT_COLUMNS]
+    where, params = _where(since, until, sources, locations, emotions, ingested_after)
+
+    sql = f"SELECT {', '.join(columns)} FROM posts{where}"
+    if latest:
+        sql = f"SELECT * FROM ({sql} ORDER BY timestamp DESC LIMIT ?) ORDER BY timestamp"
+        params.append(int(latest))
+    else:
+        sql += " ORDER BY timestamp"
+    return _read_sql(sql, params, columns, path)
+
+
+def page_events(columns, after=None, limit=1000, since=None, until=None, sources=None, locations=None,
+                emotions=None, path=EVENT_DB):
+    """One newest-first page of posts for keyset pagination.
+
+    `after` is the (timestamp, id) of the last post of the previous page.
+    The ORDER BY matches the (…, timestamp, id) indexes, so SQLite seeks
+    straight to the cursor and a page costs the same however deep it is.
+    `timestamp` and `id` are always returned so the caller can build the
+    next cursor.
+    """
+    _check_columns(columns)
+    columns = list(dict.fromkeys(list(columns) + ["timestamp", "id"]))
+    where, params = _where(since, until, sources, locations, emotions)
+    if after is not None:
+        where += (" AND " if where else " WHERE ") + "(timestamp, id) < (?, ?)"
+        params.extend(after)
+    sql = f"SELECT {', '.join(columns)} FROM posts{where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+    params.append(int(limit))
+    return _read_sql(sql, params, columns, path)
+
+
+def count_events(group_by, limit=None, since=None, until=None, sources=None, locations=None, emotions=None,
+                 path=EVENT_DB):
+    """Number of posts per combination of the `group_by` columns, largest first."""
+    _check_columns(group_by)
+    where, params = _where(since, until, sources, locations, emotions)
+    groups = ", ".join(group_by)
+    sql = f"SELECT {groups}, COUNT(*) AS count FROM posts{where} GROUP BY {groups} ORDER BY count DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return _read_sql(sql, params, list(group_by) + ["count"], path)
+
+
+def _rollup_ranges(since=None, until=None, now=None):
+    """Splits [since, until) into (table, start, end) runs of whole rollup buckets.
+
+    Whole days come from the day rollup and the edges from the hour and
+    minute rollups, so a range costs a few hundred bucket rows at most. The
+    bounds are rounded down to the minute, or to the hour or day when they
+    are older than the finer rollups are kept.
+    """
+    now = time.time() if now is None else now
+    tables = list(ROLLUPS.items())
+
+    def resolution(t):
+        for table, size in tables:
+            days = ROLLUP_RETENTION_DAYS[table]
+            if days <= 0 or t >= now - days * 86400:
+                return size
+        return tables[-1][1]
+
+    since = None if since is None else since // resolution(since) * resolution(since)
+    until = None if until is None else until // resolution(until) * resolution(until)
+
+    ranges = []
+
+    def cover(start, end, tables):
+        (table, size), finer = tables[-1], tables[:-1]
+        first = None if start is None else -(-start // size) * size
+        last = None if end is None else end // size * size
+        if not finer or first is None or last is None or first < last:
+            ranges.append((table, first if finer else start, last if finer else end))
+            if finer and start is not None and start < first:
+                cover(start, first, finer)
+            if finer and end is not None and last < end:
+                cover(last, end, finer)
+        else:
+            cover(start, end, finer)
+
+    if since is None or until is None or since < until:
+        cover(since, until, tables)
+    return ranges
+
+
+def count_rollups(group_by, limit=None, since=None, until=None, sources=None, locations=None, emotions=None,
+                  path=EVENT_DB, now=None):
+    """count_events read from the rollup tables, at minute resolution.
+
+    The cost depends on the number of buckets in the range, not on how many
+    posts it holds. `group_by` may also include `sentiment` and `sarcasm_label`.
+    """
+    unknown = [c for c in group_by if c not in ROLLUP_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown rollup columns: {', '.join(unknown)}")
+    groups = ", ".join(group_by)
+    keys = ", ".join(f"NULLIF({column}, '') AS {column}" for column in group_by)
+
+    parts, params = [], []
+    for table, start, end in _rollup_ranges(since, until, now):
+        where, range_params = _where(start, end, sources, locations, emotions, time_column="bucket")
+        parts.append(f"SELECT {keys}{', ' if keys else ''}posts FROM {table}{where}")
+        params.extend(range_params)
+    if not parts:
+        return pd.DataFrame(columns=list(group_by) + ["count"])
+
+    sql = f"SELECT {groups}{', ' if groups else ''}SUM(posts) AS count FROM ({' UNION ALL '.join(parts)})"
+    if groups:
+        sql += f" GROUP BY {groups}"
+    sql += " ORDER BY count DESC"
+    if limit:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    return _read_sql(sql, params, list(group_by) + ["count"], path)
+
+
+def rollup_series(group_by, since, until, max_buckets=2000, sources=None, locations=None, emotions=None,
+                  path=EVENT_DB, now=None):
+    """Post counts per time bucket and `group_by` columns in [since, until), oldest bucket first.
+
+    Uses the finest rollup that still covers `since` and gives at most
+    `max_buckets` buckets. Returns the frame and the bucket size in seconds.
+    """
+    now = time.time() if now is None else now
+    for table, size in ROLLUPS.items():
+        days = ROLLUP_RETENTION_DAYS[table]
+        if (days <= 0 or since >= now - days * 86400) and (until - since) / size <= max_buckets:
+            break
+    columns = ["bucket"] + list(group_by) + ["count"]
+    where, params = _where(since // size * size, until, sources, locations, emotions, time_column="bucket")
+    keys = "".join(f", NULLIF({column}, '') AS {column}" for column in group_by)
+    groups = "".join(f", {column}" for column in group_by)
+    sql = f"SELECT bucket{keys}, SUM(posts) AS count FROM {table}{where} GROUP BY bucket{groups} ORDER BY bucket"
+    return _read_sql(sql, params, columns, path), size
+
+
+def event_bounds(path=EVENT_DB):
+    """Timestamps of the oldest and newest stored post, (None, None) for an empty or missing store."""
+    if not os.path.exists(path):
+        return None, None
+    conn = _connect(path, read_only=True)
+    try:
+        return conn.execute("SELECT MIN(timestamp), MAX(timestamp) FROM posts").fetchone()
+    finally:
+        conn.close()
+
+
+def query_window(since=None, until=None, window_hours=WINDOW_HOURS, **kwargs):
+    """query_events over the last `window_hours` when no `since` is given."""
+    if since is None:
+        since = time.time() - window_hours * 3600
+    return query_events(since=since, until=until, **kwargs)
+
+
+def events_exist(path=EVENT_DB):
+    return os.path.exists(path)
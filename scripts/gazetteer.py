@@ -0,0 +1,91 @@
+import re
+
+# Place names that resolve to themselves, on top of the states and countries in data_collection
+CITIES = [
+    # United States
+    "New York City", "Los Angeles", "Chicago", "Houston", "Phoenix", "Philadelphia", "San Antonio",
+    "San Diego", "San Francisco", "Seattle", "Boston", "Miami", "Atlanta", "Dallas", "Denver",
+    "Detroit", "Las Vegas", "Portland", "Austin",
+    # Canada
+    "Toronto", "Vancouver", "Montreal", "Ottawa", "Calgary", "Edmonton", "Winnipeg", "Halifax",
+    "Ontario", "Quebec", "British Columbia", "Alberta", "Manitoba", "Saskatchewan", "Nova Scotia",
+    "New Brunswick", "Newfoundland",
+    # India
+    "Delhi", "New Delhi", "Mumbai", "Bangalore", "Bengaluru", "Chennai", "Kolkata", "Hyderabad",
+    "Pune", "Ahmedabad", "Jaipur", "Kerala", "Punjab", "Maharashtra", "Karnataka", "Tamil Nadu",
+    "Gujarat", "Kashmir",
+    # Germany
+    "Berlin", "Munich", "Hamburg", "Frankfurt", "Cologne", "Stuttgart", "Dusseldorf", "Leipzig",
+    "Dresden", "Bavaria",
+    # China
+    "Beijing", "Shanghai", "Shenzhen", "Guangzhou", "Wuhan", "Chengdu", "Hong Kong", "Xinjiang", "Tibet",
+    # Japan
+    "Tokyo", "Osaka", "Kyoto", "Yokohama", "Nagoya", "Fukuoka", "Hiroshima", "Hokkaido", "Okinawa",
+    # Elsewhere
+    "London", "Paris", "Moscow", "Sydney", "Melbourne", "Mexico City", "Madrid", "Rome", "Seoul",
+    "Ukraine", "Kyiv", "Israel", "Gaza", "Iran", "Pakistan", "Bangladesh", "Taiwan", "North Korea",
+    "Vietnam", "Indonesia", "Philippines",
+]
+
+# Alternative names and demonyms -> canonical location
+ALIASES = {
+    "United States": "USA", "United States of America": "USA", "America": "USA",
+    "American": "USA", "Americans": "USA",
+    "United Kingdom": "UK", "Britain": "UK", "Great Britain": "UK", "England": "UK",
+    "British": "UK", "Brits": "UK",
+    "NYC": "New York City", "Bombay": "Mumbai", "Calcutta": "Kolkata", "Madras": "Chennai",
+    "Canadian": "Canada", "Canadians": "Canada",
+    "Indian": "India", "Indians": "India",
+    "German": "Germany", "Germans": "Germany",
+    "Chinese": "China", "PRC": "China",
+    "Japanese": "Japan",
+    "French": "France",
+    "Australian": "Australia", "Australians": "Australia",
+    "Russian": "Russia", "Russians": "Russia",
+    "Brazilian": "Brazil", "Brazilians": "Brazil",
+    "Mexican": "Mexico", "Mexicans": "Mexico",
+    "Spanish": "Spain", "Italian": "Italy", "Italians": "Italy",
+    "South Korean": "South Korea", "South Koreans": "South Korea", "Korean": "South Korea",
+    "Ukrainian": "Ukraine", "Ukrainians": "Ukraine",
+}
+
+
+def _trie_pattern(node):
+    """Turns a character trie into a regex that tries longer names before their prefixes."""
+    alternatives = []
+    for char in sorted(k for k in node if k):
+        # Any run of whitespace matches the space inside multi-word names
+        prefix = r"\s+" if char == " " else re.escape(char)
+        alternatives.append(prefix + _trie_pattern(node[char]))
+    if not alternatives:
+        return ""
+    pattern = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    return f"(?:{pattern})?" if "" in node else pattern
+
+
+class Gazetteer:
+    """Finds the first known place name in a text with one compiled trie regex.
+
+    All names share a single case-insensitive pattern built from a trie of
+    their lowercased spellings, so each text is scanned once instead of once
+    per name.
+    """
+
+    def __init__(self, names, aliases=None):
+        self.lookup = {name.lower(): name for name in names}
+        self.lookup.update({alias.lower(): target for alias, target in (aliases or {}).items()})
+
+        trie = {}
+        for key in self.lookup:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = True
+        self.pattern = re.compile(r"\b" + _trie_pattern(trie) + r"\b", re.IGNORECASE)
+
+    def find(self, text):
+        """Returns the canonical name of the leftmost place mentioned in `text`, or None."""
+        match = self.pattern.search(text or "")
+        if match is None:
+            return None
+        return self.lookup[" ".join(match.group(0).lower().split())]
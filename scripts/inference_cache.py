@@ -0,0 +1,156 @@
+import os
+import time
+import sqlite3
+import hashlib
+import unicodedata
+from batching import MAX_BATCH_TOKENS, token_lengths
+from worker_pool import WORKERS, predict_parallel
+
+CACHE_PATH = "data/cache/inference_cache.sqlite"
+MAX_ENTRIES = 200_000
+
+# SQLite caps the number of bound parameters per statement
+_QUERY_CHUNK = 500
+
+
+def normalize_text(text):
+    """Normalizes unicode and whitespace so reposts with cosmetic differences share an entry."""
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def describe_model(hf_pipeline):
+    """Returns (name, revision) of a transformers pipeline's model."""
+    config = hf_pipeline.model.config
+    name = getattr(config, "name_or_path", None) or hf_pipeline.model.name_or_path
+    revision = getattr(config, "_commit_hash", None) or "unknown"
+    return name, revision
+
+
+class InferenceCache:
+    """Persistent SQLite cache of model predictions keyed by text hash, model name and revision.
+
+    The database is opened on first use, so the path resolves against the
+    project root the pipeline changes into. Entries written under another
+    revision of the same model are dropped when it is opened, and the least
+    recently used entries are evicted once the cache holds more than
+    `max_entries` rows.
+    """
+
+    def __init__(self, model_name, revision, path=CACHE_PATH, max_entries=MAX_ENTRIES):
+        self.model_name = model_name
+        self.revision = revision
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+
+    @property
+    def conn(self):
+        """Opens the database on first use, relative to the working directory at that time."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._open()
+        return self._conn
+
+    def _open(self):
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS predictions (
+                model TEXT NOT NULL,
+                revision TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                label TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, revision, text_hash)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON predictions (last_used)")
+
+        # A new model revision invalidates everything cached for the old one
+        removed = self._conn.execute(
+            "DELETE FROM predictions WHERE model = ? AND revision != ?", (self.model_name, self.revision)
+        ).rowcount
+        self._conn.commit()
+        if removed:
+            print(f"♻️ Dropped {removed} cached predictions from an older revision of {self.model_name}")
+
+    def get_many(self, hashes):
+        """Returns {text_hash: label} for the hashes present in the cache."""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        for i in range(0, len(unique), _QUERY_CHUNK):
+            chunk = unique[i:i + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT text_hash, label FROM predictions "
+                f"WHERE model = ? AND revision = ? AND text_hash IN ({placeholders})",
+                [self.model_name, self.revision, *chunk],
+            ).fetchall()
+            found.update(rows)
+
+        if found:
+            now = time.time()
+            self.conn.executemany(
+                "UPDATE predictions SET last_used = ? WHERE model = ? AND revision = ? AND text_hash = ?",
+                [(now, self.model_name, self.revision, h) for h in found],
+            )
+            self.conn.commit()
+        return found
+
+    def put_many(self, items):
+        """Stores (text_hash, label) pairs and evicts the oldest entries beyond the size bound."""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+            [(self.model_name, self.revision, h, label, now) for h, label in items],
+        )
+        excess = self.conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM predictions WHERE rowid IN "
+                "(SELECT rowid FROM predictions ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+        self.conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        hit_rate = self.hits / total if total else 0.0
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(hit_rate, 4)}
+
+
+def predict_with_cache(cache, texts, predict_batch, tokenizer, max_tokens=MAX_BATCH_TOKENS, fallback="UNKNOWN",
+                       workers=WORKERS):
+    """Labels `texts`, sending only uncached unique texts to `predict_batch`.
+
+    Uncached texts are batched by token length under a padded-token budget,
+    across `workers` forked processes when more than one is configured.
+    Texts that still fail after bisecting their batch are labelled
+    `fallback` and are not cached, so they are retried on the next run.
+    """
+    hashes = [text_hash(t) for t in texts]
+    labels = cache.get_many(hashes)
+
+    pending = {}
+    for h, text in zip(hashes, texts):
+        if h not in labels and h not in pending:
+            pending[h] = text
+    hits = sum(1 for h in hashes if h in labels)
+    cache.hits += hits
+    cache.misses += len(hashes) - hits
+    print(f"🗄️ Cache: {len(texts) - len(pending)} of {len(texts)} texts served without the model")
+
+    pending_hashes = list(pending)
+    pending_texts = list(pending.values())
+    predicted = predict_parallel(predict_batch, pending_texts, token_lengths(tokenizer, pending_texts),
+                                 workers=workers, max_tokens=max_tokens, fallback=fallback)
+    cache.put_many((h, label) for h, label in zip(pending_hashes, predicted) if label != fallback)
+    labels.update(zip(pending_hashes, predicted))
+
+    return [labels[h] for h in hashes]
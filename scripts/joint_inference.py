@@ -0,0 +1,158 @@
+import time
+import torch
+from tqdm import tqdm
+from inference_cache import text_hash
+from batching import MAX_BATCH_TOKENS, predict_bisect, token_budget_batches
+from worker_pool import WORKERS, balanced_shards, map_shards, worker_count
+from emotion_detection import emotion_model, emotion_cache, emotion_onnx, load_data, save_emotion_data
+from sentiment_analysis import sentiment_model, sentiment_cache, sentiment_onnx, map_sentiment_label, save_sentiment_data
+
+# Output column -> (pipeline, prediction cache, raw label -> stored label)
+MODELS = {
+    "emotion": (emotion_model, emotion_cache, lambda label: label),
+    "sentiment": (sentiment_model, sentiment_cache, map_sentiment_label),
+}
+
+# ONNX Runtime sessions replace the PyTorch forward pass when that backend is selected
+ONNX_SESSIONS = {"emotion": emotion_onnx, "sentiment": sentiment_onnx}
+
+
+def share_tokenization(tokenizer_a, tokenizer_b):
+    """Encodings can only be reused across models whose tokenizers map text to the same ids."""
+    if tokenizer_a is tokenizer_b:
+        return True
+    return type(tokenizer_a) is type(tokenizer_b) and tokenizer_a.get_vocab() == tokenizer_b.get_vocab()
+
+
+def encode_texts(texts_by_hash, needed):
+    """Tokenizes each text once per distinct vocabulary.
+
+    `needed` maps a column to the hashes that its model still has to label.
+    Returns {column: {text_hash: input_ids}} and the tokenization time per column.
+    """
+    encodings, timings, done = {}, {}, []
+    for name, hashes in needed.items():
+        tokenizer = MODELS[name][0].tokenizer
+        shared = next((other for other in done if share_tokenization(MODELS[other][0].tokenizer, tokenizer)), None)
+        start = time.perf_counter()
+        if shared is not None:
+            # Same vocabulary: reuse the other model's ids, only encode what it did not need
+            missing = [h for h in hashes if h not in encodings[shared]]
+            ids = tokenizer([texts_by_hash[h] for h in missing], truncation=True)["input_ids"] if missing else []
+            encodings[name] = {h: encodings[shared][h] for h in hashes if h in encodings[shared]}
+            encodings[name].update(zip(missing, ids))
+        else:
+            ids = tokenizer([texts_by_hash[h] for h in hashes], truncation=True)["input_ids"] if hashes else []
+            encodings[name] = dict(zip(hashes, ids))
+        timings[name] = time.perf_counter() - start
+        done.append(name)
+    return encodings, timings
+
+
+def classify_encoded(hf_pipeline, input_ids):
+    """Runs one padded batch of token ids through the model and returns the top labels."""
+    batch = hf_pipeline.tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+    batch = {key: value.to(hf_pipeline.model.device) for key, value in batch.items()}
+    with torch.inference_mode():
+        logits = hf_pipeline.model(**batch).logits
+    id2label = hf_pipeline.model.config.id2label
+    return [id2label[i] for i in logits.argmax(dim=-1).tolist()]
+
+
+def label_pending(pending, lengths, encodings, max_tokens=MAX_BATCH_TOKENS):
+    """Runs both models over length-sorted, token-budgeted batches of the `pending` text hashes.
+
+    Returns {column: {text_hash: label}} and the model time per column.
+    """
+    predicted = {name: {} for name in MODELS}
+    elapsed = {name: 0.0 for name in MODELS}
+    for batch in tqdm(token_budget_batches(lengths, max_tokens)):
+        batch = [pending[i] for i in batch]
+        for name, (hf_pipeline, _, to_label) in MODELS.items():
+            batch_hashes = [h for h in batch if h in encodings[name]]
+            if not batch_hashes:
+                continue
+            start = time.perf_counter()
+            onnx_session = ONNX_SESSIONS[name]
+            classify = onnx_session.classify_ids if onnx_session is not None else \
+                lambda ids, hf_pipeline=hf_pipeline: classify_encoded(hf_pipeline, ids)
+            batch_labels, _ = predict_bisect(
+                lambda hs: [to_label(label) for label in classify([encodings[name][h] for h in hs])],
+                batch_hashes,
+            )
+            elapsed[name] += time.perf_counter() - start
+            predicted[name].update(zip(batch_hashes, batch_labels))
+    return predicted, elapsed
+
+
+def analyze_sentiment_and_emotion(df, max_tokens=MAX_BATCH_TOKENS, workers=WORKERS):
+    """Adds the `emotion` and `sentiment` columns in one pass over `translated_text`.
+
+    Both models run over the same length-sorted batches, sized by a padded
+    token budget, and each text is tokenized once per distinct vocabulary.
+    A failing batch is bisected so only the offending texts become UNKNOWN.
+    With `workers` > 1 the batches are spread over forked worker processes.
+    """
+    print("🧠 Predicting emotion and sentiment in one pass...")
+    texts = df["translated_text"].astype(str).fillna("").tolist()
+    hashes = [text_hash(t) for t in texts]
+    texts_by_hash = dict(zip(hashes, texts))
+
+    labels, needed = {}, {}
+    for name, (_, cache, _) in MODELS.items():
+        labels[name] = cache.get_many(hashes)
+        hits = sum(1 for h in hashes if h in labels[name])
+        cache.hits += hits
+        cache.misses += len(hashes) - hits
+        needed[name] = [h for h in texts_by_hash if h not in labels[name]]
+        print(f"🗄️ {name}: {len(texts) - len(needed[name])} of {len(texts)} texts served from cache")
+
+    encodings, elapsed = encode_texts(texts_by_hash, needed)
+
+    # Batch by token length so every batch pads to roughly the same length for both models
+    pending = list(dict.fromkeys(h for hs in needed.values() for h in hs))
+    lengths = [max(len(encodings[name][h]) for name in MODELS if h in encodings[name]) for h in pending]
+
+    start = time.perf_counter()
+    workers = worker_count(workers, len(pending))
+    if workers > 1:
+        shard_results = map_shards(
+            lambda shard: label_pending([pending[i] for i in shard], [lengths[i] for i in shard], encodings, max_tokens),
+            balanced_shards(lengths, workers),
+        )
+    else:
+        shard_results = [label_pending(pending, lengths, encodings, max_tokens)]
+    wall_time = time.perf_counter() - start
+
+    for shard_labels, shard_elapsed in shard_results:
+        for name in MODELS:
+            labels[name].update(shard_labels[name])
+            elapsed[name] += shard_elapsed[name]
+            MODELS[name][1].put_many((h, label) for h, label in shard_labels[name].items() if label != "UNKNOWN")
+
+    # Per-model rates are per process; the wall-clock rate shows how the worker count scales
+    for name in MODELS:
+        count = len(needed[name])
+        rate = count / elapsed[name] if elapsed[name] > 0 else 0.0
+        print(f"⚡ {name}: {count} texts in {elapsed[name]:.2f}s ({rate:.1f} texts/sec)")
+    if pending:
+        print(f"⚡ {max(workers, 1)} workers: {len(pending) / wall_time:.1f} texts/sec wall-clock")
+
+    for name in MODELS:
+        df[name] = [labels[name][h] for h in hashes]
+    return df
+
+
+# Execute script
+if __name__ == "__main__":
+    print("📂 Loading preprocessed data...")
+    df = load_data()
+
+    df = analyze_sentiment_and_emotion(df)
+
+    print("💾 Saving results...")
+    save_emotion_data(df.drop(columns=["sentiment"]))
+    save_sentiment_data(df.drop(columns=["emotion"]))
+
+    print("✅ Emotion and sentiment analysis completed successfully!")
+    print(df.head())
@@ -0,0 +1,108 @@
+import os
+import re
+import torch
+
+# "torch" (transformers pipeline), "onnx" (fp32 ONNX Runtime) or "onnx-int8" (dynamically quantized)
+BACKEND = os.environ.get("INFERENCE_BACKEND", "torch")
+# Intra-op threads for inference; 0 keeps the runtime default
+INTRA_OP_THREADS = int(os.environ.get("INFERENCE_THREADS", "0"))
+ONNX_DIR = "models/onnx"
+
+if INTRA_OP_THREADS:
+    torch.set_num_threads(INTRA_OP_THREADS)
+
+
+class _LogitsOnly(torch.nn.Module):
+    """Wraps a sequence classifier so the exported graph has a single `logits` output."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+def model_dir(hf_pipeline, revision, onnx_dir=ONNX_DIR):
+    """Export directory, unique per model name and revision so a model update triggers a new export."""
+    name = re.sub(r"[^\w.-]", "_", hf_pipeline.model.name_or_path)
+    return os.path.join(onnx_dir, f"{name}-{revision[:12]}")
+
+
+def export_to_onnx(hf_pipeline, output_dir, quantize=False):
+    """Exports the pipeline's model to ONNX, optionally with dynamic INT8 weight quantization."""
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, "model.onnx")
+    if not os.path.exists(fp32_path):
+        print(f"📦 Exporting {hf_pipeline.model.name_or_path} to {fp32_path}...")
+        sample = hf_pipeline.tokenizer(["export sample text"], return_tensors="pt")
+        axes = {0: "batch", 1: "sequence"}
+        torch.onnx.export(
+            _LogitsOnly(hf_pipeline.model.eval()),
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={"input_ids": axes, "attention_mask": axes, "logits": {0: "batch"}},
+            opset_version=17,
+        )
+
+    if not quantize:
+        return fp32_path
+
+    int8_path = os.path.join(output_dir, "model.int8.onnx")
+    if not os.path.exists(int8_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print(f"🗜️ Quantizing {fp32_path} to INT8...")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxClassifier:
+    """Runs a transformers text classifier through ONNX Runtime with the pipeline's tokenizer and labels."""
+
+    def __init__(self, hf_pipeline, revision, quantize=False, intra_op_threads=INTRA_OP_THREADS):
+        import onnxruntime as ort
+
+        self.tokenizer = hf_pipeline.tokenizer
+        self.id2label = hf_pipeline.model.config.id2label
+        self.path = export_to_onnx(hf_pipeline, model_dir(hf_pipeline, revision), quantize=quantize)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(self.path, options, providers=["CPUExecutionProvider"])
+        print(f"✅ ONNX Runtime session ready: {self.path}")
+
+    def _run(self, encoded):
+        feeds = {
+            "input_ids": encoded["input_ids"].astype("int64"),
+            "attention_mask": encoded["attention_mask"].astype("int64"),
+        }
+        logits = self.session.run(["logits"], feeds)[0]
+        return [self.id2label[int(i)] for i in logits.argmax(axis=-1)]
+
+    def predict(self, texts):
+        """Returns the top label for each text, like the pipeline's `label` field."""
+        encoded = self.tokenizer(list(texts), truncation=True, padding=True, return_tensors="np")
+        return self._run(encoded)
+
+    def classify_ids(self, input_ids):
+        """Returns the top label for already tokenized texts."""
+        return self._run(self.tokenizer.pad({"input_ids": input_ids}, return_tensors="np"))
+
+
+def load_backend(hf_pipeline, revision, backend=BACKEND):
+    """Returns an OnnxClassifier for the ONNX backends, or None to keep the PyTorch pipeline."""
+    if backend == "torch":
+        return None
+    if backend not in ("onnx", "onnx-int8"):
+        raise ValueError(f"❌ Unknown inference backend '{backend}'")
+    return OnnxClassifier(hf_pipeline, revision, quantize=backend == "onnx-int8")
+
+
+def backend_model_key(model_name, backend=BACKEND):
+    """Cache model key; ONNX backends get their own so their predictions are cached separately."""
+    return model_name if backend == "torch" else f"{model_name}:{backend}"
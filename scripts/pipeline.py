@@ -0,0 +1,233 @@
+import os
+import sys
+import time
+import logging
+import pandas as pd
+
+# Get the absolute path of the project root directory
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPTS_DIR)
+
+# Make the stage modules importable when run from the project root or by the scheduler
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+# Suppress TensorFlow logs before transformers is imported by the stage modules
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "3")
+os.environ.setdefault("TF_ENABLE_ONEDNN_OPTS", "0")
+
+# Importing the stages once loads spaCy, both transformer pipelines and Prophet;
+# every later cycle reuses the warm models instead of starting a new interpreter.
+import data_collection
+import preprocessing
+import emotion_detection
+import sentiment_analysis
+import anomaly_detection
+import sentiment_forecasting
+import joint_inference
+from post_store import PostStore
+from event_store import EventStore
+from storage import write_artifact
+
+logger = logging.getLogger(__name__)
+
+# Wall time (seconds) of every stage in the most recent cycle
+last_timings = {}
+
+def _input(frames, key, loader):
+    """Return this cycle's frame for `key`, or the last published snapshot if its stage failed."""
+    if key in frames:
+        return frames[key]
+    logger.warning(f"⚠️ No fresh '{key}' data this cycle, falling back to the last snapshot")
+    return loader()
+
+
+# Per-post results of the row-wise stages, kept across cycles
+STORES = {
+    "raw": PostStore("raw_posts"),
+    "processed": PostStore("processed_posts"),
+    "emotions": PostStore("emotion_results"),
+    "sentiments": PostStore("sentiment_results"),
+}
+
+
+# Full history of classified posts, queried by time window
+EVENTS = EventStore()
+
+
+def _incremental(key, df, process):
+    """Run `process` only on the rows of `df` not seen before and return the stored results for `df`.
+
+    Frames without a post ID (snapshots written before IDs were collected)
+    are processed in full.
+    """
+    if "id" not in df.columns:
+        return process(df.copy())
+    store = STORES[key]
+    new = store.filter_new(df)
+    logger.info(f"🆕 {key}: {len(new)} new of {len(df)} posts")
+    if not new.empty:
+        store.append(process(new.copy()))
+    return store.lookup(df["id"])
+
+
+# Stage functions: DataFrames are handed over in memory through `frames`.
+# Each stage copies its input so that every published snapshot keeps the
+# same columns it had when the stages ran as separate scripts.
+def run_data_collection(frames):
+    """Stores and preprocesses each subreddit's posts as soon as its listing arrives.
+
+    Preprocessing runs while the other fetches are still in flight; posts it
+    fails on are picked up again by run_preprocessing.
+    """
+    raw_posts = STORES["raw"].load()
+    known_locations = raw_posts["location"].to_dict() if "location" in raw_posts.columns else {}
+    arrived = {}
+    for subreddit, df in data_collection.iter_country_news(
+        data_collection.country_subreddits, limit=100, known_locations=known_locations
+    ):
+        if df.empty:
+            continue
+        arrived[subreddit] = _incremental("raw", df, lambda new: new)
+        try:
+            _incremental("processed", arrived[subreddit], preprocessing.preprocess_dataset)
+        except Exception as e:
+            logger.warning(f"⚠️ Preprocessing r/{subreddit} failed, leaving it to the preprocessing stage: {e}")
+
+    # ✅ Keep the subreddit order stable regardless of arrival order
+    valid_posts = [arrived[s] for s in data_collection.country_subreddits if s in arrived]
+    frames["raw"] = (pd.concat(valid_posts, ignore_index=True) if valid_posts
+                     else pd.DataFrame(columns=data_collection.POST_COLUMNS))
+
+
+def run_preprocessing(frames):
+    # Posts preprocessed during collection are already stored, so only the rest is processed here
+    df = _input(frames, "raw", preprocessing.load_data)
+    frames["processed"] = _incremental("processed", df, preprocessing.preprocess_dataset)
+
+
+def run_classification(frames):
+    """Labels emotion and sentiment in a single pass and splits them into the two result frames."""
+    df = _input(frames, "processed", emotion_detection.load_data)
+    if "id" not in df.columns:
+        both = joint_inference.analyze_sentiment_and_emotion(df.copy())
+        frames["emotions"] = both.drop(columns=["sentiment"])
+        frames["sentiments"] = both.drop(columns=["emotion"])
+        return
+
+    new_emotions = STORES["emotions"].filter_new(df)
+    new_sentiments = STORES["sentiments"].filter_new(df)
+    new = df[df["id"].isin(new_emotions["id"]) | df["id"].isin(new_sentiments["id"])].drop_duplicates("id")
+    logger.info(f"🆕 classification: {len(new)} new of {len(df)} posts")
+    if not new.empty:
+        both = joint_inference.analyze_sentiment_and_emotion(new.copy())
+        STORES["emotions"].append(both[both["id"].isin(new_emotions["id"])].drop(columns=["sentiment"]))
+        STORES["sentiments"].append(both[both["id"].isin(new_sentiments["id"])].drop(columns=["emotion"]))
+    frames["emotions"] = STORES["emotions"].lookup(df["id"])
+    frames["sentiments"] = STORES["sentiments"].lookup(df["id"])
+
+
+def run_event_store(frames):
+    """Appends this cycle's classified posts to the event history and applies the retention policy."""
+    emotions, sentiments = frames.get("emotions"), frames.get("sentiments")
+    if emotions is None or sentiments is None or "id" not in emotions.columns:
+        return
+    EVENTS.append(emotions.merge(sentiments[["id", "sentiment"]], on="id", how="inner"))
+    EVENTS.compact()
+
+
+# The rate detector keeps rolling statistics between cycles and only reads
+# the posts stored since its last run, so its cost follows the new posts.
+def run_anomaly_detection(frames):
+    df = _input(frames, "emotions", anomaly_detection.load_data)
+    detector = anomaly_detection.load_detector()
+    spikes = anomaly_detection.detect_anomalies(anomaly_detection.load_new_posts(detector), detector)
+    anomaly_detection.save_detector(detector)
+    anomaly_detection.trigger_alert(spikes)
+    frames["anomalies"] = anomaly_detection.anomaly_results(df.copy(), detector.spikes)
+
+
+# Forecasting fits on the whole window, but only on results that are already stored.
+# The engine keeps its models between cycles and refits once a day when a bucket closes,
+# fitting the overall series and every source and location segment on a process pool.
+FORECASTER = sentiment_forecasting.ForecastEngine(periods=7)
+
+
+def run_sentiment_forecasting(frames):
+    # Fit on the stored history window rather than only this cycle's posts
+    df = sentiment_forecasting.load_sentiment_history()
+    series = sentiment_forecasting.build_segment_series(df, freq=FORECASTER.freq)
+    forecast = FORECASTER.forecast_segments(series)
+    # An unchanged forecast is not republished, so readers keep their cached copy
+    if FORECASTER.last_fit["method"] != "cached":
+        frames["trends"] = forecast
+
+
+def publish_snapshots(frames):
+    """Write every artifact produced this cycle once, after all stages have run."""
+    if "raw" in frames:
+        write_artifact(frames["raw"], "raw")
+    if "processed" in frames:
+        preprocessing.save_preprocessed_data(frames["processed"])
+    if "emotions" in frames:
+        emotion_detection.save_emotion_data(frames["emotions"])
+    if "sentiments" in frames:
+        sentiment_analysis.save_sentiment_data(frames["sentiments"])
+    if "anomalies" in frames:
+        anomaly_detection.save_results(frames["anomalies"])
+        anomaly_detection.save_anomalous_posts(frames["anomalies"])
+    if "trends" in frames:
+        write_artifact(frames["trends"], "trends")
+
+
+STAGES = [
+    ("data_collection", run_data_collection),
+    ("preprocessing", run_preprocessing),
+    ("classification", run_classification),
+    ("event_store", run_event_store),
+    ("anomaly_detection", run_anomaly_detection),
+    ("sentiment_forecasting", run_sentiment_forecasting),
+    ("publish", publish_snapshots),
+]
+
+
+def run_pipeline():
+    """Run every stage in-process and record its wall time.
+
+    Stages pass DataFrames to each other in memory and the Parquet artifacts are
+    written once at the end of the cycle. A failing stage is logged and the
+    stages after it fall back to the last published snapshot, as they did
+    when each stage was its own process.
+    """
+    # Stage modules use paths relative to the project root
+    os.chdir(PROJECT_ROOT)
+
+    logger.info("▶ Running pipeline...")
+    frames = {}
+    timings = {}
+    cycle_start = time.perf_counter()
+    for name, stage in STAGES:
+        logger.info(f"⏳ Running {name}...")
+        start = time.perf_counter()
+        try:
+            stage(frames)
+        except Exception:
+            logger.exception(f"❌ Error in {name}")
+        timings[name] = time.perf_counter() - start
+        logger.info(f"⏱️ {name} took {timings[name]:.2f}s")
+    timings["total"] = time.perf_counter() - cycle_start
+
+    last_timings.clear()
+    last_timings.update(timings)
+    logger.info(f"✅ Pipeline finished in {timings['total']:.2f}s\n")
+    return frames
+
+
+# Execute a single cycle
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    run_pipeline()
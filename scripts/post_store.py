@@ -0,0 +1,86 @@
+import os
+import glob
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+STORE_DIR = "data/store"
+
+# Part files are merged into one once a store has more than this many
+MAX_PARTS = 50
+
+
+class PostStore:
+    """Append-only store of one stage's per-post results, keyed on the Reddit post ID.
+
+    Each append writes one Parquet part file under `data/store/<name>/`, like
+    the published artifacts but without snapshots, since only the pipeline
+    reads it. The parts are read once and then kept in memory, so a
+    long-lived pipeline only pays for writing the rows that are new in each cycle.
+    """
+
+    def __init__(self, name, store_dir=STORE_DIR):
+        self.name = name
+        self.path = os.path.join(store_dir, name)
+        self.legacy_path = os.path.join(store_dir, f"{name}.csv")
+        self._df = None
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    def _write_part(self, df, index):
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, f"part-{index:06d}.parquet")
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+        return path
+
+    def _migrate_csv(self):
+        """Moves a store written as CSV before the Parquet migration into its first part file."""
+        if os.path.exists(self.legacy_path) and not self._parts():
+            self._write_part(pd.read_csv(self.legacy_path, dtype={"id": str}, encoding="utf-8"), 0)
+            os.remove(self.legacy_path)
+            print(f"📦 Migrated {self.legacy_path} to {self.path}")
+
+    def load(self):
+        """Returns every stored row indexed by post ID."""
+        if self._df is None:
+            self._migrate_csv()
+            parts = self._parts()
+            if parts:
+                df = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+                if len(parts) > MAX_PARTS:
+                    self._compact(df, parts)
+                self._df = df.drop_duplicates("id", keep="last").set_index("id")
+            else:
+                self._df = pd.DataFrame(index=pd.Index([], name="id", dtype=str))
+        return self._df
+
+    def _compact(self, df, parts):
+        """Rewrites many small part files as one, numbered after the last so a crash leaves no gap."""
+        index = int(os.path.basename(parts[-1])[5:11]) + 1
+        self._write_part(df, index)
+        for part in parts:
+            os.remove(part)
+
+    def filter_new(self, df):
+        """Returns the rows of `df` whose post ID is not in the store yet."""
+        new = df[~df["id"].isin(self.load().index)]
+        return new.drop_duplicates("id")
+
+    def append(self, df):
+        """Writes freshly processed rows as a new part file and adds them to the in-memory copy."""
+        if df.empty:
+            return
+        stored = self.load()
+        parts = self._parts()
+        index = int(os.path.basename(parts[-1])[5:11]) + 1 if parts else 0
+        path = self._write_part(df, index)
+
+        new = df.set_index("id")
+        self._df = new if stored.empty else pd.concat([stored, new])
+        print(f"🗃️ Appended {len(df)} new rows to {path}")
+
+    def lookup(self, ids):
+        """Returns the stored rows for `ids`, in the same order."""
+        return self.load().loc[list(ids)].reset_index()
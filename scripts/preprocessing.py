@@ -1,73 +1,128 @@
-import re
-import pandas as pd
-from deep_translator import GoogleTranslator
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-
-# Load data
-def load_data(file_path="data/geo_sentiment.csv"):
-    """Loads the collected Reddit data from CSV with UTF-8 encoding."""
-    df = pd.read_csv(file_path, encoding="utf-8")
-    return df
-
-# Text Cleaning
-def preprocess_text(text):
-    """Cleans text by removing URLs, mentions, hashtags, punctuation, and numbers."""
-    if pd.isna(text):
-        return ""  # Handle missing values safely
-    text = re.sub(r'http\S+', '', text)  # Remove URLs
-    text = re.sub(r'@\w+', '', text)     # Remove mentions
-    text = re.sub(r'#\w+', '', text)     # Remove hashtags
-    text = re.sub(r'[^\w\s]', '', text)  # Remove punctuation
-    text = re.sub(r'\d+', '', text)      # Remove numbers
-    text = text.lower().strip()          # Convert to lowercase
-    return text
-
-# Language Translation
-def translate_text(text, target_lang='en'):
-    """Translates text to English for uniform sentiment analysis."""
-    try:
-        return GoogleTranslator(source='auto', target=target_lang).translate(text)
-    except:
-        return text  # If translation fails, return the original text
-
-# Sarcasm Detection using VADER
-analyzer = SentimentIntensityAnalyzer()
-
-def detect_sarcasm(text):
-    """Detects sarcasm based on sentiment score thresholds."""
-    score = analyzer.polarity_scores(text)['compound']
-    return "sarcastic" if score > 0.8 or score < -0.8 else "not_sarcastic"
-
-# Process entire dataset
-def preprocess_dataset(df):
-    """Applies preprocessing steps on the dataset."""
-    df['text'] = df['text'].astype(str).apply(preprocess_text)
-    df['translated_text'] = df['text'].apply(lambda x: translate_text(x, 'en'))
-    df['sarcasm_label'] = df['translated_text'].apply(detect_sarcasm)
-
-    # Ensure timestamp, location, and optionally source are retained
-    columns = ['text', 'translated_text', 'sarcasm_label', 'timestamp', 'location']
-    if 'source' in df.columns:
-        columns.append('source')
-
-    return df[columns]
-
-# Save Preprocessed Data
-def save_preprocessed_data(df, file_path="data/processed_sentiment_data.csv"):
-    """Saves the preprocessed dataset as CSV with UTF-8 encoding."""
-    df.to_csv(file_path, index=False, encoding="utf-8")
-    print(f"✅ Preprocessed data saved to {file_path}")
-
-# Execute script
-if __name__ == "__main__":
-    print("🔄 Loading raw data...")
-    df = load_data()
-    
-    print("🛠️ Preprocessing text...")
-    df = preprocess_dataset(df)
-    
-    print("💾 Saving preprocessed data...")
-    save_preprocessed_data(df)
-    
-    print("✅ Preprocessing completed successfully!")
-    print(df.head())  # Show preview
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from storage import read_artifact, write_artifact
+from translation import shared_translation, translate_texts
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+# Load data
+def load_data(artifact="raw"):
+    """Loads the collected Reddit data from the Parquet store."""
+    df = read_artifact(artifact, as_category=False)
+    return df
+
+# Text Cleaning
+def preprocess_text(text):
+    """Cleans text by removing URLs, mentions, hashtags, punctuation, and numbers."""
+    if pd.isna(text):
+        return ""  # Handle missing values safely
+    text = re.sub(r'http\S+', '', text)  # Remove URLs
+    text = re.sub(r'@\w+', '', text)     # Remove mentions
+    text = re.sub(r'#\w+', '', text)     # Remove hashtags
+    text = re.sub(r'[^\w\s]', '', text)  # Remove punctuation
+    text = re.sub(r'\d+', '', text)      # Remove numbers
+    text = text.lower().strip()          # Convert to lowercase
+    return text
+
+# All five cleaning steps as one precompiled pattern, giving byte-identical output to preprocess_text.
+# URLs must win over the other rules, as they did when they were removed first: mentions and
+# hashtags stop where a URL would start (`@abchttp://x` keeps no `x`).
+CLEAN_PATTERN = re.compile(
+    r'http\S+'                       # URLs
+    r'|@(?:(?!http\S)\w)+'           # Mentions
+    r'|#(?:(?!http\S)\w)+'           # Hashtags
+    r'|[^\w\s]'                      # Punctuation
+    r'|\d+'                          # Numbers
+)
+
+def clean_text_column(texts):
+    """Vectorized preprocess_text for a whole Series: one regex pass per row, then lowercase and strip."""
+    return texts.fillna("").str.replace(CLEAN_PATTERN, "", regex=True).str.lower().str.strip()
+
+# Language Translation: English rows are skipped, the rest go through a cached, batched backend
+translator, translation_cache = shared_translation()
+
+def translate_text(text, target_lang='en'):
+    """Translates text to English for uniform sentiment analysis."""
+    backend, cache = shared_translation(translator.name, target_lang)
+    return translate_texts([text], backend, cache)[0]
+
+# Sarcasm Detection using VADER
+analyzer = SentimentIntensityAnalyzer()
+
+# |compound| above this is labelled sarcastic
+SARCASM_THRESHOLD = float(os.environ.get("SARCASM_THRESHOLD", "0.8"))
+VADER_WORKERS = int(os.environ.get("VADER_WORKERS", str(os.cpu_count() or 1)))
+VADER_CHUNK_SIZE = 5000
+VADER_COLUMNS = ['vader_compound', 'vader_pos', 'vader_neg', 'vader_neu']
+
+def detect_sarcasm(text, threshold=SARCASM_THRESHOLD):
+    """Detects sarcasm based on sentiment score thresholds."""
+    score = analyzer.polarity_scores(text)['compound']
+    return "sarcastic" if score > threshold or score < -threshold else "not_sarcastic"
+
+def _score_chunk(texts):
+    return [(s['compound'], s['pos'], s['neg'], s['neu']) for s in map(analyzer.polarity_scores, texts)]
+
+def score_vader(texts, workers=VADER_WORKERS, chunk_size=VADER_CHUNK_SIZE):
+    """Scores texts with VADER in chunks across worker processes and returns the four VADER columns."""
+    texts = texts.astype(str).tolist()
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+    start = time.perf_counter()
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            rows = [row for chunk in executor.map(_score_chunk, chunks) for row in chunk]
+    else:
+        rows = [row for chunk in chunks for row in _score_chunk(chunk)]
+    elapsed = time.perf_counter() - start
+
+    if texts:
+        print(f"⚡ VADER: {len(texts)} rows in {elapsed:.2f}s ({len(texts) / max(elapsed, 1e-9):,.0f} rows/sec)")
+    return pd.DataFrame(rows, columns=VADER_COLUMNS, dtype=float)
+
+def label_sarcasm(compound, threshold=SARCASM_THRESHOLD):
+    """Vectorized detect_sarcasm on precomputed compound scores."""
+    return np.where(compound.abs() > threshold, "sarcastic", "not_sarcastic")
+
+# Process entire dataset
+def preprocess_dataset(df):
+    """Applies preprocessing steps on the dataset."""
+    df['text'] = clean_text_column(df['text'].astype(str))
+    df['translated_text'] = translate_texts(df['text'].tolist(), translator, translation_cache)
+
+    # Keep the continuous VADER scores so later stages do not need to recompute them
+    df[VADER_COLUMNS] = score_vader(df['translated_text']).to_numpy()
+    df['sarcasm_label'] = label_sarcasm(df['vader_compound'])
+
+    # Ensure timestamp, location, and optionally source are retained
+    columns = ['text', 'translated_text', 'sarcasm_label', *VADER_COLUMNS, 'timestamp', 'location']
+    if 'source' in df.columns:
+        columns.append('source')
+    if 'id' in df.columns:
+        columns.insert(0, 'id')
+
+    return df[columns]
+
+# Save Preprocessed Data
+def save_preprocessed_data(df, artifact="processed"):
+    """Saves the preprocessed dataset to the Parquet store."""
+    write_artifact(df, artifact)
+    print(f"✅ Preprocessed data saved to '{artifact}'")
+
+# Execute script
+if __name__ == "__main__":
+    print("🔄 Loading raw data...")
+    df = load_data()
+    
+    print("🛠️ Preprocessing text...")
+    df = preprocess_dataset(df)
+    
+    print("💾 Saving preprocessed data...")
+    save_preprocessed_data(df)
+    
+    print("✅ Preprocessing completed successfully!")
+    print(df.head())  # Show preview
@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import shutil
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers only serialize within one process
+    fcntl = None
+
+MANIFEST_PATH = "data/manifest.json"
+
+# Published directory versions kept on disk, so a reader that resolved an
+# older version can finish its read before the files are deleted
+KEEP_VERSIONS = 3
+
+_lock = threading.Lock()
+
+
+def _fsync_dir(path):
+    """Persists a rename by syncing its parent directory (not possible on Windows)."""
+    if os.name == "nt":
+        return
+    fd = os.open(path or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_tree(path):
+    for root, _, files in os.walk(path):
+        for name in files:
+            with open(os.path.join(root, name), "rb") as f:
+                os.fsync(f.fileno())
+        _fsync_dir(root)
+
+
+def _write_atomic(path, data):
+    """Writes `data` to a temp file next to `path`, fsyncs it and renames it over `path`."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(tmp_path, mode, **({} if isinstance(data, bytes) else {"encoding": "utf-8"})) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(directory)
+
+
+def read_manifest(path=MANIFEST_PATH):
+    """Returns {"version": N, "artifacts": {name: {"version", "path", "published_at"}}}."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"version": 0, "artifacts": {}}
+
+
+@contextmanager
+def _manifest_transaction(path=MANIFEST_PATH):
+    """Holds the writer lock and yields the manifest, which is written back atomically on exit."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _lock, open(f"{path}.lock", "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        manifest = read_manifest(path)
+        yield manifest
+        _write_atomic(path, json.dumps(manifest, indent=2))
+
+
+def _record(manifest, name, path, version):
+    manifest["version"] = version
+    manifest["artifacts"][name] = {"version": version, "path": path, "published_at": time.time()}
+
+
+def publish_file(name, path, data, manifest_path=MANIFEST_PATH):
+    """Atomically replaces the file at `path` with `data` and bumps the snapshot version of `name`."""
+    with _manifest_transaction(manifest_path) as manifest:
+        _write_atomic(path, data)
+        version = manifest["version"] + 1
+        _record(manifest, name, path, version)
+    return version
+
+
+def retract_file(name, path, manifest_path=MANIFEST_PATH):
+    """Removes a published file (e.g. a cleared alert) and bumps the snapshot version of `name`."""
+    with _manifest_transaction(manifest_path) as manifest:
+        if os.path.exists(path):
+            os.remove(path)
+            _fsync_dir(os.path.dirname(path))
+        version = manifest["version"] + 1
+        _record(manifest, name, None, version)
+    return version
+
+
+def publish_directory(name, base_path, build, manifest_path=MANIFEST_PATH):
+    """Publishes a multi-file snapshot such as a partitioned Parquet dataset.
+
+    `build(tmp_dir)` writes the snapshot into a temp directory, which is
+    fsynced and renamed to `<base_path>.v<version>`. Only then does the
+    manifest point readers at it, so they always see a complete version.
+    Older versions beyond KEEP_VERSIONS are deleted.
+    """
+    with _manifest_transaction(manifest_path) as manifest:
+        version = manifest["version"] + 1
+        tmp_path = f"{base_path}.v{version}.tmp"
+        final_path = f"{base_path}.v{version}"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        build(tmp_path)
+        _fsync_tree(tmp_path)
+        os.replace(tmp_path, final_path)
+        _fsync_dir(os.path.dirname(final_path))
+        _record(manifest, name, final_path, version)
+    _prune_versions(base_path)
+    return version
+
+
+def bump_version(name, manifest_path=MANIFEST_PATH):
+    """Marks `name` as changed without writing a file, for stores updated in place (e.g. SQLite)."""
+    with _manifest_transaction(manifest_path) as manifest:
+        version = manifest["version"] + 1
+        _record(manifest, name, manifest["artifacts"].get(name, {}).get("path"), version)
+    return version
+
+
+def _prune_versions(base_path, keep=KEEP_VERSIONS):
+    """Deletes all but the newest `keep` published directories of `base_path`.
+
+    The manifest version is shared by every artifact, so versions are
+    counted per directory rather than by distance from the current number.
+    """
+    directory, prefix = os.path.split(base_path)
+    versions = []
+    for entry in os.listdir(directory or "."):
+        suffix = entry[len(prefix) + 2:]
+        if entry.startswith(f"{prefix}.v") and suffix.isdigit():
+            versions.append(int(suffix))
+    for version in sorted(versions)[:-keep]:
+        shutil.rmtree(os.path.join(directory, f"{prefix}.v{version}"), ignore_errors=True)
+
+
+class SnapshotReader:
+    """Caches per-artifact reads by snapshot version.
+
+    The manifest is re-parsed only when the file changes, and `read(name,
+    loader)` only calls `loader` when the version of `name` differs from
+    the version that was cached.
+    """
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self._manifest_stat = None
+        self._manifest = {"version": 0, "artifacts": {}}
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def manifest(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self._manifest
+        # Every publish renames a new file into place, so the inode changes too
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        if signature != self._manifest_stat:
+            self._manifest = read_manifest(self.path)
+            self._manifest_stat = signature
+        return self._manifest
+
+    def version(self, name):
+        return self.manifest()["artifacts"].get(name, {}).get("version", 0)
+
+    def read(self, name, loader, key=None):
+        """Returns loader() for artifact `name`, reusing the cached result while its version is unchanged.
+
+        `key` distinguishes several cached reads of the same artifact.
+        """
+        version = self.version(name)
+        cache_key = (name, key)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = loader()
+        with self._lock:
+            self._cache[cache_key] = (version, value)
+        return value
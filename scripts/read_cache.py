@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import threading
+import anyio
+from event_store import EVENT_DB, WINDOW_HOURS, count_rollups, query_window
+from storage import current_path, legacy_csv_path, read_artifact, snapshot_reader
+
+# 0 disables caching, so every request queries and aggregates again
+API_CACHE = os.environ.get("API_CACHE", "1") != "0"
+
+# The default window slides with the clock, so it is also rebuilt after this many seconds
+WINDOW_REFRESH_SECONDS = int(os.environ.get("API_WINDOW_REFRESH", "60"))
+
+POST_COLUMNS = ["id", "text", "translated_text", "sarcasm_label", "vader_compound", "vader_pos", "vader_neg",
+                "vader_neu", "timestamp", "location", "source", "emotion", "sentiment"]
+
+# Newest posts read for the recent-post endpoints; the counts come from the rollups
+LATEST_POSTS = 50
+
+
+def records(df):
+    """DataFrame rows as JSON-safe dicts (missing values become None instead of NaN)."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
+def _totals(counts, column):
+    """Post counts per value of `column`, largest first, without posts missing that value."""
+    return counts.groupby(column)["count"].sum().sort_values(ascending=False, kind="stable")
+
+
+def load_posts_view(since=None, until=None):
+    """PostsView of [since, until), the last API_WINDOW_HOURS by default."""
+    if since is None:
+        since = time.time() - WINDOW_HOURS * 3600
+    counts = count_rollups(["sentiment", "emotion", "location"], since=since, until=until)
+    latest = query_window(since, until, columns=POST_COLUMNS, latest=LATEST_POSTS)
+    return PostsView(counts, latest)
+
+
+_MISS = object()
+
+
+def encode_json(payload):
+    """Serializes a response once, so cached responses skip FastAPI's per-request encoding."""
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class PostsView:
+    """The responses of the post endpoints for one window of the event store.
+
+    Counts are summed from the rollup tables and only the newest posts are
+    read as rows, so building a view does not depend on the window's size.
+    """
+
+    def __init__(self, counts, latest):
+        emotions = _totals(counts, "emotion")
+        locations = _totals(counts, "location")
+        sentiments = _totals(counts, "sentiment")
+        shares = sentiments / max(sentiments.sum(), 1) * 100
+        recent = latest[["text", "emotion", "timestamp", "location"]].dropna().tail(10)
+        self.payloads = {
+            "emotion_distribution": {k: int(v) for k, v in emotions.items()},
+            "top_locations": {k: int(v) for k, v in locations.head(10).items()},
+            "recent_posts": {"posts": records(recent)},
+            "sentiment_data": {"data": records(latest.tail(20))},
+            "sentiment_insights": {"insights": {
+                "positive": round(float(shares.get("POSITIVE", 0)), 2),
+                "negative": round(float(shares.get("NEGATIVE", 0)), 2),
+                "neutral": round(float(shares.get("NEUTRAL", 0)), 2),
+                "total_posts": int(counts["count"].sum()),
+            }},
+        }
+        self._encoded = {}
+
+    def json(self, name):
+        """Encoded JSON body of one endpoint's response, serialized on first use."""
+        if name not in self._encoded:
+            self._encoded[name] = encode_json(self.payloads[name])
+        return self._encoded[name]
+
+
+class ReadCache:
+    """Shared data-access layer of the read endpoints.
+
+    Every dataset is loaded once and kept until its snapshot version in the
+    manifest or the mtime of its files changes. Post endpoints get a
+    PostsView of the default window; requests with an explicit since/until
+    are built from a fresh query instead.
+    """
+
+    def __init__(self, enabled=API_CACHE):
+        self.enabled = enabled
+        self.snapshots = snapshot_reader()
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    def _signature(self, name, paths):
+        return (self.snapshots.version(name),) + tuple(_mtime(path) for path in paths)
+
+    def _cached(self, key, signature, max_age):
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == signature and (max_age is None or time.time() - cached[1] < max_age):
+            return cached[2]
+        return _MISS
+
+    def _get(self, key, name, paths, loader, max_age=None):
+        if not self.enabled or key is None:
+            return loader()
+        signature = self._signature(name, paths)
+        value = self._cached(key, signature, max_age)
+        if value is not _MISS:
+            return value
+        # One request reloads a stale entry while concurrent requests for it wait
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self._cached(key, signature, max_age)
+            if value is _MISS:
+                value = loader()
+                self._cache[key] = (signature, time.time(), value)
+        return value
+
+    async def _get_async(self, key, name, paths, loader, max_age=None):
+        """_get for async endpoints: hits are answered on the event loop, loads run on a worker thread."""
+        if self.enabled and key is not None:
+            value = self._cached(key, self._signature(name, paths), max_age)
+            if value is not _MISS:
+                return value
+        return await anyio.to_thread.run_sync(self._get, key, name, paths, loader, max_age)
+
+    # Each *_spec returns the (key, name, paths, loader, max_age) of one kind of read
+    def _posts_spec(self, since, until):
+        load = lambda: load_posts_view(since, until)
+        if since is not None or until is not None:
+            return None, "events", [], load, None
+        return "posts", "events", [EVENT_DB, f"{EVENT_DB}-wal"], load, WINDOW_REFRESH_SECONDS
+
+    def _events_spec(self, key, load):
+        if key is None:
+            return None, "events", [], load, None
+        return key, "events", [EVENT_DB, f"{EVENT_DB}-wal"], load, WINDOW_REFRESH_SECONDS
+
+    def _artifact_spec(self, name, build, columns, encode=True):
+        paths = [current_path(name), legacy_csv_path(name)]
+        read = lambda: build(read_artifact(name, columns=columns, as_category=False))
+        load = (lambda: encode_json(read())) if encode else read
+        return (name, build.__name__), name, paths, load, None
+
+    def _text_file_spec(self, name, path, default):
+        def load():
+            if not os.path.exists(path):
+                return default
+            with open(path, encoding="utf-8") as f:
+                return f.read().strip()
+        return name, name, [path], load, None
+
+    def posts(self, since=None, until=None):
+        """PostsView of [since, until), or of the default window when neither is given."""
+        return self._get(*self._posts_spec(since, until))
+
+    def events(self, key, load):
+        """load() for a query on the event store, cached under `key` like the default post window (None: uncached)."""
+        return self._get(*self._events_spec(key, load))
+
+    def artifact(self, name, build, columns=None, encode=True):
+        """Encoded JSON of build(df) for a Parquet artifact, cached per `build`.
+
+        With `encode=False` the object returned by `build` is cached as is,
+        e.g. an index that endpoints page through.
+        """
+        return self._get(*self._artifact_spec(name, build, columns, encode))
+
+    def text_file(self, name, path, default=None):
+        """Contents of a small published file such as the alert flag, or `default` if it does not exist."""
+        return self._get(*self._text_file_spec(name, path, default))
+
+    async def posts_async(self, since=None, until=None):
+        return await self._get_async(*self._posts_spec(since, until))
+
+    async def events_async(self, key, load):
+        return await self._get_async(*self._events_spec(key, load))
+
+    async def artifact_async(self, name, build, columns=None, encode=True):
+        return await self._get_async(*self._artifact_spec(name, build, columns, encode))
+
+    async def text_file_async(self, name, path, default=None):
+        return await self._get_async(*self._text_file_spec(name, path, default))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def warm(self, artifacts=()):
+        """Loads the default post window and the given (name, build, columns[, encode]) artifacts ahead of the first request."""
+        for read in [self.posts] + [lambda spec=spec: self.artifact(*spec) for spec in artifacts]:
+            try:
+                read()
+            except Exception as e:
+                print(f"⚠️ Could not preload API data: {e}")
+
+_shared = None
+
+
+def read_cache():
+    """The process-wide ReadCache used by every endpoint."""
+    global _shared
+    if _shared is None:
+        _shared = ReadCache()
+    return _shared
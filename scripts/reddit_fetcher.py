@@ -0,0 +1,105 @@
+import os
+import time
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Parallel subreddit fetches; each thread gets its own Reddit client
+FETCH_WORKERS = int(os.environ.get("FETCH_WORKERS", "6"))
+
+# Reddit allows 100 OAuth requests per minute per client, averaged over a 10 minute window
+REQUEST_RATE = 100 / 60
+BURST = 10
+
+# Listings are served in pages of at most 100 posts
+PAGE_SIZE = 100
+
+RawPost = namedtuple("RawPost", ["id", "title", "selftext", "created_utc", "flair"])
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every fetch thread.
+
+    It refills at `rate` tokens per second up to `capacity`. After each
+    request the refill rate is re-derived from Reddit's rate-limit headers,
+    so the bucket slows down when the remaining budget runs low and waits
+    for the reset when it is exhausted.
+    """
+
+    def __init__(self, rate=REQUEST_RATE, capacity=BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = max(self.blocked_until - now, (tokens - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def update_from_limits(self, limits):
+        """Syncs with praw's `reddit.auth.limits` (remaining, reset_timestamp, used)."""
+        remaining = limits.get("remaining")
+        reset_timestamp = limits.get("reset_timestamp")
+        if remaining is None or reset_timestamp is None:
+            return
+        seconds_left = max(reset_timestamp - time.time(), 1.0)
+        with self.lock:
+            self._refill(time.monotonic())
+            if remaining < 1:
+                self.tokens = 0
+                self.blocked_until = time.monotonic() + seconds_left
+            else:
+                self.rate = min(self.max_rate, remaining / seconds_left)
+
+
+def fetch_listing(reddit, subreddit_name, limit, bucket):
+    """Fetches the newest posts of one subreddit as RawPost tuples."""
+    # One token per page; a listing of more pages than the bucket holds waits for refills between them
+    for _ in range(max(1, -(-limit // PAGE_SIZE))):
+        bucket.acquire()
+    posts = [
+        RawPost(post.id, post.title or "", post.selftext or "", post.created_utc, post.link_flair_text)
+        for post in reddit.subreddit(subreddit_name).new(limit=limit)
+    ]
+    bucket.update_from_limits(reddit.auth.limits)
+    return posts
+
+
+def fetch_concurrently(client_factory, subreddits, limit=100, max_workers=FETCH_WORKERS, bucket=None):
+    """Fetches all subreddits on a thread pool and yields (subreddit, posts) as each one arrives.
+
+    `client_factory` creates one Reddit client per thread, because praw
+    clients are not thread-safe. All threads draw from one shared token
+    bucket. A failing subreddit yields an empty list.
+    """
+    bucket = bucket or TokenBucket()
+    local = threading.local()
+
+    def fetch(subreddit_name):
+        if not hasattr(local, "reddit"):
+            local.reddit = client_factory()
+        return fetch_listing(local.reddit, subreddit_name, limit, bucket)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(fetch, name): name for name in subreddits}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                yield name, future.result()
+            except Exception as e:
+                print(f"❌ Error in r/{name}: {e}")
+                yield name, []
@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import random
+from types import SimpleNamespace
+
+FIXTURE_PATH = "data/fixtures/reddit_listings.json"
+
+
+def record_fixture(reddit, subreddits, limit=100, path=FIXTURE_PATH):
+    """Saves live listings to a JSON fixture so fetches can be replayed offline."""
+    listings = {}
+    for name in subreddits:
+        listings[name] = [
+            {
+                "id": post.id,
+                "title": post.title or "",
+                "selftext": post.selftext or "",
+                "created_utc": post.created_utc,
+                "link_flair_text": post.link_flair_text,
+            }
+            for post in reddit.subreddit(name).new(limit=limit)
+        ]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(listings, f, ensure_ascii=False)
+    print(f"💾 Recorded {sum(len(p) for p in listings.values())} posts to {path}")
+
+
+def synthetic_listings(subreddits, limit=100, seed=42):
+    """Generates fake listings for when no recorded fixture is available."""
+    rng = random.Random(seed)
+    now = time.time()
+    return {
+        name: [
+            {
+                "id": f"{name[:3]}{i:05d}",
+                "title": f"Post {i} from r/{name}",
+                "selftext": "Some discussion about the news " * rng.randint(0, 20),
+                "created_utc": now - rng.randint(0, 86400),
+                "link_flair_text": None,
+            }
+            for i in range(limit)
+        ]
+        for name in subreddits
+    }
+
+
+class ReplayReddit:
+    """Offline stand-in for `praw.Reddit` that serves listings from a fixture.
+
+    Each listing page sleeps for `latency` seconds, and `auth.limits`
+    imitates Reddit's rate-limit headers, so concurrent fetching can be
+    measured without network access.
+    """
+
+    def __init__(self, listings=None, path=FIXTURE_PATH, latency=0.5, requests_per_window=600, window=600):
+        if listings is None:
+            with open(path, encoding="utf-8") as f:
+                listings = json.load(f)
+        self.listings = listings
+        self.latency = latency
+        self.requests_per_window = requests_per_window
+        self.window_end = time.time() + window
+        self.used = 0
+        self.auth = SimpleNamespace(limits={})
+        self._update_limits()
+
+    def _update_limits(self):
+        self.auth.limits = {
+            "remaining": self.requests_per_window - self.used,
+            "reset_timestamp": self.window_end,
+            "used": self.used,
+        }
+
+    def subreddit(self, name):
+        return SimpleNamespace(new=lambda limit=100: self._new(name, limit))
+
+    def _new(self, name, limit):
+        posts = self.listings.get(name, [])[:limit]
+        for start in range(0, max(len(posts), 1), 100):
+            time.sleep(self.latency)
+            self.used += 1
+            self._update_limits()
+            for post in posts[start:start + 100]:
+                yield SimpleNamespace(**post)
@@ -1,50 +1,281 @@
-import pandas as pd
-from prophet import Prophet
-import numpy as np
-
-def load_data(file_path="data/sentiment_analysis_results.csv"):
-    df = pd.read_csv(file_path)
-
-    if "sentiment" not in df.columns:
-        raise ValueError("❌ 'sentiment' column missing in dataset!")
-
-    # Convert timestamps (handle seconds or ms)
-    try:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
-    except:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-
-    sentiment_map = {"POSITIVE": 1, "NEUTRAL": 0, "NEGATIVE": -1}
-    df["sentiment_score"] = df["sentiment"].map(sentiment_map)
-    df.dropna(subset=["sentiment_score"], inplace=True)
-
-    # 🗓️ Group by day to smooth noise
-    df["date"] = df["timestamp"].dt.date
-    daily_df = df.groupby("date")["sentiment_score"].mean().reset_index()
-    daily_df.columns = ["ds", "y"]
-
-    print(f"✅ Loaded & grouped data: {len(daily_df)} daily points")
-    return daily_df
-
-def train_forecast_model(df, periods=10):
-    if len(df) < 10:
-        raise ValueError("❌ Not enough data for forecasting! At least 10 days required.")
-
-    model = Prophet(daily_seasonality=True)
-    model.fit(df)
-
-    future = model.make_future_dataframe(periods=periods, freq="D")
-    forecast = model.predict(future)
-
-    return forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]]
-
-if __name__ == "__main__":
-    print("🔍 Loading data...")
-    df = load_data()
-
-    print("📈 Training forecasting model...")
-    forecast = train_forecast_model(df, periods=7)
-
-    forecast.to_csv("data/sentiment_trends.csv", index=False)
-    print("✅ Forecast saved to data/sentiment_trends.csv")
-    print(forecast.head())
+import os
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
+from event_store import events_exist, query_events
+from storage import read_artifact, write_artifact
+
+try:
+    from prophet import Prophet
+except ImportError:  # Forecasts fall back to exponential smoothing
+    Prophet = None
+
+# Days of post history the forecaster is fitted on
+FORECAST_WINDOW_DAYS = int(os.environ.get("FORECAST_WINDOW_DAYS", "90"))
+
+# Bucket size of the forecast series: "D" (daily) or "h" (hourly, always exponential smoothing)
+FORECAST_FREQ = os.environ.get("FORECAST_FREQ", "D")
+
+# Prophet needs this many closed days; shorter histories use exponential smoothing
+MIN_PROPHET_DAYS = 10
+
+# From about this many days on Prophet uses its full 25 changepoints and weekly seasonality,
+# so the parameter shapes stay the same and one fit can seed the next
+WARM_START_MIN_DAYS = 35
+
+# Exponential smoothing: level and trend weights, and damping of the trend over the horizon
+SMOOTHING_ALPHA = 0.3
+SMOOTHING_BETA = 0.1
+SMOOTHING_DAMPING = 0.9
+
+# Prophet's default 80% interval, used for the smoothing forecast as well
+INTERVAL_Z = 1.2816
+
+# Fit times kept per engine
+FIT_LOG_SIZE = 100
+
+# Post columns forecast per value next to the overall series (comma-separated, empty for the overall series only)
+FORECAST_SEGMENTS = [c for c in os.environ.get("FORECAST_SEGMENTS", "source,location").split(",") if c]
+
+# Segments with fewer posts or closed buckets in the window are not forecast
+MIN_SEGMENT_POSTS = int(os.environ.get("MIN_SEGMENT_POSTS", "50"))
+MIN_SEGMENT_BUCKETS = 7
+
+# Processes fitting the segment forecasts; 1 fits them in the calling process
+FORECAST_WORKERS = int(os.environ.get("FORECAST_WORKERS", str(os.cpu_count() or 1)))
+
+SEGMENT_COLUMNS = ["segment_type", "segment"]
+FORECAST_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+OVERALL = ("all", "all")
+
+def load_sentiment_history(window_days=FORECAST_WINDOW_DAYS):
+    """Reads the last `window_days` of classified posts from the event store.
+
+    Falls back to the latest sentiment snapshot when no event store exists yet.
+    """
+    columns = ["timestamp", "sentiment", "vader_compound"] + FORECAST_SEGMENTS
+    if not events_exist():
+        return read_artifact("sentiments", columns=columns, as_category=False)
+    return query_events(since=time.time() - window_days * 86400, columns=columns)
+
+def load_data(window_days=FORECAST_WINDOW_DAYS):
+    return build_daily_series(load_sentiment_history(window_days))
+
+def _scored(df, freq, use_vader):
+    """Copy of `df` with the numeric `sentiment_score` of every post and its `bucket` of `freq`."""
+    score_column = "vader_compound" if use_vader else "sentiment"
+    if score_column not in df.columns:
+        raise ValueError(f"❌ '{score_column}' column missing in dataset!")
+
+    # Work on a copy so in-memory callers keep their frame unchanged
+    df = df.copy()
+
+    # Convert timestamps (handle seconds or ms)
+    try:
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+    except:
+        df["timestamp"] = pd.to_datetime(df["timestamp"])
+
+    if use_vader:
+        df["sentiment_score"] = df["vader_compound"]
+    else:
+        sentiment_map = {"POSITIVE": 1, "NEUTRAL": 0, "NEGATIVE": -1}
+        df["sentiment_score"] = df["sentiment"].map(sentiment_map)
+    df.dropna(subset=["sentiment_score"], inplace=True)
+    df["bucket"] = df["timestamp"].dt.floor(freq)
+    return df
+
+def build_series(df, freq="D", use_vader=False):
+    """Aggregates sentiment results into a mean series (ds, y) per bucket of `freq` ("D" or "h").
+
+    With `use_vader`, the continuous VADER compound score from preprocessing
+    is averaged instead of the mapped sentiment labels.
+    """
+    df = _scored(df, freq, use_vader)
+
+    # 🗓️ Group by bucket to smooth noise
+    series = df.groupby("bucket")["sentiment_score"].mean().reset_index()
+    series.columns = ["ds", "y"]
+
+    print(f"✅ Loaded & grouped data: {len(series)} {'daily' if freq == 'D' else 'hourly'} points")
+    return series
+
+def build_segment_series(df, segments=FORECAST_SEGMENTS, freq="D", use_vader=False):
+    """Mean sentiment series of the overall posts and of every value of the `segments` columns.
+
+    The posts are grouped once by bucket and segment columns; the overall and
+    per-column series are then summed from that small aggregate. Returns a
+    tidy frame of (segment_type, segment, ds, y, posts) rows, where the
+    overall series is segment ("all", "all").
+    """
+    df = _scored(df, freq, use_vader)
+    segments = [column for column in segments if column in df.columns]
+    for column in segments:
+        df[column] = df[column].astype(object).fillna("Unknown").astype(str)
+
+    totals = df.groupby(["bucket"] + segments, observed=True)["sentiment_score"].agg(["sum", "count"]).reset_index()
+    parts = [totals.groupby("bucket")[["sum", "count"]].sum().reset_index().assign(segment_type="all", segment="all")]
+    for column in segments:
+        part = totals.groupby([column, "bucket"], observed=True)[["sum", "count"]].sum().reset_index()
+        parts.append(part.rename(columns={column: "segment"}).assign(segment_type=column))
+
+    series = pd.concat(parts, ignore_index=True)
+    series["y"] = series["sum"] / series["count"]
+    series = series.rename(columns={"bucket": "ds", "count": "posts"})[SEGMENT_COLUMNS + ["ds", "y", "posts"]]
+    print(f"✅ Loaded & grouped data: {len(parts[0])} {'daily' if freq == 'D' else 'hourly'} points, "
+          f"{series[SEGMENT_COLUMNS].drop_duplicates().shape[0] - 1} segments")
+    return series
+
+def build_daily_series(df, use_vader=False):
+    return build_series(df, "D", use_vader)
+
+def stan_init(model):
+    """Fitted Prophet parameters, used as the starting point of the next fit."""
+    init = {name: model.params[name][0][0] for name in ["k", "m", "sigma_obs"]}
+    init.update({name: model.params[name][0] for name in ["delta", "beta"]})
+    return init
+
+def smoothing_forecast(df, periods, freq="D", alpha=SMOOTHING_ALPHA, beta=SMOOTHING_BETA, damping=SMOOTHING_DAMPING):
+    """Exponential smoothing with a damped trend, in vectorized pandas/NumPy.
+
+    Returns the same columns as Prophet's forecast: one-step-ahead fits for
+    the history followed by `periods` future buckets, with an interval that
+    widens with the horizon.
+    """
+    y = df["y"].astype(float).reset_index(drop=True)
+    level = y.ewm(alpha=alpha, adjust=False).mean()
+    trend = level.diff().fillna(0.0).ewm(alpha=beta, adjust=False).mean()
+    fitted = (level + damping * trend).shift(1).fillna(y.iloc[0]).to_numpy()
+    sigma = float(np.std(y.to_numpy() - fitted))
+
+    steps = np.arange(1, periods + 1)
+    future = level.iloc[-1] + np.cumsum(damping ** steps) * trend.iloc[-1]
+    yhat = np.concatenate([fitted, future])
+    width = INTERVAL_Z * sigma * np.sqrt(np.concatenate([np.ones(len(y)), steps]))
+    last = pd.Timestamp(df["ds"].iloc[-1])
+    ds = pd.to_datetime(df["ds"]).tolist() + list(pd.date_range(last, periods=periods + 1, freq=freq)[1:])
+    return pd.DataFrame({"ds": ds, "yhat": yhat, "yhat_lower": yhat - width, "yhat_upper": yhat + width})
+
+
+def fit_segment(task):
+    """Forecast of one segment's closed (ds, y) series; runs in the forecast worker processes.
+
+    `task` is (key, closed, periods, freq, state), where `state` is the
+    Prophet state of the segment's previous fit. Returns the key, the
+    forecast, the state seeding the next fit and the method used.
+    """
+    key, closed, periods, freq, state = task
+    if Prophet is not None and freq == "D" and len(closed) >= MIN_PROPHET_DAYS:
+        # Daily means carry no intra-day pattern, so there is no daily seasonality to fit
+        model = Prophet(daily_seasonality=False)
+        warm = state is not None and min(state["points"], len(closed)) >= WARM_START_MIN_DAYS
+        model.fit(closed, **({"init": state["init"]} if warm else {}))
+        forecast = model.predict(model.make_future_dataframe(periods=periods, freq=freq))[FORECAST_COLUMNS]
+        state = {"init": stan_init(model), "points": len(closed)}
+        return key, forecast, state, "prophet (warm start)" if warm else "prophet"
+    return key, smoothing_forecast(closed, periods, freq), None, "exponential smoothing"
+
+
+class ForecastEngine:
+    """Keeps the latest forecasts between pipeline cycles and refits only when a bucket closes.
+
+    The bucket that is still filling up (today, or this hour) is left out of
+    the fit, so until it closes every cycle reuses the cached forecast. Daily
+    series with at least MIN_PROPHET_DAYS closed days are fitted with Prophet,
+    warm-started from the previous fit's parameters; shorter or hourly
+    series use exponential smoothing. Segment series are fitted in parallel
+    on `workers` processes. Each call is recorded in `fit_log`.
+    """
+
+    def __init__(self, freq=FORECAST_FREQ, periods=7, workers=FORECAST_WORKERS):
+        self.freq = freq
+        self.periods = periods
+        self.workers = workers
+        self.states = {}
+        self.forecast_df = None
+        self.fitted_until = None
+        self.fit_log = deque(maxlen=FIT_LOG_SIZE)
+
+    @property
+    def last_fit(self):
+        return self.fit_log[-1] if self.fit_log else None
+
+    def _fit(self, closed):
+        series = {key: group[["ds", "y"]].reset_index(drop=True)
+                  for key, group in closed.groupby(SEGMENT_COLUMNS, sort=False)}
+        if len(series.get(OVERALL, ())) < 2:
+            raise ValueError("❌ Not enough data for forecasting! At least 2 closed buckets required.")
+
+        # Sparse segments give noisy forecasts; the overall series is always fitted
+        posts = closed.groupby(SEGMENT_COLUMNS, sort=False)["posts"].sum()
+        keys = [key for key, points in series.items() if key == OVERALL
+                or (len(points) >= MIN_SEGMENT_BUCKETS and posts[key] >= MIN_SEGMENT_POSTS)]
+        tasks = [(key, series[key], self.periods, self.freq, self.states.get(key)) for key in keys]
+
+        workers = min(self.workers, len(tasks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(fit_segment, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        else:
+            results = [fit_segment(task) for task in tasks]
+
+        frames = []
+        for (segment_type, segment), forecast, state, method in results:
+            if state is not None:
+                self.states[(segment_type, segment)] = state
+            frames.append(forecast.assign(segment_type=segment_type, segment=segment))
+        forecast = pd.concat(frames, ignore_index=True)[SEGMENT_COLUMNS + FORECAST_COLUMNS]
+
+        methods = Counter(result[3] for result in results)
+        if len(results) == 1:
+            method = results[0][3]
+        else:
+            method = f"{len(results)} segments on {max(workers, 1)} workers (" + \
+                     ", ".join(f"{name} x{count}" for name, count in methods.items()) + ")"
+        return forecast, method, len(series) - len(keys)
+
+    def forecast_segments(self, series, now=None):
+        """Tidy forecast of every segment of a build_segment_series frame, refitted only if a new bucket closed."""
+        start = time.perf_counter()
+        open_bucket = pd.Timestamp(now if now is not None else time.time(), unit="s").floor(self.freq)
+        closed = series[pd.to_datetime(series["ds"]) < open_bucket]
+        last_closed = closed["ds"].max() if not closed.empty else None
+
+        skipped = 0
+        if self.forecast_df is not None and last_closed == self.fitted_until:
+            method = "cached"
+        else:
+            self.forecast_df, method, skipped = self._fit(closed)
+        self.fitted_until = last_closed
+
+        seconds = time.perf_counter() - start
+        points = int((closed["segment_type"] == "all").sum())
+        self.fit_log.append({"time": time.time(), "method": method, "seconds": seconds, "points": points,
+                             "skipped": skipped})
+        if method != "cached":
+            print(f"⏱️ Forecast fitted with {method} on {points} points in {seconds:.2f}s"
+                  + (f", {skipped} segments skipped for too little data" if skipped else ""))
+        return self.forecast_df
+
+    def forecast(self, series, now=None):
+        """Forecast of one (ds, y) series from build_series, refitted only if a new bucket closed since the last call."""
+        tidy = series.assign(segment_type="all", segment="all", posts=0)
+        return self.forecast_segments(tidy, now)[FORECAST_COLUMNS]
+
+def train_forecast_model(df, periods=10):
+    """One-off forecast of a (ds, y) series, without keeping the model."""
+    return ForecastEngine(periods=periods).forecast(df)
+
+if __name__ == "__main__":
+    print("🔍 Loading data...")
+    engine = ForecastEngine(periods=7)
+    series = build_segment_series(load_sentiment_history(), freq=engine.freq)
+
+    print("📈 Training forecasting models...")
+    forecast = engine.forecast_segments(series)
+
+    write_artifact(forecast, "trends")
+    print("✅ Forecast saved to 'trends'")
+    print(forecast.head())
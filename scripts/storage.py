@@ -0,0 +1,176 @@
+import os
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from publish import SnapshotReader, publish_directory
+
+DATA_DIR = "data"
+PARQUET_DIR = "data/parquet"
+
+# Artifact name -> legacy CSV file it replaces
+ARTIFACTS = {
+    "raw": "geo_sentiment.csv",
+    "processed": "processed_sentiment_data.csv",
+    "emotions": "emotion_analysis_results.csv",
+    "sentiments": "sentiment_analysis_results.csv",
+    "anomalies": "anomaly_detection_results.csv",
+    "trends": "sentiment_trends.csv",
+}
+
+# Low-cardinality columns stored dictionary-encoded (read back as pandas categoricals)
+DICTIONARY_COLUMNS = ["emotion", "sentiment", "location", "source"]
+
+# Hive partition key: UTC date of the post's `timestamp`
+PARTITION_COLUMN = "ingest_date"
+PARTITIONING = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive")
+
+_OPERATORS = {
+    "==": lambda field, value: field == value,
+    "!=": lambda field, value: field != value,
+    "<": lambda field, value: field < value,
+    "<=": lambda field, value: field <= value,
+    ">": lambda field, value: field > value,
+    ">=": lambda field, value: field >= value,
+    "in": lambda field, value: field.isin(list(value)),
+}
+
+
+def artifact_path(name, parquet_dir=PARQUET_DIR):
+    return os.path.join(parquet_dir, name)
+
+
+def manifest_path(parquet_dir=PARQUET_DIR):
+    """The snapshot manifest sits next to the Parquet directory (data/manifest.json by default)."""
+    return os.path.join(os.path.dirname(parquet_dir), "manifest.json")
+
+
+_readers = {}
+
+
+def snapshot_reader(parquet_dir=PARQUET_DIR):
+    """Shared SnapshotReader for the manifest that versions the artifacts in `parquet_dir`."""
+    path = manifest_path(parquet_dir)
+    if path not in _readers:
+        _readers[path] = SnapshotReader(path)
+    return _readers[path]
+
+
+def current_path(name, parquet_dir=PARQUET_DIR):
+    """Directory of the latest published version of `name`, or the unversioned layout if none was published."""
+    entry = snapshot_reader(parquet_dir).manifest()["artifacts"].get(name)
+    if entry and entry.get("path") and os.path.exists(entry["path"]):
+        return entry["path"]
+    return artifact_path(name, parquet_dir)
+
+
+def legacy_csv_path(name, data_dir=DATA_DIR):
+    return os.path.join(data_dir, ARTIFACTS[name])
+
+
+def artifact_exists(name):
+    return os.path.exists(current_path(name)) or os.path.exists(legacy_csv_path(name))
+
+
+def _to_table(df):
+    df = df.copy()
+    if "timestamp" in df.columns and PARTITION_COLUMN not in df.columns:
+        dates = pd.to_datetime(pd.to_numeric(df["timestamp"], errors="coerce"), unit="s", utc=True)
+        df[PARTITION_COLUMN] = dates.dt.strftime("%Y-%m-%d").fillna(time.strftime("%Y-%m-%d"))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for col in DICTIONARY_COLUMNS:
+        if col in table.column_names:
+            encoded = pc.dictionary_encode(table[col].cast(pa.string()))
+            table = table.set_column(table.schema.get_field_index(col), col, encoded)
+    return table
+
+
+def write_artifact(df, name, parquet_dir=PARQUET_DIR):
+    """Publishes a stage output as Parquet, partitioned by ingest date when it has timestamps.
+
+    Each write becomes a new snapshot version directory, and readers are only
+    pointed at it once it is complete (see publish.publish_directory).
+    """
+    table = _to_table(df)
+    dictionary = [col for col in DICTIONARY_COLUMNS if col in table.column_names]
+
+    def build(tmp_path):
+        if PARTITION_COLUMN in table.column_names and table.num_rows:
+            pq.write_to_dataset(table, tmp_path, partition_cols=[PARTITION_COLUMN],
+                                use_dictionary=dictionary or False)
+        else:
+            os.makedirs(tmp_path, exist_ok=True)
+            pq.write_table(table, os.path.join(tmp_path, "part-0.parquet"), use_dictionary=dictionary or False)
+
+    os.makedirs(parquet_dir, exist_ok=True)
+    version = publish_directory(name, artifact_path(name, parquet_dir), build, manifest_path(parquet_dir))
+    print(f"💾 Saved {len(df)} rows to '{name}' (snapshot v{version})")
+    return version
+
+
+def _expression(filters):
+    """Builds a pyarrow expression from [(column, op, value), ...], combined with AND."""
+    expression = None
+    for column, op, value in filters or []:
+        term = _OPERATORS[op](ds.field(column), value)
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _filter_frame(df, filters):
+    for column, op, value in filters or []:
+        if op == "in":
+            df = df[df[column].isin(list(value))]
+        else:
+            df = df[_OPERATORS[op](df[column], value)]
+    return df
+
+
+def read_artifact(name, columns=None, filters=None, as_category=True, parquet_dir=PARQUET_DIR):
+    """Loads an artifact, reading only `columns` and pushing `filters` down to Parquet.
+
+    Filters are (column, op, value) tuples, for example
+    [("timestamp", ">=", 1700000000), ("source", "in", ["canada"])]. A filter
+    on `ingest_date` prunes whole partitions. Requested columns missing from
+    the artifact are skipped. Before migration, the legacy CSV is read instead.
+    Dictionary columns come back as categoricals unless `as_category` is False.
+    """
+    path = current_path(name, parquet_dir)
+    if not os.path.exists(path):
+        csv_path = legacy_csv_path(name)
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"❌ No '{name}' artifact at {path} or {csv_path}")
+        df = _filter_frame(pd.read_csv(csv_path, dtype={"id": str}), filters)
+        return df[[c for c in columns if c in df.columns]] if columns else df
+
+    dataset = ds.dataset(path, format="parquet", partitioning=PARTITIONING)
+    if columns is None:
+        columns = [c for c in dataset.schema.names if c != PARTITION_COLUMN]
+    columns = [c for c in columns if c in dataset.schema.names]
+
+    df = dataset.to_table(columns=columns, filter=_expression(filters)).to_pandas()
+    for col in df.select_dtypes("category").columns:
+        if as_category:
+            df[col] = df[col].cat.remove_unused_categories()
+        else:
+            df[col] = df[col].astype(object)
+    return df
+
+
+def migrate_csv_artifacts():
+    """One-off migration of every existing CSV artifact under data/ to Parquet."""
+    for name in ARTIFACTS:
+        csv_path = legacy_csv_path(name)
+        if not os.path.exists(csv_path):
+            print(f"⏭️ {csv_path} not found, skipping")
+            continue
+        write_artifact(pd.read_csv(csv_path, dtype={"id": str}), name)
+
+
+if __name__ == "__main__":
+    print("📦 Migrating CSV artifacts to Parquet...")
+    migrate_csv_artifacts()
+    print("✅ Migration completed!")
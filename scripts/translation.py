@@ -0,0 +1,157 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from inference_cache import InferenceCache, text_hash
+
+# "google" (deep_translator, needs network) or "offline" (local stand-in for tests)
+TRANSLATION_BACKEND = os.environ.get("TRANSLATION_BACKEND", "google")
+TRANSLATION_WORKERS = int(os.environ.get("TRANSLATION_WORKERS", "8"))
+TRANSLATION_BATCH_SIZE = 50
+
+# Frequent English function words; cleaned posts are lowercase without punctuation
+ENGLISH_STOPWORDS = frozenset("""
+a about after all also am an and any are as at be because been before but by can could did do does
+dont for from had has have he her here him his how i if im in into is it its just like me more most my
+no not now of on one only or our out over people so some than that the their them then there these
+they this to too up us very was we were what when where which who why will with would you your
+""".split())
+
+
+def is_english(text, min_stopword_ratio=0.2, max_non_ascii_ratio=0.1):
+    """Fast local check for text that does not need translating.
+
+    Counts non-ASCII letters and common English function words, which is
+    enough to tell English Reddit posts from the other languages we collect.
+    Very short ASCII texts are treated as English.
+    """
+    words = text.split()
+    if not words:
+        return True
+    letters = [c for c in text if c.isalpha()]
+    if letters and sum(1 for c in letters if not c.isascii()) / len(letters) > max_non_ascii_ratio:
+        return False
+    if len(words) < 3:
+        return True
+    return sum(1 for w in words if w in ENGLISH_STOPWORDS) / len(words) >= min_stopword_ratio
+
+
+class GoogleBackend:
+    """Translates through deep_translator's GoogleTranslator with concurrent requests.
+
+    Every thread reuses one translator object. A failed text comes back as
+    None instead of silently falling back to the original.
+    """
+
+    name = "google"
+    revision = "1"
+
+    def __init__(self, target_lang="en", workers=TRANSLATION_WORKERS):
+        self.target_lang = target_lang
+        self.workers = workers
+        self._local = threading.local()
+
+    def _translate(self, text):
+        from deep_translator import GoogleTranslator
+
+        if not hasattr(self._local, "translator"):
+            self._local.translator = GoogleTranslator(source="auto", target=self.target_lang)
+        try:
+            return self._local.translator.translate(text)
+        except Exception as e:
+            print(f"❌ Translation failed: {e}")
+            return None
+
+    def translate_batch(self, texts):
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self._translate, texts))
+
+
+class OfflineBackend:
+    """Local stand-in that needs no network: word-by-word lookup in an optional dictionary."""
+
+    name = "offline"
+    revision = "1"
+
+    def __init__(self, target_lang="en", dictionary=None):
+        self.target_lang = target_lang
+        self.dictionary = dictionary or {}
+
+    def translate_batch(self, texts):
+        return [" ".join(self.dictionary.get(word, word) for word in text.split()) for text in texts]
+
+
+BACKENDS = {"google": GoogleBackend, "offline": OfflineBackend}
+
+
+def make_translator(name=TRANSLATION_BACKEND, target_lang="en"):
+    if name not in BACKENDS:
+        raise ValueError(f"❌ Unknown translation backend '{name}'")
+    return BACKENDS[name](target_lang=target_lang)
+
+
+def make_translation_cache(translator):
+    """Persistent cache of translations keyed by text hash, one namespace per backend and target language.
+
+    The backend's `revision` is the cache revision, so only a new backend
+    version drops its cached translations, never a different target language.
+    """
+    return InferenceCache(f"translator:{translator.name}:{translator.target_lang}", translator.revision)
+
+
+_shared = {}
+
+
+def shared_translation(name=TRANSLATION_BACKEND, target_lang="en"):
+    """(translator, cache) for one backend and target language, built once per process and reused."""
+    key = (name, target_lang)
+    if key not in _shared:
+        translator = make_translator(name, target_lang)
+        _shared[key] = translator, make_translation_cache(translator)
+    return _shared[key]
+
+
+def translate_texts(texts, translator, cache, batch_size=TRANSLATION_BATCH_SIZE):
+    """Translates `texts`, skipping English rows and texts already in the cache.
+
+    Unique uncached texts go to the backend in batches. Texts the backend
+    fails on keep their original wording and are left out of the cache, so
+    they are retried on the next run.
+    """
+    texts = ["" if t is None else str(t) for t in texts]
+    results = list(texts)
+    if not texts:
+        return results
+    english = [is_english(t) for t in texts]
+
+    foreign = [i for i, is_en in enumerate(english) if not is_en]
+    hashes = {i: text_hash(texts[i]) for i in foreign}
+    cached = cache.get_many(list(hashes.values()))
+    pending = {}
+    for i in foreign:
+        if hashes[i] not in cached:
+            pending.setdefault(hashes[i], texts[i])
+    cache.hits += sum(1 for i in foreign if hashes[i] in cached)
+    cache.misses += sum(1 for i in foreign if hashes[i] not in cached)
+
+    translated, failed = dict(cached), 0
+    pending_hashes = list(pending)
+    start = time.perf_counter()
+    for b in range(0, len(pending_hashes), batch_size):
+        batch_hashes = pending_hashes[b:b + batch_size]
+        outputs = translator.translate_batch([pending[h] for h in batch_hashes])
+        ok = [(h, out) for h, out in zip(batch_hashes, outputs) if out]
+        failed += len(batch_hashes) - len(ok)
+        cache.put_many(ok)
+        translated.update(ok)
+    elapsed = time.perf_counter() - start
+
+    for i in foreign:
+        results[i] = translated.get(hashes[i], texts[i])
+
+    skipped = len(texts) - len(foreign)
+    latency = elapsed / len(pending) * 1000 if pending else 0.0
+    print(f"🌐 {translator.name}: {skipped}/{len(texts)} English rows skipped ({skipped / len(texts):.0%}), "
+          f"{len(foreign) - len(pending)} served from cache, {len(pending)} sent to the backend "
+          f"in {elapsed:.2f}s ({latency:.1f} ms/text), {failed} failed")
+    return results
@@ -0,0 +1,135 @@
+import os
+import time
+import multiprocessing as mp
+from queue import Empty
+from batching import MAX_BATCH_TOKENS, predict_dynamic
+
+# Number of inference processes; 1 keeps inference in the calling process
+WORKERS = int(os.environ.get("INFERENCE_WORKERS", "1"))
+
+# Seconds between checks that the workers still owing a result are alive
+RESULT_POLL_SECONDS = 5
+
+# Workers are forked so they share the loaded models; without fork (Windows) inference stays serial
+CAN_FORK = "fork" in mp.get_all_start_methods()
+
+# Work function of the current map_shards call, inherited by the forked workers
+_shard_fn = None
+
+
+def usable_cores():
+    """CPUs this process may run on (CPU affinity is only known on Linux)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def worker_count(workers, items):
+    """Number of processes to actually use for `items` work items, 1 meaning the serial path."""
+    if workers <= 1 or items <= 1 or not CAN_FORK:
+        return 1
+    return min(workers, len(usable_cores()), items)
+
+
+def core_sets(workers):
+    """Splits the CPUs this process may use into `workers` disjoint, contiguous sets."""
+    cores = usable_cores()
+    workers = max(1, min(workers, len(cores)))
+    size, extra = divmod(len(cores), workers)
+    sets, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        sets.append(set(cores[start:end]))
+        start = end
+    return sets
+
+
+def balanced_shards(lengths, workers):
+    """Deals length-sorted item indices round-robin so every shard gets a similar token load."""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[w::workers] for w in range(workers) if order[w::workers]]
+
+
+def _worker(index, items, cores, queue):
+    import torch
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(len(cores))
+    try:
+        queue.put((index, None, _shard_fn(items)))
+    except Exception as e:
+        queue.put((index, repr(e), None))
+
+
+def map_shards(fn, shards):
+    """Runs `fn(shard)` for every shard in its own forked process, pinned to its own cores.
+
+    Workers are forked after the models are loaded, so they share the model
+    weights copy-on-write instead of loading a copy each. Results are
+    returned in shard order regardless of which worker finishes first.
+    """
+    if not CAN_FORK:
+        return [fn(shard) for shard in shards]
+    global _shard_fn
+    _shard_fn = fn
+    ctx = mp.get_context("fork")
+    queue = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(i, shard, cores, queue))
+        for i, (shard, cores) in enumerate(zip(shards, core_sets(len(shards))))
+    ]
+    for process in processes:
+        process.start()
+
+    # Drain the queue before joining so large results cannot block a worker's exit
+    results, errors = [None] * len(processes), []
+    pending = set(range(len(processes)))
+    try:
+        while pending:
+            try:
+                index, error, result = queue.get(timeout=RESULT_POLL_SECONDS)
+            except Empty:
+                # A worker killed by the OOM killer or a segfault never sends its result
+                dead = [i for i in pending if processes[i].exitcode is not None]
+                if dead and queue.empty():
+                    codes = ", ".join(f"shard {i}: exit code {processes[i].exitcode}" for i in sorted(dead))
+                    raise RuntimeError(f"❌ Inference worker died without a result ({codes})")
+                continue
+            pending.discard(index)
+            if error:
+                errors.append(f"shard {index}: {error}")
+            results[index] = result
+    finally:
+        for process in processes:
+            if pending:
+                process.terminate()
+            process.join()
+        _shard_fn = None
+
+    if errors:
+        raise RuntimeError(f"❌ Inference worker failed: {'; '.join(errors)}")
+    return results
+
+
+def predict_parallel(predict_batch, texts, lengths, workers=WORKERS, max_tokens=MAX_BATCH_TOKENS, fallback="UNKNOWN"):
+    """Like `predict_dynamic`, but spread over `workers` processes. Output order matches `texts`."""
+    workers = worker_count(workers, len(texts))
+    if workers <= 1:
+        return predict_dynamic(predict_batch, texts, lengths, max_tokens=max_tokens, fallback=fallback)
+
+    shards = balanced_shards(lengths, workers)
+    start = time.perf_counter()
+    shard_results = map_shards(
+        lambda shard: predict_dynamic(predict_batch, [texts[i] for i in shard], [lengths[i] for i in shard],
+                                      max_tokens=max_tokens, fallback=fallback),
+        shards,
+    )
+    elapsed = time.perf_counter() - start
+
+    results = [None] * len(texts)
+    for shard, predicted in zip(shards, shard_results):
+        for i, label in zip(shard, predicted):
+            results[i] = label
+    print(f"⚡ {len(shards)} workers: {len(texts) / elapsed:.1f} texts/sec")
+    return results
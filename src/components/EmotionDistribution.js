@@ -1,31 +1,35 @@
 import React, { useState, useEffect } from "react";
 import { Bar } from "react-chartjs-2";
 import "chart.js/auto";
+import { subscribe } from "../liveUpdates";
 
 const EmotionDistribution = () => {
     const [chartData, setChartData] = useState(null);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
+        const showCounts = counts => {
+            setChartData({
+                labels: Object.keys(counts),
+                datasets: [
+                    {
+                        label: "Emotion Distribution",
+                        data: Object.values(counts),
+                        backgroundColor: ["#ff6384", "#36a2eb", "#ffce56", "#4bc0c0", "#9966ff", "#ff9f40"],
+                    },
+                ],
+            });
+            setLoading(false);
+        };
+
         fetch("http://127.0.0.1:8005/get_emotion_distribution")
             .then(response => response.json())
-            .then(data => {
-                setChartData({
-                    labels: Object.keys(data),
-                    datasets: [
-                        {
-                            label: "Emotion Distribution",
-                            data: Object.values(data),
-                            backgroundColor: ["#ff6384", "#36a2eb", "#ffce56", "#4bc0c0", "#9966ff", "#ff9f40"],
-                        },
-                    ],
-                });
-                setLoading(false);
-            })
+            .then(showCounts)
             .catch(error => {
                 console.error("Error fetching emotion distribution data:", error);
                 setLoading(false);
             });
+        return subscribe("insights", data => showCounts(data.emotion_distribution));
     }, []);
 
     return (
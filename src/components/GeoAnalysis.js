@@ -2,6 +2,7 @@ import React, { useState, useEffect } from "react";
 import { MapContainer, TileLayer, Marker, Popup } from "react-leaflet";
 import L from "leaflet";
 import "leaflet/dist/leaflet.css";
+import { subscribe } from "../liveUpdates";
 
 // Import your custom marker image
 import customMarker from "./marker.png"; // Adjusted relative import
@@ -87,7 +88,8 @@ const GeoAnalysis = () => {
     const [error, setError] = useState(null);
 
     useEffect(() => {
-        fetch("http://127.0.0.1:8002/get_geo_data")
+        // One marker per location and emotion, with its post count, instead of one per post
+        fetch("http://127.0.0.1:8005/get_geo_data?group_by=location,emotion")
             .then(response => response.json())
             .then(data => {
                 if (data.error) throw new Error(data.error);
@@ -98,6 +100,20 @@ const GeoAnalysis = () => {
                 console.error("Error fetching data:", error);
             })
             .finally(() => setLoading(false));
+        return subscribe("posts", data => {
+            setGeoData(previous => {
+                const counts = previous.map(item => ({ ...item }));
+                data.posts.filter(post => post.location && post.emotion).forEach(post => {
+                    const item = counts.find(c => c.location === post.location && c.emotion === post.emotion);
+                    if (item) {
+                        item.count += 1;
+                    } else {
+                        counts.push({ location: post.location, emotion: post.emotion, count: 1 });
+                    }
+                });
+                return counts;
+            });
+        });
     }, []);
 
     return (
@@ -133,7 +149,8 @@ const GeoAnalysis = () => {
                             <Marker key={index} position={[lat, lng]} icon={markerIcon}>
                                 <Popup style={styles.popupContent}>
                                     <strong style={styles.popupTitle}>Location:</strong> {item.location || "Unknown"} <br />
-                                    <strong style={styles.popupTitle}>Emotion:</strong> {item.emotion || "Not Available"}
+                                    <strong style={styles.popupTitle}>Emotion:</strong> {item.emotion || "Not Available"} <br />
+                                    <strong style={styles.popupTitle}>Posts:</strong> {item.count}
                                 </Popup>
                             </Marker>
                         );
@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from "react";
 import "../styles/RecentPosts.css";
+import { subscribe } from "../liveUpdates";
 
 const RecentPosts = () => {
     const [recentPosts, setRecentPosts] = useState([]);
@@ -32,6 +33,10 @@ const RecentPosts = () => {
         };
 
         fetchRecentPosts();
+        return subscribe("posts", data => {
+            const posts = data.posts.filter(post => post.text && post.emotion && post.location);
+            setRecentPosts(previous => [...previous, ...posts].slice(-10));
+        });
     }, []);
 
     const getEmotionIcon = (emotion) => {
@@ -1,34 +1,22 @@
 import React, { useState, useEffect } from "react";
 import { Line } from "react-chartjs-2";
 import "chart.js/auto";
+import { subscribe } from "../liveUpdates";
 
 const SentimentChart = () => {
-    const [chartData, setChartData] = useState(null);
+    const [posts, setPosts] = useState([]);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
         const fetchData = () => {
-            fetch("http://127.0.0.1:8001/get_sentiment_data")
+            fetch("http://127.0.0.1:8005/get_sentiment_data")
                 .then(response => response.json())
                 .then(data => {
                     if (data.error) {
                         console.error("Error fetching data:", data.error);
                         setLoading(false);
                     } else {
-                        const timestamps = data.data.map(d => new Date(d.timestamp * 1000).toLocaleTimeString());
-                        const sentimentScores = data.data.map(d => d.sentiment === "POSITIVE" ? 1 : d.sentiment === "NEGATIVE" ? -1 : 0);
-
-                        setChartData({
-                            labels: timestamps,
-                            datasets: [
-                                {
-                                    label: "Sentiment Score",
-                                    data: sentimentScores,
-                                    borderColor: "blue",
-                                    fill: false
-                                }
-                            ]
-                        });
+                        setPosts(data.data);
                         setLoading(false);
                     }
                 })
@@ -39,10 +27,22 @@ const SentimentChart = () => {
         };
 
         fetchData();
-        const interval = setInterval(fetchData, 5000); // Auto-refresh every 5 seconds
-        return () => clearInterval(interval);
+        // New posts are pushed by the API instead of polling every few seconds
+        return subscribe("posts", data => setPosts(previous => [...previous, ...data.posts].slice(-20)));
     }, []);
 
+    const chartData = {
+        labels: posts.map(d => new Date(d.timestamp * 1000).toLocaleTimeString()),
+        datasets: [
+            {
+                label: "Sentiment Score",
+                data: posts.map(d => d.sentiment === "POSITIVE" ? 1 : d.sentiment === "NEGATIVE" ? -1 : 0),
+                borderColor: "blue",
+                fill: false
+            }
+        ]
+    };
+
     return (
         <div className="chart-container">
             <h2>Sentiment Trends</h2>
@@ -1,13 +1,14 @@
 import React, { useState, useEffect } from "react";
 import { Line } from "react-chartjs-2";
 import "chart.js/auto";
+import { subscribe } from "../liveUpdates";
 
 const SentimentTrends = () => {
     const [trendData, setTrendData] = useState(null);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        fetch("http://127.0.0.1:8003/get_sentiment_trends")
+        const fetchTrends = () => fetch("http://127.0.0.1:8005/get_sentiment_trends")
             .then(response => response.json())
             .then(data => {
                 if (data.error) {
@@ -34,6 +35,9 @@ const SentimentTrends = () => {
                 console.error("Error fetching data:", error);
                 setLoading(false);
             });
+
+        fetchTrends();
+        return subscribe("snapshot", data => data.artifact === "trends" && fetchTrends());
     }, []);
 
     return (
@@ -1,31 +1,35 @@
 import React, { useState, useEffect } from "react";
 import { Bar } from "react-chartjs-2";
 import "chart.js/auto";
+import { subscribe } from "../liveUpdates";
 
 const TopLocations = () => {
     const [chartData, setChartData] = useState(null);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
+        const showCounts = counts => {
+            setChartData({
+                labels: Object.keys(counts),
+                datasets: [
+                    {
+                        label: "Top Locations by Emotion Count",
+                        data: Object.values(counts),
+                        backgroundColor: "#36a2eb",
+                    },
+                ],
+            });
+            setLoading(false);
+        };
+
         fetch("http://127.0.0.1:8005/get_top_locations")
             .then(response => response.json())
-            .then(data => {
-                setChartData({
-                    labels: Object.keys(data),
-                    datasets: [
-                        {
-                            label: "Top Locations by Emotion Count",
-                            data: Object.values(data),
-                            backgroundColor: "#36a2eb",
-                        },
-                    ],
-                });
-                setLoading(false);
-            })
+            .then(showCounts)
             .catch(error => {
                 console.error("Error fetching top locations data:", error);
                 setLoading(false);
             });
+        return subscribe("insights", data => showCounts(data.top_locations));
     }, []);
 
     return (
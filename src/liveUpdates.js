@@ -0,0 +1,25 @@
+// One Server-Sent Events connection shared by every component.
+// The API pushes `posts`, `insights`, `alert` and `snapshot` messages as the pipeline publishes,
+// and the browser reconnects on its own if the connection drops.
+const STREAM_URL = "http://127.0.0.1:8005/stream";
+
+let source = null;
+let subscribers = 0;
+
+export function subscribe(event, handler) {
+    if (!source) {
+        source = new EventSource(STREAM_URL);
+    }
+    const listener = (message) => handler(JSON.parse(message.data));
+    source.addEventListener(event, listener);
+    subscribers += 1;
+
+    return () => {
+        source.removeEventListener(event, listener);
+        subscribers -= 1;
+        if (subscribers === 0) {
+            source.close();
+            source = null;
+        }
+    };
+}
@@ -3,6 +3,7 @@ import "../styles/Analysis.css";
 import GeoAnalysis from "../components/GeoAnalysis";
 import RecentPosts from "../components/RecentPosts";
 import { Link } from "react-router-dom";
+import { subscribe } from "../liveUpdates";
 
 const Analysis = () => {
   const [insights, setInsights] = useState(null);
@@ -12,7 +13,7 @@ const Analysis = () => {
   useEffect(() => {
     const fetchInsights = async () => {
       try {
-        const response = await fetch("http://127.0.0.1:8004/get_sentiment_insights");
+        const response = await fetch("http://127.0.0.1:8005/get_sentiment_insights");
 
         if (!response.ok) {
           throw new Error(`HTTP error! status: ${response.status}`);
@@ -34,6 +35,7 @@ const Analysis = () => {
     };
 
     fetchInsights();
+    return subscribe("insights", (data) => setInsights(data.insights));
   }, []);
 
   const renderSentimentMeter = (value) => (
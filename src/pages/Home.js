@@ -1,6 +1,7 @@
 import React, { useEffect, useState } from "react";
 import "../styles/App.css";
 import { Link, useNavigate } from "react-router-dom"; // Updated
+import { subscribe } from "../liveUpdates";
 
 function Home() {
   const [alert, setAlert] = useState("");
@@ -8,14 +9,16 @@ function Home() {
   const navigate = useNavigate(); // Added for navigation
 
   useEffect(() => {
+    const showState = (data) => {
+      setAlert(data.message);
+      setShowAlert(data.alert);
+    };
+
     fetch("http://localhost:8005/get_sentiment_alert")
       .then((res) => res.json())
-      .then((data) => {
-        if (data.alert) {
-          setAlert(data.message);
-          setShowAlert(true);
-        }
-      });
+      .then(showState);
+    // Raised and cleared alerts are pushed as they happen
+    return subscribe("alert", showState);
   }, []);
 
   const handleOkClick = () => {
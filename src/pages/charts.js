@@ -4,26 +4,32 @@ import EmotionDistribution from "../components/EmotionDistribution";
 import TopLocations from "../components/TopLocations";
 import AnomalousPosts from "../components/AnomalousPosts";
 import { Link } from "react-router-dom";
+import { subscribe } from "../liveUpdates";
 import "../styles/Charts.css";
 
 function Charts() {
   const [anomalyPosts, setAnomalyPosts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const anomalySectionRef = useRef(null);
 
-  useEffect(() => {
-    const fetchAnomalyPosts = async () => {
-      try {
-        const response = await fetch("http://localhost:8005/get_anomalous_posts");
-        const data = await response.json();
-        if (data.posts) {
-          setAnomalyPosts(data.posts);
-        }
-      } catch (error) {
-        console.error("Failed to fetch anomaly posts:", error);
+  // Anomalous posts come a page at a time; `cursor` continues after the posts already shown
+  const fetchAnomalyPosts = async (cursor = null) => {
+    try {
+      const url = "http://localhost:8005/get_anomalous_posts" + (cursor ? `?cursor=${cursor}` : "");
+      const response = await fetch(url);
+      const data = await response.json();
+      if (data.posts) {
+        setAnomalyPosts((previous) => (cursor ? [...previous, ...data.posts] : data.posts));
+        setNextCursor(data.next_cursor);
       }
-    };
+    } catch (error) {
+      console.error("Failed to fetch anomaly posts:", error);
+    }
+  };
 
+  useEffect(() => {
     fetchAnomalyPosts();
+    return subscribe("snapshot", (data) => data.artifact === "anomalies" && fetchAnomalyPosts());
   }, []);
 
   useEffect(() => {
@@ -70,6 +76,11 @@ function Charts() {
       <div className="anomaly-section" ref={anomalySectionRef} id="anomalies">
         <h2>⚠️ Anomalous Posts</h2>
         <AnomalousPosts posts={anomalyPosts} />
+        {nextCursor && (
+          <button className="download-btn" onClick={() => fetchAnomalyPosts(nextCursor)}>
+            Load more
+          </button>
+        )}
         <button className="download-btn" onClick={downloadCSV}>
           ⬇️ Download Anomalies (CSV)
         </button>